@@ -0,0 +1,28 @@
+from .CatsParser import CatsParser
+
+
+class CatsEventHandler:
+    """Receives events as CATS lines are parsed; every event is ignored by default"""
+    def start_type(self, location, type_name, type_descriptor):
+        """Called when a type definition starts; members of composite types are reported by subsequent events"""
+
+    def field(self, location, type_name, field_descriptor):
+        """Called for each struct member"""
+
+    def enum_value(self, location, type_name, value_descriptor):
+        """Called for each enum value"""
+
+    def end_type(self, location, type_name, type_descriptor):
+        """Called when a type definition is complete"""
+
+    def import_file(self, location, filename):
+        """Called for each import statement, before any events from the imported file"""
+
+
+def stream_events(lines, event_handler, name='<unknown>', import_resolver=None):
+    """Parses lines (str or utf-8 bytes) and reports them to an event handler without retaining any parsed types"""
+    parser = CatsParser(import_resolver or (lambda _: None), event_handler=event_handler, retain_types=False)
+    parser.push_scope(name)
+    parser.parse_lines(lines)
+    parser.close_type()
+    parser.pop_scope()
@@ -2,29 +2,76 @@ from collections import OrderedDict
 from .AliasParser import AliasParserFactory
 from .CatsParseException import CatsParseException
 from .CommentParser import CommentParser
-from .EnumParser import EnumParserFactory
+from .EnumParser import EnumParser, EnumParserFactory
 from .ImportParser import ImportParserFactory
+from .LineDispatcher import LineDispatcher
+from .Linker import Linker, ScopedLink
 from .ScopeManager import ScopeManager
 from .StructParser import StructParserFactory
 
 
+class _ParserCallbacks:
+    """Forwards parsed imports and types to the callbacks of a parser, notifying its optional event handler first"""
+    def __init__(self, import_resolver, type_listener, event_handler):
+        self.import_resolver = import_resolver
+        self.type_listener = type_listener
+        self.event_handler = event_handler
+
+    def start_type(self, location, type_name, type_descriptor):
+        if self.event_handler:
+            self.event_handler.start_type(location, type_name, type_descriptor)
+
+    def end_type(self, location, type_name, type_descriptor):
+        if self.event_handler:
+            self.event_handler.end_type(location, type_name, type_descriptor)
+
+    def property(self, location, parser, property_descriptor):
+        if not self.event_handler:
+            return
+
+        if isinstance(parser, EnumParser):
+            self.event_handler.enum_value(location, parser.type_name, property_descriptor)
+        else:
+            self.event_handler.field(location, parser.type_name, property_descriptor)
+
+    def import_file(self, location, filename):
+        if self.event_handler:
+            self.event_handler.import_file(location, filename)
+
+        self.import_resolver(filename)
+
+    def add_type(self, type_name, type_descriptor):
+        if self.type_listener:
+            self.type_listener(type_name, type_descriptor)
+
+
 class CatsParser(ScopeManager):
     """Parser used to parse CATS files line by line"""
-    def __init__(self, import_resolver):
+    def __init__(self, import_resolver, type_listener=None, deferred_linking=False, event_handler=None, retain_types=True):
         super().__init__()
-        self.import_resolver = import_resolver
+
+        # event handler is notified as lines are consumed (see CatsEventHandler); when types are not retained, parsed types are
+        # only reported via events and references to other types cannot be resolved
+        self.callbacks = _ParserCallbacks(import_resolver, type_listener, event_handler)
+        self.retain_types = retain_types
+        self.type_names = set()
 
         self.aspect_parser = CommentParser()
-        self.type_parser_factories = [
+
+        # dispatchers for composite scopes are keyed by parser type because factories are shared by all instances of a type
+        self.dispatchers = {None: LineDispatcher([
             AliasParserFactory(),
             EnumParserFactory(),
             ImportParserFactory(),
             StructParserFactory()
-        ]
+        ])}
 
         self.wip_type_descriptors = OrderedDict()
         self.active_parser = None
 
+        # when linking is deferred, references to other types are only resolved by link, which allows forward references
+        self.linker = Linker(self.wip_type_descriptors, deferred_linking)
+
     def process_line(self, line):
         """Processes the next line of input"""
         try:
@@ -32,8 +79,15 @@ class CatsParser(ScopeManager):
         except Exception as ex:
             raise CatsParseException('\n'.join(self.scope()), ex)
 
+    def parse_lines(self, lines):
+        """Processes all lines of a line iterator (e.g. a file object or mmap lines), which can contain str or utf-8 bytes"""
+        for line in lines:
+            self.process_line(line)
+
     def _process_line(self, line):
         self.increment_line_number()
+        if isinstance(line, (bytes, bytearray)):
+            line = line.decode('utf-8')
 
         # check if current line is a cross cutting concern
         line_stripped = line.strip()
@@ -49,82 +103,110 @@ class CatsParser(ScopeManager):
 
         # close a type iff an unindented non-empty line is found
         if self.active_parser and not line.startswith('\t'):
-            self._close_type()
+            self.close_type()
 
-        active_factories = self.type_parser_factories if not self.active_parser else self.active_parser.factories()
-
-        factory = next(factory for factory in active_factories if factory.is_match(line_stripped))
+        factory, match = self._active_dispatcher().dispatch(line_stripped)
         parser = factory.create()
-        parse_result = parser.process_line(line_stripped)
+        parse_result = parser.process_match(match)
 
         # create a new scope if the current symbol is a composite
         if not parse_result:
             self.active_parser = parser
             self.active_parser.partial_descriptor = partial_descriptor
-            return
-
-        if self.active_parser:
-            if 'type' in parse_result:
-                self._require_known_type(parse_result['type'])
-
-                # perform extra validation on some property links for better error detection/messages
-                if 'sort_key' in parse_result:
-                    # sort key processing will only occur if linked field type already exists
-                    self._require_type_with_field(parse_result['type'], parse_result['sort_key'])
-
-                if 'condition' in parse_result:
-                    # when condition is being post processed here, it is known that the linked condition field is part of
-                    # the struct and the linked condition type already exists
-
-                    # look up condition type descriptor by searching active parser descriptor layout
-                    condition_field_name = parse_result['condition']
-                    condition_type_descriptor = next(
-                        descriptor for descriptor in self.active_parser.type_descriptor['layout']
-                        if descriptor['name'] == condition_field_name
-                    )
-
-                    self._require_enum_type_with_value(condition_type_descriptor['type'], parse_result['condition_value'])
-
-            self.active_parser.append({**parse_result, **partial_descriptor})
+            self.callbacks.start_type(self.location(), parser.type_name, {**parser.type_descriptor, **partial_descriptor})
+        elif self.active_parser:
+            self._process_property({**parse_result, **partial_descriptor})
         elif hasattr(parse_result, 'import_file'):
-            self.import_resolver(parse_result.import_file)
+            self.callbacks.import_file(self.location(), parse_result.import_file)
         else:
-            self._set_type_descriptor(parse_result[0], {**parse_result[1], **partial_descriptor})
-
-    def _close_type(self):
+            type_descriptor = {**parse_result[1], **partial_descriptor}
+            self.callbacks.start_type(self.location(), parse_result[0], type_descriptor)
+            self._set_type_descriptor(parse_result[0], type_descriptor)
+            self.callbacks.end_type(self.location(), parse_result[0], type_descriptor)
+
+    def _process_property(self, property_descriptor):
+        if 'type' in property_descriptor:
+            self._add_link(('type', property_descriptor['type']))
+
+            # perform extra validation on some property links for better error detection/messages
+            if 'sort_key' in property_descriptor:
+                # sort key processing will only occur if linked field type already exists
+                self._add_link(('field', property_descriptor['type'], property_descriptor['sort_key']))
+
+            if 'condition' in property_descriptor:
+                # when condition is being post processed here, it is known that the linked condition field is part of
+                # the struct and the linked condition type already exists
+
+                # look up condition type descriptor in active parser descriptor layout index;
+                # an unknown condition field is rejected by the active parser when the property is appended
+                condition_type_descriptor = self.active_parser.property_type_descriptor(property_descriptor['condition'])
+                if condition_type_descriptor:
+                    self._add_link(('enum_value', condition_type_descriptor['type'], property_descriptor['condition_value']))
+
+        self.active_parser.append(property_descriptor)
+        self.callbacks.property(self.location(), self.active_parser, property_descriptor)
+
+    def _active_dispatcher(self):
+        parser_type = type(self.active_parser) if self.active_parser else None
+        if parser_type not in self.dispatchers:
+            self.dispatchers[parser_type] = LineDispatcher(self.active_parser.factories())
+
+        return self.dispatchers[parser_type]
+
+    def close_type(self):
+        """Closes the active composite type, if any"""
         if not self.active_parser:
             return
 
         parsed_tuple = self.active_parser.commit()
-        self._set_type_descriptor(parsed_tuple[0], {**parsed_tuple[1], **self.active_parser.partial_descriptor})
+        type_descriptor = {**parsed_tuple[1], **self.active_parser.partial_descriptor}
+        self._set_type_descriptor(parsed_tuple[0], type_descriptor)
         self.active_parser = None
+        self.callbacks.end_type(self.location(), parsed_tuple[0], type_descriptor)
 
-    def _require_known_type(self, type_name):
-        if type_name not in self.wip_type_descriptors and 'byte' != type_name:
-            raise CatsParseException('no definition for linked type "{0}"'.format(type_name))
-
-        return type_name
+    def _add_link(self, link):
+        if not self.retain_types:
+            return
 
-    def _require_type_with_field(self, type_name, field_name):
-        type_descriptor = self.wip_type_descriptors[type_name]
-        if not any(field_name == field['name'] for field in type_descriptor['layout']):
-            raise CatsParseException('"{0}" does not have field "{1}"'.format(type_name, field_name))
+        if not self.linker.deferred:
+            self.linker.resolve(link)
+            return
 
-    def _require_enum_type_with_value(self, type_name, value_name):
-        enum_type_descriptor = self.wip_type_descriptors[type_name]
-        if 'values' not in enum_type_descriptor:
-            raise CatsParseException('linked type "{0}" must be an enum type'.format(type_name))
+        scope = self.scopes[-1]
+        self.linker.unresolved_links.append(ScopedLink(scope.name, scope.line_number, link))
 
-        if not any(value_name == value['name'] for value in enum_type_descriptor['values']):
-            raise CatsParseException('linked enum type "{0}" does not contain value "{1}"'.format(type_name, value_name))
+    def link(self):
+        """Resolves all deferred links, raising an exception describing every link that cannot be resolved"""
+        failures = self.linker.link_deferred()
+        if failures:
+            raise CatsParseException('\n'.join(
+                '{0}:{1}: {2}'.format(scoped_link.filename, scoped_link.line_number, ex) for scoped_link, ex in failures if ex
+            ))
 
     def _set_type_descriptor(self, type_name, type_descriptor):
-        if type_name in self.wip_type_descriptors:
+        if type_name in self.wip_type_descriptors or type_name in self.type_names:
             raise CatsParseException('duplicate definition for type "{0}"'.format(type_name))
 
-        self.wip_type_descriptors[type_name] = type_descriptor
+        if self.retain_types:
+            self.wip_type_descriptors[type_name] = type_descriptor
+        else:
+            self.type_names.add(type_name)
+
+        self.callbacks.add_type(type_name, type_descriptor)
+
+    def set_type_descriptor(self, type_name, type_descriptor):
+        """Adds a type descriptor that was not parsed from input lines (e.g. loaded from a cache)"""
+        self._set_type_descriptor(type_name, type_descriptor)
+
+    def remove_type_descriptor(self, type_name):
+        """Removes a type descriptor, so that the type can be parsed again"""
+        del self.wip_type_descriptors[type_name]
+        self.linker.forget_type(type_name)
 
     def type_descriptors(self):
         """Returns all parsed type descriptors"""
-        self._close_type()
+        self.close_type()
+        if self.linker.unresolved_links:
+            self.link()
+
         return self.wip_type_descriptors
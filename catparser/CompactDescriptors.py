@@ -0,0 +1,196 @@
+# pylint: disable=too-few-public-methods
+import sys
+from collections import OrderedDict
+from collections.abc import Mapping
+
+
+class CompactDescriptor(Mapping):
+    """Base for slotted descriptors that expose the dictionary shape produced by CatsParser"""
+    __slots__ = ()
+    KEYS = ()
+
+    def _value(self, key):
+        return getattr(self, key)
+
+    def __getitem__(self, key):
+        value = self._value(key) if key in self.KEYS else None
+        if value is None:
+            raise KeyError(key)
+
+        return value
+
+    def __iter__(self):
+        return (key for key in self.KEYS if self._value(key) is not None)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class BuiltinDescriptor(CompactDescriptor):
+    """Shared descriptor for a builtin byte type"""
+    __slots__ = ('size', 'signedness')
+    KEYS = ('type', 'size', 'signedness')
+
+    def __init__(self, size, signedness):
+        self.size = size
+        self.signedness = signedness
+
+    def _value(self, key):
+        return 'byte' if 'type' == key else getattr(self, key)
+
+
+class _BuiltinBackedDescriptor(CompactDescriptor):
+    __slots__ = ()
+    BUILTIN_KEYS = ('size', 'signedness')
+
+    def _value(self, key):
+        if key in self.BUILTIN_KEYS:
+            builtin = self.builtin  # pylint: disable=no-member
+            return builtin[key] if builtin else getattr(self, key, None)
+
+        return getattr(self, key)
+
+
+class AliasDescriptor(_BuiltinBackedDescriptor):
+    """Compact descriptor for a `using` type"""
+    __slots__ = ('builtin', 'comments')
+    KEYS = ('type', 'size', 'signedness', 'comments')
+
+    def __init__(self, builtin, comments):
+        self.builtin = builtin
+        self.comments = comments
+
+    def _value(self, key):
+        return 'byte' if 'type' == key else super()._value(key)
+
+
+class EnumValueDescriptor(CompactDescriptor):
+    """Compact descriptor for an enum value"""
+    __slots__ = ('name', 'value', 'comments')
+    KEYS = ('name', 'value', 'comments')
+
+    def __init__(self, name, value, comments):
+        self.name = name
+        self.value = value
+        self.comments = comments
+
+
+class EnumDescriptor(_BuiltinBackedDescriptor):
+    """Compact descriptor for an `enum` type"""
+    __slots__ = ('builtin', 'values', 'comments')
+    KEYS = ('type', 'size', 'signedness', 'values', 'comments')
+
+    def __init__(self, builtin, values, comments):
+        self.builtin = builtin
+        self.values = values
+        self.comments = comments
+
+    def _value(self, key):
+        return 'enum' if 'type' == key else super()._value(key)
+
+
+class FieldDescriptor(_BuiltinBackedDescriptor):
+    """Compact descriptor for a struct member; builtin members share a BuiltinDescriptor"""
+    __slots__ = ('name', 'builtin', 'type', 'size', 'disposition', 'value', 'sort_key', 'condition', 'condition_value', 'comments')
+    KEYS = ('name', 'type', 'size', 'signedness', 'disposition', 'value', 'sort_key', 'condition', 'condition_value', 'comments')
+
+    def __init__(self, builtin, **kwargs):
+        self.builtin = builtin
+        for key in self.__slots__:
+            if 'builtin' != key:
+                setattr(self, key, kwargs.get(key))
+
+    def _value(self, key):
+        if 'type' == key and self.builtin:
+            return 'byte'
+
+        return super()._value(key)
+
+
+class StructDescriptor(CompactDescriptor):
+    """Compact descriptor for a `struct` type"""
+    __slots__ = ('layout', 'comments')
+    KEYS = ('type', 'layout', 'comments')
+
+    def __init__(self, layout, comments):
+        self.layout = layout
+        self.comments = comments
+
+    def _value(self, key):
+        return 'struct' if 'type' == key else getattr(self, key)
+
+
+BUILTIN_DESCRIPTORS = {}
+
+
+def builtin_descriptor(size, signedness):
+    """Gets the shared descriptor for a builtin byte type"""
+    key = (size, signedness)
+    if key not in BUILTIN_DESCRIPTORS:
+        BUILTIN_DESCRIPTORS[key] = BuiltinDescriptor(size, signedness)
+
+    return BUILTIN_DESCRIPTORS[key]
+
+
+def _intern(string):
+    return sys.intern(string) if isinstance(string, str) else string
+
+
+class _Compactor:
+    def __init__(self, keep_comments):
+        self.keep_comments = keep_comments
+
+    def comments(self, descriptor):
+        return descriptor.get('comments') if self.keep_comments else None
+
+    def field(self, descriptor):
+        builtin = None
+        field_values = {key: _intern(descriptor.get(key)) for key in FieldDescriptor.KEYS if key not in ('signedness', 'comments')}
+        if 'byte' == descriptor.get('type') and 'signedness' in descriptor:
+            builtin = builtin_descriptor(descriptor['size'], descriptor['signedness'])
+            for key in ('type', 'size'):
+                del field_values[key]
+
+        return FieldDescriptor(builtin, comments=self.comments(descriptor), **field_values)
+
+    def type_descriptor(self, descriptor):
+        type_name = descriptor['type']
+        comments = self.comments(descriptor)
+        if 'struct' == type_name:
+            return StructDescriptor([self.field(field) for field in descriptor['layout']], comments)
+
+        builtin = builtin_descriptor(descriptor['size'], descriptor['signedness'])
+        if 'enum' == type_name:
+            values = [
+                EnumValueDescriptor(_intern(value['name']), value['value'], self.comments(value)) for value in descriptor['values']
+            ]
+            return EnumDescriptor(builtin, values, comments)
+
+        return AliasDescriptor(builtin, comments)
+
+
+def compact_type_descriptors(type_descriptors, keep_comments=True):
+    """Converts parsed type descriptors into compact descriptors, optionally dropping all comments"""
+    compactor = _Compactor(keep_comments)
+    return OrderedDict(
+        (_intern(type_name), compactor.type_descriptor(type_descriptor)) for type_name, type_descriptor in type_descriptors.items()
+    )
+
+
+def expand_descriptor(descriptor):
+    """Converts a (compact) descriptor into plain dictionaries and lists"""
+    if isinstance(descriptor, Mapping):
+        return {key: expand_descriptor(value) for key, value in descriptor.items()}
+
+    if isinstance(descriptor, (list, tuple)):
+        return [expand_descriptor(value) for value in descriptor]
+
+    return descriptor
+
+
+def expand_type_descriptors(type_descriptors):
+    """Converts compact type descriptors back into the dictionary shape produced by CatsParser"""
+    return OrderedDict((type_name, expand_descriptor(type_descriptor)) for type_name, type_descriptor in type_descriptors.items())
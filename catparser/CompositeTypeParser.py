@@ -1,7 +1,12 @@
-class CompositeTypeParser:
+from .RegexParserFactory import RegexParser
+
+
+# FP from pylint, this is semi-abstract class
+# pylint: disable=abstract-method
+class CompositeTypeParser(RegexParser):
     """Base for composite type parsers"""
     def __init__(self, regex, factories):
-        self.regex = regex
+        super().__init__(regex)
         self.sub_factories = factories
         self.type_name = None
         self.type_descriptor = None
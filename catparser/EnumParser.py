@@ -1,7 +1,8 @@
 # pylint: disable=too-few-public-methods
 from .CatsParseException import CatsParseException
 from .CompositeTypeParser import CompositeTypeParser
-from .RegexParserFactory import RegexParserFactory
+from .LineDispatcher import ASSIGNMENT_KEYWORD
+from .RegexParserFactory import RegexParser, RegexParserFactory
 from .parserutils import parse_dec_or_hex, parse_builtin, require_property_name, require_user_type_name, require_primitive
 
 
@@ -10,8 +11,10 @@ class EnumParser(CompositeTypeParser):
     def __init__(self, regex):
         super().__init__(regex, [EnumValueParserFactory()])
 
-    def process_line(self, line):
-        match = self.regex.match(line)
+        # index of value names for duplicate detection
+        self.value_names = set()
+
+    def process_match(self, match):
         self.type_name = require_user_type_name(match.group(1))
 
         base_type = require_primitive(match.group(2))
@@ -22,34 +25,32 @@ class EnumParser(CompositeTypeParser):
             'signedness': builtin_type_descriptor['signedness'],
             'values': []
         }
+        self.value_names = set()
 
     def append(self, property_value_descriptor):
         self._require_unknown_property(property_value_descriptor['name'])
 
         self.type_descriptor['values'].append(property_value_descriptor)
+        self.value_names.add(property_value_descriptor['name'])
 
     def _require_unknown_property(self, property_name):
-        if any(property_name == property_type_descriptor['name'] for property_type_descriptor in self.type_descriptor['values']):
+        if property_name in self.value_names:
             raise CatsParseException('duplicate definition for enum value "{0}"'.format(property_name))
 
 
 class EnumParserFactory(RegexParserFactory):
     """Factory for creating enum parsers"""
     def __init__(self):
-        super().__init__(r'enum (\S+) : (u?int\d+)', EnumParser)
+        super().__init__(r'enum (\S+) : (u?int\d+)', EnumParser, 'enum')
 
 
-class EnumValueParser:
+class EnumValueParser(RegexParser):
     """Parser for enum values"""
-    def __init__(self, regex):
-        self.regex = regex
-
-    def process_line(self, line):
-        match = self.regex.match(line)
+    def process_match(self, match):
         return {'name': require_property_name(match.group(1)), 'value': parse_dec_or_hex(match.group(2))}
 
 
 class EnumValueParserFactory(RegexParserFactory):
     """Factory for creating enum value parsers"""
     def __init__(self):
-        super().__init__(r'(\S+) = (\S+)', EnumValueParser)
+        super().__init__(r'(\S+) = (\S+)', EnumValueParser, ASSIGNMENT_KEYWORD)
@@ -0,0 +1,135 @@
+from collections import namedtuple
+from .CatsParseException import CatsParseException
+
+# field of a flattened struct layout
+#  - offset: offset from the start of the struct when the field and all preceding fields are unconditional and have fixed sizes,
+#    otherwise None
+#  - size: size in bytes (when present) if it does not depend on other fields, otherwise None (arrays sized by a field)
+#  - element_size: size of a single array element (None for scalar fields or elements of variable size)
+#  - count: name of the field containing the number of array elements or a fixed number of elements (None for scalar fields)
+#  - condition: (field name, value) pair that must match for a conditional field to be present, otherwise None
+FieldLayout = namedtuple('FieldLayout', ['name', 'type', 'offset', 'size', 'element_size', 'count', 'condition', 'descriptor'])
+
+
+class StructLayout(namedtuple('StructLayout', ['name', 'fields', 'constants', 'fixed_size', 'size'])):
+    """
+    Flattened layout of a struct with all inlined structs expanded
+    (fixed_size is the size of the prefix of fields at fixed offsets, size is None unless all fields are at fixed offsets)
+    """
+    __slots__ = ()
+
+    @property
+    def prefix(self):
+        """Gets the fields at fixed offsets"""
+        return tuple(field for field in self.fields if field.offset is not None)
+
+    @property
+    def tail(self):
+        """Gets the fields starting at the first conditional or variable size field, which are located by reading preceding fields"""
+        return tuple(field for field in self.fields if field.offset is None)
+
+    def field(self, name):
+        """Gets the layout of the field with the specified name"""
+        for field in self.fields:
+            if name == field.name:
+                return field
+
+        raise KeyError(name)
+
+
+class LayoutResolver:
+    """Resolves sizes of types and flattened layouts of structs, memoizing the results of every type"""
+    def __init__(self, type_descriptors):
+        self.type_descriptors = type_descriptors
+        self.layouts = {}
+
+        # names of structs whose layouts are being resolved, which detects structs (indirectly) containing themselves
+        self.pending_struct_names = set()
+
+    def type_size(self, type_name):
+        """Gets the size in bytes of a type or None when the size of a struct depends on its content"""
+        type_descriptor = self._type_descriptor(type_name)
+        if 'struct' == type_descriptor['type']:
+            return self.struct_layout(type_name).size
+
+        return type_descriptor['size']
+
+    def struct_layout(self, struct_name):
+        """Gets the flattened layout of a struct"""
+        if struct_name not in self.layouts:
+            if struct_name in self.pending_struct_names:
+                raise CatsParseException('struct "{0}" contains itself'.format(struct_name))
+
+            self.pending_struct_names.add(struct_name)
+            try:
+                self.layouts[struct_name] = self._resolve_struct_layout(struct_name)
+            finally:
+                self.pending_struct_names.remove(struct_name)
+
+        return self.layouts[struct_name]
+
+    def struct_layouts(self, type_names=None):
+        """Yields the layouts of the specified or of all structs"""
+        for type_name in self.type_descriptors if type_names is None else type_names:
+            if 'struct' == self._type_descriptor(type_name)['type']:
+                yield self.struct_layout(type_name)
+
+    def _type_descriptor(self, type_name):
+        type_descriptor = self.type_descriptors.get(type_name)
+        if not type_descriptor:
+            raise CatsParseException('no definition for type "{0}"'.format(type_name))
+
+        return type_descriptor
+
+    def _resolve_struct_layout(self, struct_name):
+        type_descriptor = self._type_descriptor(struct_name)
+        if 'struct' != type_descriptor['type']:
+            raise CatsParseException('type "{0}" is not a struct'.format(struct_name))
+
+        fields = []
+        constants = []
+        offset = 0
+        for field_descriptor in type_descriptor['layout']:
+            disposition = field_descriptor.get('disposition')
+            if 'const' == disposition:
+                # constants are properties of the struct and are not serialized
+                constants.append(field_descriptor)
+            elif 'inline' == disposition:
+                # inlined structs are resolved (and memoized) once, however many structs share them
+                inlined_layout = self.struct_layout(field_descriptor['type'])
+                constants += inlined_layout.constants
+                for field in inlined_layout.fields:
+                    fields.append(field._replace(offset=None if offset is None or field.offset is None else offset + field.offset))
+
+                offset = None if offset is None or inlined_layout.size is None else offset + inlined_layout.size
+            else:
+                field = self._resolve_field_layout(field_descriptor, offset)
+                fields.append(field)
+                offset = None if field.offset is None else offset + field.size
+
+        fixed_size = sum(field.size for field in fields if field.offset is not None)
+        return StructLayout(struct_name, tuple(fields), tuple(constants), fixed_size, offset)
+
+    def _resolve_field_layout(self, field_descriptor, offset):
+        type_name = field_descriptor['type']
+        count = field_descriptor.get('size')
+        if 'byte' == type_name:
+            # builtin fields have an integer size and byte arrays are sized by another field
+            element_size = 1
+            if not isinstance(count, str):
+                element_size, count = count, None
+        else:
+            element_size = self.type_size(type_name)
+
+        if count is None:
+            size, element_size = element_size, None
+        elif isinstance(count, int) and element_size is not None:
+            size = count * element_size
+        else:
+            size = None
+
+        condition = (field_descriptor['condition'], field_descriptor['condition_value']) if 'condition' in field_descriptor else None
+
+        # conditional fields can be absent, so neither they nor any following field are at fixed offsets
+        field_offset = offset if size is not None and not condition else None
+        return FieldLayout(field_descriptor['name'], type_name, field_offset, size, element_size, count, condition, field_descriptor)
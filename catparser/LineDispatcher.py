@@ -0,0 +1,34 @@
+# pylint: disable=too-few-public-methods
+from .CatsParseException import CatsParseException
+
+ASSIGNMENT_KEYWORD = '='
+ARRAY_KEYWORD = 'array'
+
+
+def lex_keyword(line):
+    """Extracts the keyword used to select the parser for a stripped line"""
+    head, _, tail = line.partition(' ')
+    if tail.startswith('= '):
+        return ARRAY_KEYWORD if tail.startswith('= array(') else ASSIGNMENT_KEYWORD
+
+    return head
+
+
+class LineDispatcher:
+    """Selects the parser factory for a line by its keyword and matches the line exactly once"""
+    def __init__(self, factories):
+        self.factories = {}
+        for factory in factories:
+            if factory.keyword in self.factories:
+                raise CatsParseException('multiple factories registered for keyword "{0}"'.format(factory.keyword))
+
+            self.factories[factory.keyword] = factory
+
+    def dispatch(self, line):
+        """Returns the matching factory and its match object for a stripped line"""
+        factory = self.factories.get(lex_keyword(line))
+        match = factory.is_match(line) if factory else None
+        if not match:
+            raise CatsParseException('unable to parse line "{0}"'.format(line))
+
+        return factory, match
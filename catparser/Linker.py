@@ -0,0 +1,93 @@
+from collections import namedtuple
+from .CatsParseException import CatsParseException
+
+# reference from a struct member to another type, recorded at filename:line_number
+#  - ('type', type_name): type must be defined
+#  - ('field', type_name, field_name): struct type must have field (sort_key)
+#  - ('enum_value', type_name, value_name): type must be an enum with value (condition)
+ScopedLink = namedtuple('ScopedLink', ['filename', 'line_number', 'link'])
+
+
+class Linker:
+    """Resolves references between types against a symbol table of type descriptors"""
+    def __init__(self, type_descriptors, deferred=False):
+        self.type_descriptors = type_descriptors
+
+        # lazily built index of field (struct) or value (enum) names for linked types
+        self.type_member_names = {}
+
+        # when linking is deferred, links are recorded by the parser and only resolved by link_deferred
+        self.deferred = deferred
+        self.unresolved_links = []
+
+        # optional callback returning the names of files, among the ones of the specified links, whose links need no resolving
+        self.trusted_files = None
+
+    def resolve(self, link):
+        """Raises an exception if the specified link cannot be resolved"""
+        if 'type' == link[0]:
+            self._require_known_type(link[1])
+        elif 'field' == link[0]:
+            self._require_type_with_field(link[1], link[2])
+        else:
+            self._require_enum_type_with_value(link[1], link[2])
+
+    def link(self, scoped_links, is_trusted_file=None):
+        """
+        Resolves all links in a single pass and returns the unresolved ones with their errors
+        (None for field links that were skipped because the link to their type failed)
+        """
+        failures = []
+        failed_type_links = set()
+        for scoped_link in scoped_links:
+            if is_trusted_file and is_trusted_file(scoped_link.filename):
+                continue
+
+            # a field link is added right after the link to its type, whose failure already describes the problem
+            if 'field' == scoped_link.link[0] and scoped_link[:2] + (scoped_link.link[1],) in failed_type_links:
+                failures.append((scoped_link, None))
+                continue
+
+            try:
+                self.resolve(scoped_link.link)
+            except CatsParseException as ex:
+                failures.append((scoped_link, ex))
+                if 'type' == scoped_link.link[0]:
+                    failed_type_links.add(scoped_link[:2] + (scoped_link.link[1],))
+
+        return failures
+
+    def link_deferred(self):
+        """Resolves all recorded links, keeping the unresolved ones, and returns them with their errors"""
+        is_trusted_file = self.trusted_files(self.unresolved_links).__contains__ if self.trusted_files else None
+        failures = self.link(self.unresolved_links, is_trusted_file)
+        self.unresolved_links = [scoped_link for scoped_link, _ in failures]
+        return failures
+
+    def forget_type(self, type_name):
+        """Drops cached information about a type that is removed from the symbol table"""
+        self.type_member_names.pop(type_name, None)
+
+    def _member_names(self, type_name, member_key):
+        if type_name not in self.type_member_names:
+            members = self.type_descriptors[type_name].get(member_key, [])
+            self.type_member_names[type_name] = frozenset(member['name'] for member in members if 'name' in member)
+
+        return self.type_member_names[type_name]
+
+    def _require_known_type(self, type_name):
+        if type_name not in self.type_descriptors and 'byte' != type_name:
+            raise CatsParseException('no definition for linked type "{0}"'.format(type_name))
+
+    def _require_type_with_field(self, type_name, field_name):
+        self._require_known_type(type_name)
+        if 'byte' == type_name or field_name not in self._member_names(type_name, 'layout'):
+            raise CatsParseException('"{0}" does not have field "{1}"'.format(type_name, field_name))
+
+    def _require_enum_type_with_value(self, type_name, value_name):
+        enum_type_descriptor = self.type_descriptors.get(type_name)
+        if not enum_type_descriptor or 'values' not in enum_type_descriptor:
+            raise CatsParseException('linked type "{0}" must be an enum type'.format(type_name))
+
+        if value_name not in self._member_names(type_name, 'values'):
+            raise CatsParseException('linked enum type "{0}" does not contain value "{1}"'.format(type_name, value_name))
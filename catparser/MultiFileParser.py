@@ -0,0 +1,422 @@
+import hashlib
+import os
+from collections import OrderedDict, defaultdict
+from .CatsParseException import CatsParseException
+from .CatsParser import CatsParser
+from .ParallelParser import parse_scanned_files, scan_schema_files
+from .ParseCache import ContentHasher, file_digest
+from .StageProfiler import NULL_PROFILER
+from .parserutils import canonicalize_path
+
+
+# per-file state is kept in separate dictionaries keyed by canonical path, which are part of the public interface
+# pylint: disable=too-many-instance-attributes
+class MultiFileParser:
+    """CATS parser that resolves imports in global namespace"""
+    def __init__(self, cache=None, deferred_linking=False, trusted_digests=None, profiler=None):
+        self.cats_parser = CatsParser(self._process_import_file, self._on_type_descriptor, deferred_linking)
+        self.dirname = None
+        self.cache = cache
+        self.profiler = profiler or NULL_PROFILER
+
+        # links of files with trusted link digests (see validated_digests) are not resolved again
+        self.trusted_digests = trusted_digests
+        if trusted_digests:
+            self.cats_parser.linker.trusted_files = self._trusted_files
+
+        # import graph of all files parsed in this session keyed by canonical path; values are canonical paths of direct imports
+        self.import_graph = OrderedDict()
+        self.file_digests = {}
+        self.file_type_names = {}
+        self.active_files = []
+
+        # number of types each file defined before each of its imports, which determines the order of types of a complete parse
+        self.import_positions = {}
+
+        # root files passed to parse and files whose parse did not complete, which are reparsed by reparse
+        self.root_filenames = OrderedDict()
+        self.failed_files = set()
+
+    def set_include_path(self, include_path):
+        self.dirname = include_path
+
+    def parse(self, schema_filename):
+        scope_depth = self.cats_parser.scope_depth()
+        try:
+            self._parse_root(schema_filename)
+        except Exception:
+            # scopes of failed files are kept until the error has been raised, so that it names them, and are only dropped here
+            self.cats_parser.pop_scopes(scope_depth)
+            raise
+
+    def _parse_root(self, schema_filename):
+        canonical_filename = canonicalize_path(schema_filename)
+        self.root_filenames.setdefault(canonical_filename, schema_filename)
+        if not self.cache or canonical_filename in self.import_graph:
+            self._process_file(schema_filename)
+            return
+
+        entry = self.cache.load(canonical_filename, self._canonical_include_path())
+        if entry:
+            self._load_cache_entry(entry)
+            return
+
+        previously_parsed_files = set(self.import_graph)
+        self._process_file(schema_filename)
+
+        # only cache results that do not depend on files parsed earlier in this session, which would change type ordering,
+        # and that are fully linked
+        closure = self.import_closure(canonical_filename)
+        if not previously_parsed_files.intersection(closure) and self._try_link():
+            self.cache.store(canonical_filename, self._create_cache_entry(closure), self._canonical_include_path())
+
+    def _canonical_include_path(self):
+        return canonicalize_path(self.dirname) if self.dirname else None
+
+    def _try_link(self):
+        try:
+            self.cats_parser.link()
+            return True
+        except CatsParseException:
+            return False
+
+    def _trusted_files(self, scoped_links):
+        link_digests = self._link_digests(scoped_links)
+        return {
+            scoped_link.filename for scoped_link in scoped_links
+            if link_digests.get(canonicalize_path(scoped_link.filename)) in self.trusted_digests
+        }
+
+    def _link_digests(self, scoped_links):
+        # links of a file only stay valid while neither the file, nor any file it imports (transitively),
+        # nor any file defining a type it links to changes, so the digest covers the contents of all of them
+        type_files = {type_name: filename for filename, type_names in self.file_type_names.items() for type_name in type_names}
+        linked_files = defaultdict(set)
+        for scoped_link in scoped_links:
+            linked_type_name = scoped_link.link[1]
+            linked_files[canonicalize_path(scoped_link.filename)].add(type_files.get(linked_type_name, 'undefined:' + linked_type_name))
+
+        link_digests = {}
+        for filename, files in linked_files.items():
+            if filename not in self.import_graph:
+                continue
+
+            hasher = hashlib.sha256()
+            for dependency_filename in sorted(files.union(self.import_closure(filename))):
+                hasher.update('{0}\0{1}\0'.format(dependency_filename, self.file_digests.get(dependency_filename)).encode('utf-8'))
+
+            link_digests[filename] = hasher.hexdigest()
+
+        return link_digests
+
+    def validated_digests(self):
+        """Links all parsed files and returns digests of the files with links, which can be trusted by later sessions"""
+        link_digests = self._link_digests(self.cats_parser.linker.unresolved_links)
+        self.cats_parser.link()
+        return set(link_digests.values())
+
+    def parse_parallel(self, schema_filenames, jobs=None):
+        """Parses root files, parsing independent files of their import graph concurrently in up to jobs processes"""
+        for schema_filename in schema_filenames:
+            self.root_filenames.setdefault(canonicalize_path(schema_filename), schema_filename)
+
+        if self._try_parse_parallel(schema_filenames, jobs):
+            return
+
+        # any failure is reproduced by a serial parse, so that errors are identical to the ones reported by parse
+        for schema_filename in schema_filenames:
+            self.parse(schema_filename)
+
+    def parse_all(self, schema_filenames, jobs=None):
+        """Parses root files into a single set of types and returns the exceptions of roots that failed keyed by root filename"""
+        if jobs and self._try_parse_all_parallel(schema_filenames, jobs):
+            return OrderedDict()
+
+        errors = OrderedDict()
+        for schema_filename in schema_filenames:
+            previously_parsed_files = set(self.import_graph)
+            try:
+                self.parse(schema_filename)
+                if self.cats_parser.linker.deferred:
+                    self.cats_parser.link()
+            except CatsParseException as ex:
+                errors[schema_filename] = ex
+
+                # files first parsed for a failed root are discarded, so that other roots are unaffected by the failure
+                failed_root_files = set(self.import_graph) - previously_parsed_files
+                self._remove_files(failed_root_files)
+                self.failed_files -= failed_root_files
+                self.root_filenames.pop(canonicalize_path(schema_filename), None)
+
+        return errors
+
+    def _try_parse_all_parallel(self, schema_filenames, jobs):
+        for schema_filename in schema_filenames:
+            self.root_filenames.setdefault(canonicalize_path(schema_filename), schema_filename)
+
+        previously_parsed_files = set(self.import_graph)
+        if not self._try_parse_parallel(schema_filenames, jobs):
+            return False
+
+        if not self.cats_parser.linker.deferred:
+            return True
+
+        try:
+            self.cats_parser.link()
+            return True
+        except CatsParseException:
+            # links of all roots are resolved together, so the files are parsed again root by root to attribute the failures
+            self._remove_files(set(self.import_graph) - previously_parsed_files)
+            return False
+
+    def _try_parse_parallel(self, schema_filenames, jobs):
+        scanned_files = scan_schema_files(schema_filenames, self.dirname, self.import_graph)
+        if scanned_files is None:
+            return False
+
+        results = parse_scanned_files(scanned_files, jobs, self._closure_type_descriptors, self.cats_parser.linker.deferred)
+        if results is None:
+            return False
+
+        # merge in the order a serial parse would have defined the types, after checking that the merge cannot fail
+        root_filenames = [canonicalize_path(schema_filename) for schema_filename in schema_filenames]
+        type_names = set(self.cats_parser.wip_type_descriptors)
+        for operation in self._merge_operations(root_filenames, results):
+            if 'type' == operation[0]:
+                if operation[2] in type_names:
+                    return False
+
+                type_names.add(operation[2])
+
+        for operation in self._merge_operations(root_filenames, results):
+            if 'file' == operation[0]:
+                self.import_graph[operation[1]] = []
+                self.file_type_names[operation[1]] = []
+                self.import_positions[operation[1]] = []
+                self.file_digests[operation[1]] = scanned_files[operation[1]].digest
+            elif 'import' == operation[0]:
+                self.import_graph[operation[1]].append(operation[2])
+                self.import_positions[operation[1]].append(len(self.file_type_names[operation[1]]))
+            elif 'link' == operation[0]:
+                self.cats_parser.linker.unresolved_links.append(operation[2])
+            else:
+                self.active_files.append(operation[1])
+                self.cats_parser.set_type_descriptor(operation[2], operation[3])
+                self.active_files.pop()
+
+        return True
+
+    def _merge_operations(self, root_filenames, results):
+        visited_filenames = set(self.import_graph)
+
+        def visit(canonical_filename):
+            if canonical_filename in visited_filenames:
+                return
+
+            visited_filenames.add(canonical_filename)
+            yield ('file', canonical_filename)
+            for item in results[canonical_filename]:
+                yield (item[0], canonical_filename) + item[1:]
+                if 'import' == item[0]:
+                    yield from visit(item[1])
+
+        for root_filename in root_filenames:
+            yield from visit(root_filename)
+
+    def _closure_type_descriptors(self, canonical_filename):
+        type_descriptors = self.cats_parser.wip_type_descriptors
+        return OrderedDict(
+            (type_name, type_descriptors[type_name])
+            for filename in self.import_closure(canonical_filename) for type_name in self.file_type_names[filename]
+        )
+
+    def reparse(self, filenames=None):
+        """Reparses changed files (by default, files whose content changed) and all files depending on them"""
+        if filenames is None:
+            changed_files = {filename for filename in self.import_graph if file_digest(filename) != self.file_digests[filename]}
+        else:
+            changed_files = {canonicalize_path(filename) for filename in filenames}.intersection(self.import_graph)
+
+        affected_files = self._dependent_files(changed_files | self.failed_files)
+        self.failed_files = set()
+        self._remove_files(affected_files)
+
+        # unaffected roots are already parsed, so this only reparses affected files
+        for schema_filename in self.root_filenames.values():
+            self.parse(schema_filename)
+
+        # types of files that are no longer reachable from any root (e.g. after an import is removed) are dropped too
+        reachable_files = set()
+        for root_filename in self.root_filenames:
+            reachable_files.update(self.import_closure(root_filename))
+
+        self._remove_files(set(self.import_graph) - reachable_files)
+
+        # reparsed types were appended, so all types are put back into the order of a complete parse of the roots
+        type_descriptors = self.cats_parser.wip_type_descriptors
+        for type_name in self._ordered_type_names():
+            type_descriptors.move_to_end(type_name)
+
+        return affected_files
+
+    def _ordered_type_names(self):
+        visited_filenames = set()
+
+        def visit(canonical_filename):
+            if canonical_filename in visited_filenames:
+                return
+
+            visited_filenames.add(canonical_filename)
+            type_names = self.file_type_names[canonical_filename]
+            start_index = 0
+            for import_filename, import_position in zip(self.import_graph[canonical_filename], self.import_positions[canonical_filename]):
+                yield from type_names[start_index:import_position]
+                start_index = import_position
+                yield from visit(import_filename)
+
+            yield from type_names[start_index:]
+
+        for root_filename in self.root_filenames:
+            yield from visit(root_filename)
+
+    def _dependent_files(self, canonical_filenames):
+        # a file depends on files it imports and on files defining types it references, even without an import
+        dependents = defaultdict(set)
+        type_files = {}
+        for filename, type_names in self.file_type_names.items():
+            for type_name in type_names:
+                type_files[type_name] = filename
+
+        for filename, imports in self.import_graph.items():
+            for import_filename in imports:
+                dependents[import_filename].add(filename)
+
+            for type_name in self.file_type_names.get(filename, []):
+                for member in self.cats_parser.wip_type_descriptors[type_name].get('layout', []):
+                    if member.get('type') in type_files:
+                        dependents[type_files[member['type']]].add(filename)
+
+        affected_files = set()
+        pending_files = list(canonical_filenames)
+        while pending_files:
+            filename = pending_files.pop()
+            if filename not in affected_files:
+                affected_files.add(filename)
+                pending_files.extend(dependents[filename])
+
+        return affected_files
+
+    def _remove_files(self, canonical_filenames):
+        for filename in canonical_filenames:
+            for type_name in self.file_type_names.pop(filename, []):
+                self.cats_parser.remove_type_descriptor(type_name)
+
+            self.import_graph.pop(filename, None)
+            self.import_positions.pop(filename, None)
+            self.file_digests.pop(filename, None)
+
+        self.cats_parser.linker.unresolved_links = [
+            scoped_link for scoped_link in self.cats_parser.linker.unresolved_links
+            if canonicalize_path(scoped_link.filename) not in canonical_filenames
+        ]
+
+    def is_parsed(self, filename):
+        """Returns True if the specified file has been parsed in this session"""
+        canonical_filename = canonicalize_path(filename)
+        return canonical_filename in self.import_graph and canonical_filename not in self.active_files
+
+    def import_closure(self, canonical_filename):
+        """Returns the canonical paths of a parsed file and all files it transitively imports in parse order"""
+        closure = OrderedDict()
+        pending_filenames = [canonical_filename]
+        while pending_filenames:
+            filename = pending_filenames.pop()
+            if filename not in closure:
+                closure[filename] = True
+                pending_filenames.extend(reversed(self.import_graph[filename]))
+
+        return list(closure)
+
+    def _create_cache_entry(self, closure):
+        closure_set = set(closure)
+        type_files = {}
+        for filename in closure:
+            for type_name in self.file_type_names[filename]:
+                type_files[type_name] = filename
+
+        type_descriptors = self.cats_parser.wip_type_descriptors
+        return {
+            'files': OrderedDict(
+                (filename, {
+                    'digest': self.file_digests[filename],
+                    'imports': self.import_graph[filename],
+                    'import_positions': self.import_positions[filename]
+                })
+                for filename in self.import_graph if filename in closure_set
+            ),
+            'types': [
+                (type_name, type_files[type_name], type_descriptors[type_name])
+                for type_name in type_descriptors if type_name in type_files
+            ]
+        }
+
+    def _load_cache_entry(self, entry):
+        loaded_files = set()
+        for filename, file_entry in entry['files'].items():
+            if filename not in self.import_graph:
+                self.import_graph[filename] = list(file_entry['imports'])
+                self.import_positions[filename] = list(file_entry['import_positions'])
+                self.file_digests[filename] = file_entry['digest']
+                self.file_type_names[filename] = []
+                loaded_files.add(filename)
+
+        for type_name, filename, type_descriptor in entry['types']:
+            if filename in loaded_files:
+                self.active_files.append(filename)
+                self.cats_parser.set_type_descriptor(type_name, type_descriptor)
+                self.active_files.pop()
+
+    def _on_type_descriptor(self, type_name, _):
+        self.file_type_names[self.active_files[-1]].append(type_name)
+
+    def _process_import_file(self, filename):
+        filename = os.path.join(self.dirname, filename)
+        self.import_graph[self.active_files[-1]].append(canonicalize_path(filename))
+        self.import_positions[self.active_files[-1]].append(len(self.file_type_names[self.active_files[-1]]))
+        self._process_file(filename)
+
+    def _process_file(self, filename):
+        canonical_filename = canonicalize_path(filename)
+        if canonical_filename in self.active_files:
+            raise CatsParseException('circular import of "{0}"'.format(filename))
+
+        # each file is parsed at most once per session because all of its types are already in the global namespace
+        if canonical_filename in self.import_graph:
+            return
+
+        self.import_graph[canonical_filename] = []
+        self.file_type_names[canonical_filename] = []
+        self.import_positions[canonical_filename] = []
+        self.file_digests[canonical_filename] = None
+        self.active_files.append(canonical_filename)
+        self.cats_parser.push_scope(filename)
+
+        try:
+            with self.profiler.stage('parse', file=filename):
+                with open(filename) as input_file:
+                    # lines are streamed into the parser and the digest is only set once the whole file has been consumed
+                    hasher = ContentHasher()
+                    self.cats_parser.parse_lines(hasher.iterate(input_file))
+                    self.file_digests[canonical_filename] = hasher.hexdigest()
+
+                # close any type left open at the end of the file, so that it is attributed to this file
+                self.cats_parser.close_type()
+        except Exception:
+            # remember partially parsed files, so that they are parsed again by reparse
+            self.failed_files.add(canonical_filename)
+            self.cats_parser.active_parser = None
+            raise
+        finally:
+            self.active_files.pop()
+
+        self.cats_parser.pop_scope()
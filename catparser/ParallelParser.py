@@ -0,0 +1,180 @@
+# pylint: disable=too-few-public-methods
+import os
+from collections import OrderedDict, namedtuple
+from .CatsParser import CatsParser
+from .ImportParser import ImportParserFactory
+from .ParseCache import content_digest
+from .parserutils import canonicalize_path
+
+ScannedFile = namedtuple('ScannedFile', ['filename', 'lines', 'digest', 'imports'])
+
+
+def _scan_imports(lines):
+    # only unindented lines can be imports, anything else is rejected later by the parser
+    import_regex = ImportParserFactory().regex
+    for line in lines:
+        if not line.startswith('\t'):
+            match = import_regex.match(line.strip())
+            if match:
+                yield match.group(1)
+
+
+def scan_schema_files(schema_filenames, include_path, parsed_files):
+    """Reads all unparsed files reachable from the root files and extracts their imports, or returns None if a file is unreadable"""
+    scanned_files = OrderedDict()
+    pending_filenames = list(reversed(schema_filenames))
+    while pending_filenames:
+        filename = pending_filenames.pop()
+        canonical_filename = canonicalize_path(filename)
+        if canonical_filename in parsed_files or canonical_filename in scanned_files:
+            continue
+
+        try:
+            with open(filename) as input_file:
+                lines = input_file.readlines()
+        except OSError:
+            return None
+
+        imports = [
+            (import_file, canonicalize_path(os.path.join(include_path, import_file)), os.path.join(include_path, import_file))
+            for import_file in _scan_imports(lines)
+        ]
+        scanned_files[canonical_filename] = ScannedFile(filename, lines, content_digest(''.join(lines)), imports)
+        pending_filenames.extend(import_filename for _, _, import_filename in reversed(imports))
+
+    return scanned_files
+
+
+# parse result is the sequence of ('type', name, descriptor) and ('import', canonical filename) items in file order
+class SingleFileParser:
+    """Parses a single schema file given the type descriptors made visible by each of its imports"""
+    def __init__(self, import_type_descriptors, deferred_linking):
+        self.import_type_descriptors = import_type_descriptors
+        self.cats_parser = CatsParser(self._process_import, self._on_type_descriptor, deferred_linking)
+        self.items = []
+        self.is_importing = False
+
+    def parse(self, filename, lines):
+        self.cats_parser.push_scope(filename)
+        for line in lines:
+            self.cats_parser.process_line(line)
+
+        self.cats_parser.close_type()
+        self.cats_parser.pop_scope()
+        return self.items + [('link', scoped_link) for scoped_link in self.cats_parser.linker.unresolved_links]
+
+    def _process_import(self, import_file):
+        canonical_filename, type_descriptors = self.import_type_descriptors[import_file]
+        self.items.append(('import', canonical_filename))
+
+        self.is_importing = True
+        for type_name, type_descriptor in type_descriptors:
+            if type_name not in self.cats_parser.wip_type_descriptors:
+                self.cats_parser.set_type_descriptor(type_name, type_descriptor)
+
+        self.is_importing = False
+
+    def _on_type_descriptor(self, type_name, type_descriptor):
+        if not self.is_importing:
+            self.items.append(('type', type_name, type_descriptor))
+
+
+def _parse_file(filename, lines, import_type_descriptors, deferred_linking):
+    try:
+        return SingleFileParser(import_type_descriptors, deferred_linking).parse(filename, lines)
+    except Exception:  # pylint: disable=broad-except
+        # failures are reported by a serial reparse, which produces the canonical error
+        return None
+
+
+class _Scheduler:
+    def __init__(self, scanned_files, closure_descriptors, deferred_linking):
+        self.scanned_files = scanned_files
+        self.closure_descriptors = closure_descriptors
+        self.deferred_linking = deferred_linking
+        self.results = {}
+        self.closure_type_descriptors_cache = {}
+
+        self.dependents = {canonical_filename: [] for canonical_filename in scanned_files}
+        self.pending_dependencies = {}
+        for canonical_filename, scanned_file in scanned_files.items():
+            # when linking is deferred, files do not need the types of their imports, so all files can be parsed at once
+            dependencies = set() if deferred_linking else {
+                import_tuple[1] for import_tuple in scanned_file.imports if import_tuple[1] in scanned_files
+            }
+            self.pending_dependencies[canonical_filename] = dependencies
+            for dependency in dependencies:
+                self.dependents[dependency].append(canonical_filename)
+
+    def pop_ready_files(self):
+        ready_filenames = [filename for filename, dependencies in self.pending_dependencies.items() if not dependencies]
+        for filename in ready_filenames:
+            del self.pending_dependencies[filename]
+
+        return ready_filenames
+
+    def has_pending_files(self):
+        return bool(self.pending_dependencies)
+
+    def complete(self, canonical_filename, items):
+        self.results[canonical_filename] = items
+        for dependent in self.dependents[canonical_filename]:
+            self.pending_dependencies[dependent].discard(canonical_filename)
+
+    def closure_type_descriptors(self, canonical_filename):
+        if canonical_filename not in self.scanned_files:
+            return self.closure_descriptors(canonical_filename)
+
+        if canonical_filename not in self.closure_type_descriptors_cache:
+            type_descriptors = OrderedDict()
+            for item in self.results[canonical_filename]:
+                if 'import' == item[0]:
+                    type_descriptors.update(self.closure_type_descriptors(item[1]))
+                else:
+                    type_descriptors[item[1]] = item[2]
+
+            self.closure_type_descriptors_cache[canonical_filename] = type_descriptors
+
+        return self.closure_type_descriptors_cache[canonical_filename]
+
+    def task_arguments(self, canonical_filename):
+        scanned_file = self.scanned_files[canonical_filename]
+        import_type_descriptors = {
+            import_file: (
+                import_canonical_filename,
+                [] if self.deferred_linking else list(self.closure_type_descriptors(import_canonical_filename).items())
+            )
+            for import_file, import_canonical_filename, _ in scanned_file.imports
+        }
+        return (scanned_file.filename, scanned_file.lines, import_type_descriptors, self.deferred_linking)
+
+
+def parse_scanned_files(scanned_files, jobs, closure_descriptors, deferred_linking=False):
+    """Parses scanned files in a process pool as soon as their imports are parsed, or returns None if any file is invalid"""
+    # process pools are expensive to import, so they are only imported when files are actually parsed in parallel
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait  # pylint: disable=import-outside-toplevel
+
+    scheduler = _Scheduler(scanned_files, closure_descriptors, deferred_linking)
+    with ProcessPoolExecutor(jobs) as executor:
+        futures = {}
+        while scheduler.has_pending_files() or futures:
+            for canonical_filename in scheduler.pop_ready_files():
+                futures[executor.submit(_parse_file, *scheduler.task_arguments(canonical_filename))] = canonical_filename
+
+            # nothing is running, but files are pending, so the import graph has a cycle
+            if not futures:
+                return None
+
+            done_futures, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done_futures:
+                canonical_filename = futures.pop(future)
+                items = future.result()
+                if items is None:
+                    for pending_future in futures:
+                        pending_future.cancel()
+
+                    return None
+
+                scheduler.complete(canonical_filename, items)
+
+    return scheduler.results
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pickle
+import threading
+
+
+def content_digest(content):
+    """Returns the hex digest of schema file content"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def write_pickle(filename, value):
+    """Pickles a value into a file, creating its directory, without ever exposing a partially written file"""
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+
+    # write to a temporary file first, so that concurrent readers never see a partial entry (and concurrent writers never collide)
+    temp_filename = '{0}.{1}.{2}.tmp'.format(filename, os.getpid(), threading.get_ident())
+    with open(temp_filename, 'wb') as output_file:
+        pickle.dump(value, output_file, pickle.HIGHEST_PROTOCOL)
+
+    os.replace(temp_filename, filename)
+
+
+class ContentHasher:
+    """Computes the same digest as content_digest over content that is consumed line by line"""
+    def __init__(self):
+        self.hasher = hashlib.sha256()
+
+    def iterate(self, lines):
+        """Yields all lines, adding each one to the digest"""
+        for line in lines:
+            self.hasher.update(line.encode('utf-8'))
+            yield line
+
+    def hexdigest(self):
+        """Returns the hex digest of all consumed lines"""
+        return self.hasher.hexdigest()
+
+
+def file_digest(filename):
+    """Returns the hex digest of a schema file or None if the file cannot be read"""
+    try:
+        with open(filename) as input_file:
+            return content_digest(input_file.read())
+    except OSError:
+        return None
+
+
+def parser_version():
+    """Returns a digest of the parser sources, so that any parser change invalidates previously cached results"""
+    hasher = hashlib.sha256()
+    package_directory = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(os.listdir(package_directory)):
+        if filename.endswith('.py'):
+            with open(os.path.join(package_directory, filename), 'rb') as input_file:
+                hasher.update(filename.encode('utf-8'))
+                hasher.update(input_file.read())
+
+    return hasher.hexdigest()
+
+
+# an entry is stored per root schema file and include path (which determines the files imports resolve to) and holds every file
+# in its import closure (with content digest and direct imports) and the types those files define; an entry is only used when all
+# of the digests still match
+class ParseCache:
+    """On-disk cache of parse results keyed by schema content and parser version"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.version = parser_version()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, canonical_filename, include_path, digest):
+        hasher = hashlib.sha256()
+        for part in [self.version, canonical_filename, include_path or '', digest]:
+            hasher.update(part.encode('utf-8'))
+            hasher.update(b'\0')
+
+        return os.path.join(self.directory, '{0}.pickle'.format(hasher.hexdigest()))
+
+    def load(self, canonical_filename, include_path=None):
+        """Returns the cached entry for a root schema file parsed with an include path or None if there is no valid entry"""
+        entry = self._load(canonical_filename, include_path)
+        if entry:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return entry
+
+    def _load(self, canonical_filename, include_path):
+        digest = file_digest(canonical_filename)
+        if not digest:
+            return None
+
+        try:
+            with open(self._entry_path(canonical_filename, include_path, digest), 'rb') as input_file:
+                entry = pickle.load(input_file)
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+            return None
+
+        if any(file_digest(filename) != file_entry['digest'] for filename, file_entry in entry['files'].items()):
+            return None
+
+        return entry
+
+    def store(self, canonical_filename, entry, include_path=None):
+        """Stores the entry for a root schema file parsed with an include path"""
+        write_pickle(self._entry_path(canonical_filename, include_path, entry['files'][canonical_filename]['digest']), entry)
+
+    def statistics(self):
+        """Returns a human readable summary of cache usage"""
+        return 'parse cache: {0} hit(s), {1} miss(es)'.format(self.hits, self.misses)
@@ -1,11 +1,26 @@
 import re
 
 
+class RegexParser:
+    """Base for parsers that consume a single regex match"""
+    def __init__(self, regex):
+        self.regex = regex
+
+    def process_line(self, line):
+        """Matches and processes a line"""
+        return self.process_match(self.regex.match(line))
+
+    def process_match(self, match):
+        """Processes a line that has already been matched by this parser's regex"""
+        raise NotImplementedError('need to override method')
+
+
 class RegexParserFactory:
     """Base for top-level parser factories"""
-    def __init__(self, regex, parser_type):
+    def __init__(self, regex, parser_type, keyword):
         self.regex = re.compile('^{0}$'.format(regex))
         self.parser_type = parser_type
+        self.keyword = keyword
 
     def is_match(self, line):
         """Returns True if the line is a match for this factory's parser"""
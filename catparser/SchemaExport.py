@@ -0,0 +1,227 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+import json
+from .CompactDescriptors import compact_type_descriptors, expand_descriptor
+
+FORMAT_NAME = 'catbuffer-schema'
+FORMAT_VERSION = 1
+BINARY_MAGIC = b'CATB'
+
+# tags of binary values
+STRING_TAG = 0
+UINT_TAG = 1
+NEGATIVE_INT_TAG = 2
+MAPPING_TAG = 3
+LIST_TAG = 4
+
+
+# region JSON
+
+def dumps_json(type_descriptors):
+    """Returns the type descriptors as deterministic JSON, which keeps the type order and sorts all keys"""
+    document = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'types': [[type_name, expand_descriptor(type_descriptor)] for type_name, type_descriptor in type_descriptors.items()]
+    }
+    return json.dumps(document, indent=4, sort_keys=True) + '\n'
+
+
+def _loads_json(data):
+    document = json.loads(data.decode('utf-8') if isinstance(data, bytes) else data)
+    if not isinstance(document, dict) or FORMAT_NAME != document.get('format'):
+        raise ValueError('data is not an exported schema')
+
+    if FORMAT_VERSION != document.get('version'):
+        raise ValueError('unsupported schema export version {0}'.format(document.get('version')))
+
+    return OrderedDict((type_name, type_descriptor) for type_name, type_descriptor in document['types'])
+
+# endregion
+
+
+# region binary
+
+def _write_varint(output, value):
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if not value:
+            output.append(byte)
+            return
+
+        output.append(byte | 0x80)
+
+
+class _BinaryWriter:
+    def __init__(self):
+        self.string_indexes = OrderedDict()
+
+    def string_index(self, string):
+        # strings are numbered by first use, so that the string table is deterministic
+        if string not in self.string_indexes:
+            self.string_indexes[string] = len(self.string_indexes)
+
+        return self.string_indexes[string]
+
+    def write_value(self, output, value):
+        if isinstance(value, str):
+            output.append(STRING_TAG)
+            _write_varint(output, self.string_index(value))
+        elif isinstance(value, bool) or value is None:
+            raise TypeError('cannot export value {0!r}'.format(value))
+        elif isinstance(value, int):
+            output.append(UINT_TAG if value >= 0 else NEGATIVE_INT_TAG)
+            _write_varint(output, value if value >= 0 else -value - 1)
+        elif isinstance(value, Mapping):
+            output.append(MAPPING_TAG)
+            keys = sorted(value)
+            _write_varint(output, len(keys))
+            for key in keys:
+                _write_varint(output, self.string_index(key))
+                self.write_value(output, value[key])
+        elif isinstance(value, (list, tuple)):
+            output.append(LIST_TAG)
+            _write_varint(output, len(value))
+            for item in value:
+                self.write_value(output, item)
+        else:
+            raise TypeError('cannot export value of type {0}'.format(type(value).__name__))
+
+
+def dumps_binary(type_descriptors):
+    """
+    Returns the type descriptors in the compact binary format:
+    magic, version, string table (count, then length-prefixed utf-8 strings) and types (count, then name string index and
+    length-prefixed tagged value of each type)
+    """
+    writer = _BinaryWriter()
+    types = bytearray()
+    _write_varint(types, len(type_descriptors))
+    for type_name, type_descriptor in type_descriptors.items():
+        record = bytearray()
+        writer.write_value(record, type_descriptor)
+        _write_varint(types, writer.string_index(type_name))
+        _write_varint(types, len(record))
+        types += record
+
+    output = bytearray(BINARY_MAGIC)
+    output.append(FORMAT_VERSION)
+    _write_varint(output, len(writer.string_indexes))
+    for string in writer.string_indexes:
+        encoded_string = string.encode('utf-8')
+        _write_varint(output, len(encoded_string))
+        output += encoded_string
+
+    return bytes(output + types)
+
+
+class _BinaryReader:
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+        self.strings = []
+
+    def read_varint(self):
+        value = 0
+        shift = 0
+        while True:
+            byte = self._read_byte()
+            value |= (byte & 0x7F) << shift
+            if not byte & 0x80:
+                return value
+
+            shift += 7
+
+    def _read_byte(self):
+        if self.position >= len(self.data):
+            raise ValueError('unexpected end of binary schema')
+
+        byte = self.data[self.position]
+        self.position += 1
+        return byte
+
+    def read_bytes(self, size):
+        if self.position + size > len(self.data):
+            raise ValueError('unexpected end of binary schema')
+
+        value = self.data[self.position:self.position + size]
+        self.position += size
+        return value
+
+    def read_string(self):
+        index = self.read_varint()
+        if index >= len(self.strings):
+            raise ValueError('invalid string index {0}'.format(index))
+
+        return self.strings[index]
+
+    def read_value(self):
+        tag = self._read_byte()
+        if STRING_TAG == tag:
+            return self.read_string()
+
+        if UINT_TAG == tag:
+            return self.read_varint()
+
+        if NEGATIVE_INT_TAG == tag:
+            return -self.read_varint() - 1
+
+        if MAPPING_TAG == tag:
+            return {self.read_string(): self.read_value() for _ in range(self.read_varint())}
+
+        if LIST_TAG == tag:
+            return [self.read_value() for _ in range(self.read_varint())]
+
+        raise ValueError('invalid value tag {0}'.format(tag))
+
+
+def _loads_binary(data):
+    reader = _BinaryReader(data)
+    reader.read_bytes(len(BINARY_MAGIC))
+    version = reader.read_varint()
+    if FORMAT_VERSION != version:
+        raise ValueError('unsupported schema export version {0}'.format(version))
+
+    reader.strings = [reader.read_bytes(reader.read_varint()).decode('utf-8') for _ in range(reader.read_varint())]
+
+    type_descriptors = OrderedDict()
+    for _ in range(reader.read_varint()):
+        type_name = reader.read_string()
+        record_end = reader.read_varint() + reader.position
+        type_descriptors[type_name] = reader.read_value()
+        if record_end != reader.position:
+            raise ValueError('invalid length of type {0}'.format(type_name))
+
+    if len(data) != reader.position:
+        raise ValueError('unexpected data after binary schema')
+
+    return type_descriptors
+
+# endregion
+
+
+def export_schema(type_descriptors, filename, export_format='json'):
+    """Writes the type descriptors to a file in the json or binary export format"""
+    if 'json' == export_format:
+        content = dumps_json(type_descriptors).encode('utf-8')
+    elif 'binary' == export_format:
+        content = dumps_binary(type_descriptors)
+    else:
+        raise ValueError('unknown export format "{0}"'.format(export_format))
+
+    with open(filename, 'wb') as output_file:
+        output_file.write(content)
+
+
+def loads_schema(data, compact=False):
+    """Reads type descriptors exported in either format, optionally as compact descriptors, without parsing any schema file"""
+    is_binary = isinstance(data, (bytes, bytearray)) and data.startswith(BINARY_MAGIC)
+    type_descriptors = _loads_binary(data) if is_binary else _loads_json(data)
+    return compact_type_descriptors(type_descriptors) if compact else type_descriptors
+
+
+def load_schema(filename, compact=False):
+    """Reads type descriptors from a file exported in either format"""
+    with open(filename, 'rb') as input_file:
+        return loads_schema(input_file.read(), compact)
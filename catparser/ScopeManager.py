@@ -1,6 +1,9 @@
 # pylint: disable=too-few-public-methods
+from collections import namedtuple
 from .CatsParseException import CatsParseException
 
+Location = namedtuple('Location', ['filename', 'line_number'])
+
 
 class Scope:
     """Tuple composed of filename and line number"""
@@ -22,6 +25,19 @@ class ScopeManager:
         """Gets the current location"""
         return ['{0}:{1}'.format(scope.name, scope.line_number) for scope in self.scopes][::-1]
 
+    def location(self):
+        """Gets the filename and line number of the innermost scope"""
+        scope = self.scopes[-1]
+        return Location(scope.name, scope.line_number)
+
+    def scope_depth(self):
+        """Gets the number of pushed scopes"""
+        return len(self.scopes) - 1
+
+    def pop_scopes(self, depth):
+        """Pops all scopes pushed above the specified depth"""
+        del self.scopes[depth + 1:]
+
     def pop_scope(self):
         """Pops the input scope"""
         if 1 == len(self.scopes):
@@ -0,0 +1,125 @@
+# pylint: disable=too-few-public-methods
+import cProfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# peaks of traced memory can only be measured per stage when they can be reset (python 3.9+)
+CAN_RESET_PEAK = hasattr(tracemalloc, 'reset_peak')
+
+
+class StageProfiler:
+    """
+    Collects wall time, cpu time and allocations of named (and possibly nested) processing stages
+    (net_bytes is the change of traced memory, which is small or negative when a stage frees what it allocates,
+    and peak_bytes, when available, is the highest traced memory during the stage above the memory traced at its start)
+    """
+    def __init__(self, trace_allocations=True, use_cprofile=False):
+        self.trace_allocations = trace_allocations
+        self.cprofile = cProfile.Profile() if use_cprofile else None
+        self.is_tracing_owner = False
+        self.stages = []
+        self.depth = 0
+
+        # highest traced memory of each active traced stage observed before the peak was last reset
+        self.observed_peaks = []
+        self.start_time = None
+        self.wall_seconds = None
+
+    def start(self):
+        """Starts profiling"""
+        if self.trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.is_tracing_owner = True
+
+        if self.cprofile:
+            self.cprofile.enable()
+
+        self.start_time = time.perf_counter()
+
+    def stop(self):
+        """Stops profiling"""
+        self.wall_seconds = time.perf_counter() - self.start_time
+        if self.cprofile:
+            self.cprofile.disable()
+
+        if self.is_tracing_owner:
+            tracemalloc.stop()
+            self.is_tracing_owner = False
+
+    @contextmanager
+    def stage(self, name, **details):
+        """Measures the enclosed block as a stage; details (e.g. a filename) are included in the stage record"""
+        record = {'name': name, 'depth': self.depth}
+        record.update(details)
+        self.stages.append(record)
+
+        is_tracing = tracemalloc.is_tracing()
+        start_bytes = self._start_tracing_stage() if is_tracing else 0
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        self.depth += 1
+        try:
+            yield record
+        finally:
+            self.depth -= 1
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = time.process_time() - cpu_start
+            if is_tracing:
+                self._finish_tracing_stage(record, start_bytes)
+
+    def _start_tracing_stage(self):
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        if CAN_RESET_PEAK:
+            # the peak is shared by all stages, so the enclosing stage keeps its peak before it is reset for this stage
+            self._observe_peak(peak_bytes)
+            self.observed_peaks.append(current_bytes)
+            tracemalloc.reset_peak()
+
+        return current_bytes
+
+    def _finish_tracing_stage(self, record, start_bytes):
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        record['net_bytes'] = current_bytes - start_bytes
+        if CAN_RESET_PEAK:
+            peak_bytes = max(self.observed_peaks.pop(), peak_bytes)
+            record['peak_bytes'] = peak_bytes - start_bytes
+            self._observe_peak(peak_bytes)
+
+    def _observe_peak(self, peak_bytes):
+        if self.observed_peaks:
+            self.observed_peaks[-1] = max(self.observed_peaks[-1], peak_bytes)
+
+    def results(self):
+        """Returns all stage records in start order plus totals by stage name, suitable for JSON serialization"""
+        totals = {}
+        enclosing_names = []
+        for record in self.stages:
+            del enclosing_names[record['depth']:]
+            total = totals.setdefault(record['name'], {'count': 0, 'wall_seconds': 0, 'cpu_seconds': 0})
+
+            # nested stages of the same name (e.g. parses of imported files) are already included in the enclosing stage
+            total['count'] += 1
+            if record['name'] not in enclosing_names:
+                total['wall_seconds'] += record.get('wall_seconds', 0)
+                total['cpu_seconds'] += record.get('cpu_seconds', 0)
+
+            enclosing_names.append(record['name'])
+
+        return {'wall_seconds': self.wall_seconds, 'totals': totals, 'stages': self.stages}
+
+    def dump_cprofile(self, filename):
+        """Writes collected cProfile statistics to filename (readable with pstats)"""
+        self.cprofile.dump_stats(filename)
+
+
+class NullProfiler:
+    """Profiler that does not measure anything, used when profiling is disabled"""
+    @staticmethod
+    @contextmanager
+    def stage(_name, **_details):
+        """Runs the enclosed block without measuring it"""
+        yield None
+
+
+NULL_PROFILER = NullProfiler()
@@ -1,10 +1,11 @@
 # pylint: disable=too-few-public-methods
 from .CatsParseException import CatsParseException
 from .CompositeTypeParser import CompositeTypeParser
-from .RegexParserFactory import RegexParserFactory
+from .LineDispatcher import ARRAY_KEYWORD, ASSIGNMENT_KEYWORD
+from .RegexParserFactory import RegexParser, RegexParserFactory
 from .parserutils import \
-    is_builtin, is_dec_or_hex, is_primitive, \
-    parse_builtin, parse_dec_or_hex, require_property_name, require_user_type_name
+    is_dec_or_hex, is_primitive, \
+    parse_builtin, parse_dec_or_hex, require_property_name, require_user_type_name, try_parse_builtin
 
 
 # region StructParser(Factory)
@@ -19,10 +20,19 @@ class StructParser(CompositeTypeParser):
             StructScalarMemberParserFactory()
         ])
 
-    def process_line(self, line):
-        match = self.regex.match(line)
+        # indexes over layout: first descriptor by name and all (name, disposition) pairs
+        self.property_type_descriptors = {}
+        self.property_uids = set()
+
+    def process_match(self, match):
         self.type_name = require_user_type_name(match.group(1))
         self.type_descriptor = {'type': 'struct', 'layout': []}
+        self.property_type_descriptors = {}
+        self.property_uids = set()
+
+    def property_type_descriptor(self, property_name):
+        """Gets the first appended descriptor with the specified name or None if there is none"""
+        return self.property_type_descriptors.get(property_name)
 
     def append(self, property_type_descriptor):
         if 'size' in property_type_descriptor:
@@ -34,6 +44,8 @@ class StructParser(CompositeTypeParser):
         descriptor_uid = self._get_descriptor_uid(property_type_descriptor)
         if descriptor_uid[0]:
             self._require_unknown_property(descriptor_uid)
+            self.property_type_descriptors.setdefault(descriptor_uid[0], property_type_descriptor)
+            self.property_uids.add(descriptor_uid)
 
         self.type_descriptor['layout'].append(property_type_descriptor)
 
@@ -42,13 +54,11 @@ class StructParser(CompositeTypeParser):
         if allow_numeric and not isinstance(property_name, str):
             return
 
-        if all('name' not in property_type_descriptor or property_name != property_type_descriptor['name']
-               for property_type_descriptor in self.type_descriptor['layout']):
+        if property_name not in self.property_type_descriptors:
             raise CatsParseException('no definition for referenced property "{0}"'.format(property_name))
 
     def _require_unknown_property(self, descriptor_uid):
-        if any(descriptor_uid == self._get_descriptor_uid(property_type_descriptor)
-               for property_type_descriptor in self.type_descriptor['layout']):
+        if descriptor_uid in self.property_uids:
             raise CatsParseException('duplicate definition for property "{0}"'.format(descriptor_uid))
 
     @staticmethod
@@ -59,20 +69,16 @@ class StructParser(CompositeTypeParser):
 class StructParserFactory(RegexParserFactory):
     """Factory for creating struct parsers"""
     def __init__(self):
-        super().__init__(r'struct (\S+)', StructParser)
+        super().__init__(r'struct (\S+)', StructParser, 'struct')
 
 # endregion
 
 # region StructConstParser(Factory)
 
 
-class StructConstParser:
+class StructConstParser(RegexParser):
     """Parser for const struct members"""
-    def __init__(self, regex):
-        self.regex = regex
-
-    def process_line(self, line):
-        match = self.regex.match(line)
+    def process_match(self, match):
         type_name = match.group(1)
 
         const_descriptor = {
@@ -92,41 +98,33 @@ class StructConstParser:
 class StructConstParserFactory(RegexParserFactory):
     """Factory for creating struct const parsers"""
     def __init__(self):
-        super().__init__(r'const (\S+) (\S+) = (\S+)', StructConstParser)
+        super().__init__(r'const (\S+) (\S+) = (\S+)', StructConstParser, 'const')
 
 
 # endregion
 
 # region StructInlineParser(Factory)
 
-class StructInlineParser:
+class StructInlineParser(RegexParser):
     """Parser for inline struct members"""
-    def __init__(self, regex):
-        self.regex = regex
-
-    def process_line(self, line):
+    def process_match(self, match):
         # type is resolved to exist upstream, so its naming doesn't need to be checked here
-        match = self.regex.match(line)
         return {'type': match.group(1), 'disposition': 'inline'}
 
 
 class StructInlineParserFactory(RegexParserFactory):
     """Factory for creating struct inline parsers"""
     def __init__(self):
-        super().__init__(r'inline (\S+)', StructInlineParser)
+        super().__init__(r'inline (\S+)', StructInlineParser, 'inline')
 
 # endregion
 
 # region StructArrayMemberParser(Factory)
 
 
-class StructArrayMemberParser:
+class StructArrayMemberParser(RegexParser):
     """Parser for non-inline array struct members"""
-    def __init__(self, regex):
-        self.regex = regex
-
-    def process_line(self, line):
-        match = self.regex.match(line)
+    def process_match(self, match):
 
         # type is resolved to exist upstream, so its naming doesn't need to be checked here
         array_size = match.group(3)
@@ -148,27 +146,21 @@ class StructArrayMemberParser:
 class StructArrayMemberParserFactory(RegexParserFactory):
     """Factory for creating struct member parsers"""
     def __init__(self):
-        super().__init__(r'(\S+) = array\((\S+), (\S+)(, sort_key=(\S+))?\)', StructArrayMemberParser)
+        super().__init__(r'(\S+) = array\(([^\s,]+), ([^\s,)]+)(, sort_key=([^\s)]+))?\)', StructArrayMemberParser, ARRAY_KEYWORD)
 
 # endregion
 
 # region StructScalarMemberParser(Factory)
 
 
-class StructScalarMemberParser:
+class StructScalarMemberParser(RegexParser):
     """Parser for non-inline scalar struct members"""
-    def __init__(self, regex):
-        self.regex = regex
-
-    def process_line(self, line):
-        match = self.regex.match(line)
+    def process_match(self, match):
         linked_type_name = match.group(2)
 
         # type is resolved to exist upstream, so its naming doesn't need to be checked here
-        if is_builtin(linked_type_name):
-            property_type_descriptor = parse_builtin(linked_type_name)  # reduce builtins to byte
-        else:
-            property_type_descriptor = {'type': linked_type_name}
+        # reduce builtins to byte
+        property_type_descriptor = try_parse_builtin(linked_type_name) or {'type': linked_type_name}
 
         if match.group(3):
             property_type_descriptor['condition'] = match.group(4)
@@ -181,6 +173,6 @@ class StructScalarMemberParser:
 class StructScalarMemberParserFactory(RegexParserFactory):
     """Factory for creating struct member parsers"""
     def __init__(self):
-        super().__init__(r'(\S+) = (\S+)( if (\S+) equals (\S+))?', StructScalarMemberParser)
+        super().__init__(r'(\S+) = (\S+)( if (\S+) equals (\S+))?', StructScalarMemberParser, ASSIGNMENT_KEYWORD)
 
 # endregion
@@ -0,0 +1,109 @@
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
+
+# transaction of a schema
+#  - body: name of the inlined struct containing the transaction specific fields (None if there is none)
+#  - embedded: name of the embedded transaction inlining the same body (None if there is none)
+#  - entity_type, version: values of the const entityType and version fields (None if undefined)
+#  - plugin: name of the plugin defining the transaction (None if unknown)
+TransactionEntry = namedtuple('TransactionEntry', ['name', 'body', 'embedded', 'entity_type', 'version', 'plugin'])
+
+
+def _inlined_type_names(type_descriptor):
+    if 'struct' != type_descriptor['type']:
+        return []
+
+    return [field['type'] for field in type_descriptor['layout'] if 'inline' == field.get('disposition')]
+
+
+def _constant_value(type_descriptor, name):
+    for field in type_descriptor['layout']:
+        if 'const' == field.get('disposition') and name == field.get('name'):
+            return field['value']
+
+    return None
+
+
+def _transaction_bodies(type_descriptors, header_name, embedded_header_name):
+    # returns the bodies of all transactions and the embedded transactions keyed by the bodies they inline
+    transaction_bodies = OrderedDict()
+    embedded_names_by_body = {}
+    for type_name, type_descriptor in type_descriptors.items():
+        inlined_type_names = _inlined_type_names(type_descriptor)
+        for candidate_header_name in (header_name, embedded_header_name):
+            if candidate_header_name not in inlined_type_names:
+                continue
+
+            body_names = [inlined_type_name for inlined_type_name in inlined_type_names if candidate_header_name != inlined_type_name]
+            body_name = body_names[0] if body_names else None
+            if header_name == candidate_header_name:
+                transaction_bodies[type_name] = body_name
+            elif body_name:
+                embedded_names_by_body.setdefault(body_name, type_name)
+
+    return transaction_bodies, embedded_names_by_body
+
+
+def _format_entity_type(entity_type):
+    return '{0} (0x{0:04X})'.format(entity_type) if isinstance(entity_type, int) else str(entity_type)
+
+
+class TransactionCatalog(Mapping):
+    """Transactions of a schema keyed by name, found by the header struct they inline, in schema order"""
+    def __init__(self, type_descriptors, plugins=None, header_name='Transaction', embedded_header_name='EmbeddedTransaction'):
+        plugins = plugins or {}
+        transaction_bodies, embedded_names_by_body = _transaction_bodies(type_descriptors, header_name, embedded_header_name)
+
+        self.entries = OrderedDict()
+        self.entries_by_entity_type = {}
+        self.entries_by_embedded_name = {}
+        self.entity_type_collisions = OrderedDict()
+        for name, body_name in transaction_bodies.items():
+            entry = TransactionEntry(
+                name,
+                body_name,
+                embedded_names_by_body.get(body_name),
+                _constant_value(type_descriptors[name], 'entityType'),
+                _constant_value(type_descriptors[name], 'version'),
+                plugins.get(name))
+            self.entries[name] = entry
+            if entry.embedded:
+                self.entries_by_embedded_name[entry.embedded] = entry
+
+            if entry.entity_type is None:
+                continue
+
+            # the first transaction keeps an entity type, later ones are only reported
+            if entry.entity_type in self.entries_by_entity_type:
+                colliding_names = self.entity_type_collisions.setdefault(
+                    entry.entity_type,
+                    [self.entries_by_entity_type[entry.entity_type].name])
+                colliding_names.append(name)
+            else:
+                self.entries_by_entity_type[entry.entity_type] = entry
+
+    def __getitem__(self, name):
+        return self.entries[name]
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def by_entity_type(self, entity_type):
+        """Gets the transaction with an entity type or None if there is none"""
+        return self.entries_by_entity_type.get(entity_type)
+
+    def by_embedded_name(self, embedded_name):
+        """Gets the transaction of an embedded transaction or None if there is none"""
+        return self.entries_by_embedded_name.get(embedded_name)
+
+    def validate(self):
+        """Returns descriptions of entity types that are used by multiple transactions"""
+        return [
+            'entity type {0} is used by transactions {1}'.format(
+                _format_entity_type(entity_type),
+                ', '.join('"{0}"'.format(name) for name in names))
+            for entity_type, names in self.entity_type_collisions.items()
+        ]
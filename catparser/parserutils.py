@@ -1,3 +1,4 @@
+import os
 import re
 from .CatsParseException import CatsParseException
 
@@ -57,16 +58,46 @@ def is_builtin(type_name):
     return REGEXES['int_or_uint'].match(type_name) or REGEXES['binary_fixed_type'].match(type_name)
 
 
-def parse_builtin(type_name):
-    """Parses a builtin type, either binary_fixed or a uint alias"""
+# memoized results of _parse_builtin keyed by type name (None for non-builtin names)
+BUILTIN_TYPE_DESCRIPTORS = {}
+
+
+def _parse_builtin(type_name):
     is_unsigned = True
     binary_fixed_type_match = REGEXES['binary_fixed_type'].match(type_name)
     if binary_fixed_type_match:
         type_descriptor = {'size': parse_dec_or_hex(binary_fixed_type_match.group(1))}
     else:
-        match = _match_regex_or_throw('int_or_uint', type_name)
+        match = REGEXES['int_or_uint'].match(type_name)
+        if not match:
+            return None
+
         is_unsigned = bool(match.group(1))
         uint_byte_count = int(match.group(2)) // 8
         type_descriptor = {'size': uint_byte_count}
 
     return {**type_descriptor, 'type': 'byte', 'signedness': 'unsigned' if is_unsigned else 'signed'}
+
+
+def try_parse_builtin(type_name):
+    """Parses a builtin type, either binary_fixed or a uint alias, or returns None if the type is not builtin"""
+    if type_name not in BUILTIN_TYPE_DESCRIPTORS:
+        BUILTIN_TYPE_DESCRIPTORS[type_name] = _parse_builtin(type_name)
+
+    # callers extend the returned descriptor, so never hand out the memoized instance
+    type_descriptor = BUILTIN_TYPE_DESCRIPTORS[type_name]
+    return dict(type_descriptor) if type_descriptor else None
+
+
+def parse_builtin(type_name):
+    """Parses a builtin type, either binary_fixed or a uint alias"""
+    type_descriptor = try_parse_builtin(type_name)
+    if not type_descriptor:
+        raise CatsParseException('unable to parse "{0}": {1}'.format('int_or_uint', type_name))
+
+    return type_descriptor
+
+
+def canonicalize_path(filename):
+    """Returns the canonical form of a file path used to identify a schema file"""
+    return os.path.normcase(os.path.realpath(filename))
@@ -1,5 +1,6 @@
-from generators.cpp_builder.BuilderGenerator import BuilderGenerator
+from generators.GeneratorRegistry import GeneratorRegistry
 
-AVAILABLE_GENERATORS = {
-    'cpp_builder': BuilderGenerator
-}
+# generators are only imported when they are used, so that their dependencies do not slow down other runs
+AVAILABLE_GENERATORS = GeneratorRegistry({
+    'cpp_builder': 'generators.cpp_builder.BuilderGenerator:BuilderGenerator'
+})
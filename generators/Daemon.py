@@ -0,0 +1,190 @@
+# pylint: disable=too-few-public-methods
+from collections import OrderedDict
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+from catparser.CatsParseException import CatsParseException
+from catparser.ParseCache import file_digest
+from generators.All import AVAILABLE_GENERATORS
+from generators.Session import Session, expand_schema_paths
+
+
+def _file_stat(filename):
+    try:
+        file_stat = os.stat(filename)
+        return (file_stat.st_mtime_ns, file_stat.st_size)
+    except OSError:
+        return None
+
+
+class WarmSession(Session):
+    """Session that keeps the types of a fixed set of roots parsed and only reparses schema files that changed"""
+    def __init__(self, schema_paths, include_path='./schemas', cache_directory=None, deferred_linking=False):
+        super().__init__(include_path, cache_directory, deferred_linking)
+        self.schema_paths = list(schema_paths)
+        self.schema_filenames = None
+        self.errors = None
+        self.file_stats = {}
+
+        # requests for the same roots are serialized, because revalidation modifies the parsed types
+        self.lock = threading.Lock()
+
+    def changed_files(self):
+        """Returns parsed files whose modification time or size changed and whose content differs from the parsed content"""
+        changed_files = set()
+        for filename, file_stat in self.file_stats.items():
+            current_file_stat = _file_stat(filename)
+            if current_file_stat == file_stat:
+                continue
+
+            # files that were only touched keep their parsed types
+            if file_digest(filename) != self.file_parser.file_digests.get(filename):
+                changed_files.add(filename)
+            else:
+                self.file_stats[filename] = current_file_stat
+
+        return changed_files
+
+    def revalidate(self):
+        """Brings the parsed types up to date with all schema files and returns the exceptions of failed roots keyed by filename"""
+        schema_filenames = list(expand_schema_paths(self.schema_paths))
+
+        # directories can gain or lose schema files, which changes the order of all types
+        if self.errors is None or schema_filenames != self.schema_filenames:
+            self._parse_all(schema_filenames)
+            return self.errors
+
+        changed_files = self.changed_files()
+        if changed_files:
+            try:
+                self.file_parser.reparse(changed_files)
+                if self.deferred_linking:
+                    self.file_parser.cats_parser.link()
+
+                self._update_file_stats()
+            except CatsParseException:
+                # errors are reported per root, which only a complete parse does
+                self._parse_all(schema_filenames)
+                return self.errors
+
+        # files of failed roots are discarded by the parser, so failed roots are parsed again to detect fixes
+        if self.errors:
+            errors = self.file_parser.parse_all(list(self.errors))
+            if len(errors) != len(self.errors):
+                # types of fixed roots would follow the types of later roots, so everything is parsed again in order
+                self._parse_all(schema_filenames)
+            else:
+                self.errors = errors
+
+        return self.errors
+
+    def _parse_all(self, schema_filenames):
+        self.schema_filenames = schema_filenames
+        self.errors = self.parse(schema_filenames)
+        self._update_file_stats()
+
+    def _update_file_stats(self):
+        self.file_stats = {filename: _file_stat(filename) for filename in self.file_parser.import_graph}
+
+
+class GenerationDaemon:
+    """Handles generation requests using warm sessions, which are kept for the most recently requested sets of roots"""
+    def __init__(self, cache_directory=None, max_sessions=16):
+        self.cache_directory = cache_directory
+        self.max_sessions = max_sessions
+        self.sessions = OrderedDict()
+        self.lock = threading.Lock()
+
+    def _session(self, schema_paths, include_path, deferred_linking):
+        key = (tuple(schema_paths), include_path, deferred_linking)
+        with self.lock:
+            if key not in self.sessions:
+                self.sessions[key] = WarmSession(schema_paths, include_path, self.cache_directory, deferred_linking)
+
+            # requests still using an evicted session keep it alive until they complete
+            self.sessions.move_to_end(key)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+            return self.sessions[key]
+
+    def handle(self, request):
+        """Parses the requested roots, runs the requested generators and returns all errors, problems and outputs"""
+        schema_paths = request['schemas']
+        if not isinstance(schema_paths, list) or not schema_paths:
+            raise ValueError('request must contain a non-empty list of schemas')
+
+        generator_names = request.get('generators', [])
+        for generator_name in generator_names:
+            if generator_name not in AVAILABLE_GENERATORS:
+                raise ValueError('unknown generator "{0}"'.format(generator_name))
+
+        session = self._session(schema_paths, request.get('include', './schemas'), bool(request.get('deferred_linking')))
+        with session.lock:
+            errors = session.revalidate()
+            problems = OrderedDict()
+            outputs = OrderedDict()
+            for generator_name in generator_names:
+                problems[generator_name] = session.problems(generator_name, request.get('options'))
+                sinks = session.generate(generator_name, request.get('options'))
+                outputs[generator_name] = OrderedDict((filename, sink.lines) for filename, sink in sinks.items())
+
+        return {
+            'errors': OrderedDict((filename, str(ex)) for filename, ex in errors.items()),
+            'problems': problems,
+            'outputs': outputs
+        }
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # every line sent by a client is a JSON request and is answered by a single JSON line
+    def handle(self):
+        for line in self.rfile:
+            try:
+                response = self.server.generation_daemon.handle(json.loads(line.decode('utf-8')))
+            except Exception as ex:  # pylint: disable=broad-except
+                # a failing request must neither stop the daemon nor other requests
+                response = {'error': '{0}: {1}'.format(type(ex).__name__, ex)}
+
+            self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """UNIX socket server handling each connection of a GenerationDaemon in its own thread"""
+    daemon_threads = True
+
+    def __init__(self, socket_path, generation_daemon):
+        # a socket left behind by a daemon that was killed is replaced, but any other file is kept
+        if os.path.exists(socket_path):
+            if not stat.S_ISSOCK(os.stat(socket_path).st_mode):
+                raise ValueError('{0} exists and is not a socket'.format(socket_path))
+
+            os.remove(socket_path)
+
+        # only the owner can connect, because requests can read any file the daemon can
+        umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+        self.generation_daemon = generation_daemon
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+def send_request(socket_path, request):
+    """Sends a request to a daemon listening on socket_path and returns its response"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+        client_socket.connect(socket_path)
+        with client_socket.makefile('rwb') as stream:
+            stream.write((json.dumps(request) + '\n').encode('utf-8'))
+            stream.flush()
+            return json.loads(stream.readline().decode('utf-8'))
@@ -1,3 +1,50 @@
-from collections import namedtuple
-
-Descriptor = namedtuple('Descriptor', ['filename', 'code'])
+from generators.OutputSink import MemorySink
+
+
+class Descriptor:
+    """Generated file, whose content is either a list of lines or is streamed into a sink by a write function"""
+    __slots__ = ('filename', '_code', '_write')
+
+    def __init__(self, filename, code=None, write=None):
+        self.filename = filename
+        self._code = code
+        self._write = write
+
+    @classmethod
+    def streamed(cls, filename, write):
+        """Creates a descriptor whose content is generated by write(sink) every time it is written"""
+        return cls(filename, write=write)
+
+    def write_to(self, sink):
+        """Writes all lines of the content into sink"""
+        if self._write:
+            self._write(sink)
+        else:
+            sink.write_lines(self._code)
+
+    @property
+    def code(self):
+        """Gets the lines of the content, generating them into memory for streamed descriptors"""
+        if self._write:
+            sink = MemorySink()
+            self._write(sink)
+            return sink.lines
+
+        return self._code
+
+    def materialize(self):
+        """Returns an equivalent descriptor holding its lines, which can be pickled and written repeatedly without regeneration"""
+        return self if not self._write else Descriptor(self.filename, self.code)
+
+    def __iter__(self):
+        # descriptors used to be (filename, code) tuples
+        return iter((self.filename, self.code))
+
+    def __eq__(self, other):
+        return isinstance(other, Descriptor) and (self.filename, self.code) == (other.filename, other.code)
+
+    def __hash__(self):
+        return hash(self.filename)
+
+    def __repr__(self):
+        return 'Descriptor(filename={0!r}, code={1})'.format(self.filename, '<streamed>' if self._write else repr(self._code))
@@ -0,0 +1,107 @@
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import sys
+from collections.abc import Mapping
+from catparser.ParseCache import write_pickle
+from generators.Descriptor import Descriptor
+
+
+# modules outside of generator packages that shape the output of every generator
+SHARED_SOURCE_MODULES = ['generators.Descriptor', 'generators.OutputSink', 'generators.Template']
+
+
+def _hash_source_file(hasher, name, filename):
+    with open(filename, 'rb') as input_file:
+        hasher.update(name.encode('utf-8'))
+        hasher.update(input_file.read())
+
+
+def generator_version(generator_class):
+    """
+    Returns a digest of the sources of the package defining a generator, of the shared modules and of the modules the generator
+    declares via source_modules, so that generator changes invalidate entries
+    """
+    hasher = hashlib.sha256(generator_class.__qualname__.encode('utf-8'))
+    package_directory = os.path.dirname(os.path.abspath(sys.modules[generator_class.__module__].__file__))
+    for dirpath, dirnames, filenames in os.walk(package_directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.endswith('.py'):
+                full_path = os.path.join(dirpath, filename)
+                _hash_source_file(hasher, os.path.relpath(full_path, package_directory), full_path)
+
+    source_modules = SHARED_SOURCE_MODULES + (generator_class.source_modules() if hasattr(generator_class, 'source_modules') else [])
+    for module_name in source_modules:
+        _hash_source_file(hasher, module_name, importlib.import_module(module_name).__file__)
+
+    return hasher.hexdigest()
+
+
+def _to_json(value):
+    # descriptors and hint views can be read-only or compact mappings
+    if isinstance(value, Mapping):
+        return dict(value)
+
+    raise TypeError('cannot hash value of type {0}'.format(type(value).__name__))
+
+
+def unit_inputs_digest(version, generator, unit):
+    """Returns a digest of everything a generation unit depends on, given the version of its generator"""
+    inputs = [version, unit, generator.unit_cache_inputs(unit)]
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=_to_json).encode('utf-8')).hexdigest()
+
+
+# generators supporting the cache expose independent generation units (generation_units and generate_unit) and describe
+# everything the output of a unit depends on via unit_cache_inputs; entries hold the Descriptors generated for a unit
+class GenerationCache:
+    """On-disk cache of generated Descriptors keyed by the content of everything a generation unit depends on"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.versions = {}
+        self.hits = 0
+        self.misses = 0
+
+    def unit_key(self, generator, unit):
+        """Returns the cache key of a generation unit or None if the generator does not support caching"""
+        if not hasattr(generator, 'unit_cache_inputs'):
+            return None
+
+        generator_class = type(generator)
+        if generator_class not in self.versions:
+            self.versions[generator_class] = generator_version(generator_class)
+
+        return unit_inputs_digest(self.versions[generator_class], generator, unit)
+
+    def _entry_path(self, key):
+        return os.path.join(self.directory, '{0}.pickle'.format(key))
+
+    def load(self, key):
+        """Returns the cached Descriptors for a key or None if there is no valid entry"""
+        descriptors = self._load(key) if key else None
+        if descriptors is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return descriptors
+
+    def _load(self, key):
+        try:
+            with open(self._entry_path(key), 'rb') as input_file:
+                return [Descriptor(filename, code) for filename, code in pickle.load(input_file)]
+        except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError, TypeError, ValueError):
+            return None
+
+    def store(self, key, descriptors):
+        """Stores the Descriptors generated for a key"""
+        if not key:
+            return
+
+        write_pickle(self._entry_path(key), [(descriptor.filename, list(descriptor.code)) for descriptor in descriptors])
+
+    def statistics(self):
+        """Returns a human readable summary of cache usage"""
+        return 'generation cache: {0} hit(s), {1} miss(es)'.format(self.hits, self.misses)
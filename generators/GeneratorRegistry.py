@@ -0,0 +1,93 @@
+from collections.abc import Mapping
+import functools
+import importlib
+
+# installed packages can provide out-of-tree generators by registering generator classes under this entry point group
+ENTRY_POINT_GROUP = 'catbuffer.generators'
+
+
+def _import_object(object_path):
+    # object paths have the same 'module:attribute' format as entry points
+    module_name, attribute_name = object_path.split(':')
+    return getattr(importlib.import_module(module_name), attribute_name)
+
+
+def installed_entry_points(group):
+    """Returns functions loading the objects registered under an entry point group by installed packages, keyed by name"""
+    # pylint: disable=import-outside-toplevel
+    try:
+        from importlib import metadata
+    except ImportError:
+        # python < 3.8 only provides entry points via setuptools
+        try:
+            import pkg_resources
+        except ImportError:
+            return {}
+
+        return {entry_point.name: entry_point.load for entry_point in pkg_resources.iter_entry_points(group)}
+
+    all_entry_points = metadata.entry_points()
+    if hasattr(all_entry_points, 'select'):
+        group_entry_points = all_entry_points.select(group=group)
+    else:
+        group_entry_points = all_entry_points.get(group, [])
+
+    return {entry_point.name: entry_point.load for entry_point in group_entry_points}
+
+
+class GeneratorRegistry(Mapping):
+    """Generator classes keyed by name, which are only imported when they are looked up"""
+    def __init__(self, builtin_generators, entry_point_group=ENTRY_POINT_GROUP):
+        self.loaders = {
+            name: functools.partial(_import_object, object_path) for name, object_path in builtin_generators.items()
+        }
+        self.builtin_generator_names = list(builtin_generators)
+        self.entry_point_group = entry_point_group
+        self.discovered_entry_points = entry_point_group is None
+        self.generator_classes = {}
+
+    def builtin_names(self):
+        """Gets the names of the generators that are part of this package"""
+        return list(self.builtin_generator_names)
+
+    def register(self, name, loader):
+        """Registers a function loading a generator class, replacing any generator with the same name"""
+        self.loaders[name] = loader
+        self.generator_classes.pop(name, None)
+
+    def unregister(self, name):
+        """Removes a registered generator"""
+        del self.loaders[name]
+        self.generator_classes.pop(name, None)
+
+    def _discover_entry_points(self):
+        # scanning installed packages is comparatively slow, so it is only done when a generator is not known otherwise
+        if self.discovered_entry_points:
+            return
+
+        self.discovered_entry_points = True
+        for name, loader in installed_entry_points(self.entry_point_group).items():
+            self.loaders.setdefault(name, loader)
+
+    def __getitem__(self, name):
+        if name not in self.generator_classes:
+            if name not in self:
+                raise KeyError(name)
+
+            self.generator_classes[name] = self.loaders[name]()
+
+        return self.generator_classes[name]
+
+    def __contains__(self, name):
+        if name not in self.loaders:
+            self._discover_entry_points()
+
+        return name in self.loaders
+
+    def __iter__(self):
+        self._discover_entry_points()
+        return iter(self.loaders)
+
+    def __len__(self):
+        self._discover_entry_points()
+        return len(self.loaders)
@@ -0,0 +1,166 @@
+import filecmp
+import hashlib
+import os
+import stat
+import tempfile
+
+# generated files are usually much smaller, so they are written in a single operation
+DEFAULT_BUFFER_SIZE = 64 * 1024
+
+
+def _read_umask():
+    # umask can only be read by setting it, which affects all threads, so it is only read once when the module is imported
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mode of a regular new file
+NEW_FILE_MODE = 0o666 & ~_read_umask()
+
+
+class OutputSink:
+    """Buffered destination of generated lines, which hands encoded content to _write_chunk in chunks of bounded size"""
+    def __init__(self, buffer_size=DEFAULT_BUFFER_SIZE):
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.buffered_size = 0
+        self.last_line = None
+        self.line_count = 0
+        self.hasher = hashlib.sha256()
+
+    def write_line(self, line):
+        """Writes a single line, which must not contain a line terminator"""
+        self.buffer.append(line)
+        self.buffer.append('\n')
+        self.buffered_size += len(line) + 1
+        self.last_line = line
+        self.line_count += 1
+
+        if self.buffered_size >= self.buffer_size:
+            self.flush()
+
+    def write_lines(self, lines):
+        """Writes all lines"""
+        for line in lines:
+            self.write_line(line)
+
+    def flush(self):
+        """Passes all buffered lines to the destination"""
+        if not self.buffer:
+            return
+
+        chunk = ''.join(self.buffer).encode('utf-8')
+        self.buffer = []
+        self.buffered_size = 0
+        self.hasher.update(chunk)
+        self._write_chunk(chunk)
+
+    def hexdigest(self):
+        """Returns the sha256 digest of everything passed to the destination so far"""
+        return self.hasher.hexdigest()
+
+    def close(self):
+        """Flushes the sink and completes the output"""
+        self.flush()
+
+    def abort(self):
+        """Discards the output after a failure"""
+        self.buffer = []
+        self.buffered_size = 0
+
+    def _write_chunk(self, chunk):
+        pass
+
+
+class HashingSink(OutputSink):
+    """Sink that only computes the digest of the content"""
+
+
+class MemorySink(OutputSink):
+    """Sink that keeps all written lines in memory"""
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+
+    def write_line(self, line):
+        self.lines.append(line)
+        self.last_line = line
+        self.line_count += 1
+
+    def getvalue(self):
+        """Returns the encoded content"""
+        return ''.join('{0}\n'.format(line) for line in self.lines).encode('utf-8')
+
+    def hexdigest(self):
+        return hashlib.sha256(self.getvalue()).hexdigest()
+
+
+class FileSink(OutputSink):
+    """Sink that atomically replaces a file when closed, unless the file already has the same content"""
+    def __init__(self, filename, buffer_size=DEFAULT_BUFFER_SIZE):
+        super().__init__(buffer_size)
+        self.filename = filename
+        self.output_file = None
+        self.temp_filename = None
+        self.changed = None
+
+    def _write_chunk(self, chunk):
+        if not self.output_file:
+            # content is written to a temporary file in the same directory, so that the replace cannot cross file systems
+            file_descriptor, self.temp_filename = tempfile.mkstemp(dir=os.path.dirname(self.filename) or '.', prefix='.tmp-')
+            self.output_file = os.fdopen(file_descriptor, 'wb')
+
+        self.output_file.write(chunk)
+
+    def close(self):
+        """Completes the file and returns True if it was replaced or False if its content did not change"""
+        if self.changed is not None:
+            return self.changed
+
+        try:
+            self.flush()
+            if not self.output_file:
+                self._write_chunk(b'')
+
+            self.output_file.close()
+            self.changed = not self._has_same_content()
+            if self.changed:
+                # temporary files are only accessible by the owner, so the mode of the replaced file or of a regular new file is applied
+                os.chmod(self.temp_filename, self._file_mode())
+                os.replace(self.temp_filename, self.filename)
+            else:
+                os.remove(self.temp_filename)
+        except BaseException:
+            self.abort()
+            raise
+
+        return self.changed
+
+    def abort(self):
+        """Discards everything written, leaving the file untouched"""
+        if self.output_file:
+            self.output_file.close()
+
+        if self.temp_filename and os.path.exists(self.temp_filename):
+            os.remove(self.temp_filename)
+
+        self.changed = False
+
+    def _file_mode(self):
+        try:
+            return stat.S_IMODE(os.stat(self.filename).st_mode)
+        except FileNotFoundError:
+            return NEW_FILE_MODE
+
+    def _has_same_content(self):
+        return os.path.isfile(self.filename) and filecmp.cmp(self.temp_filename, self.filename, shallow=False)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
@@ -0,0 +1,80 @@
+import json
+import os
+from generators.Descriptor import Descriptor
+from generators.OutputSink import FileSink
+
+MANIFEST_FILENAME = '.manifest.json'
+
+
+class OutputWriter:
+    """Writes generated files into a directory, only replacing files whose content changed, and tracks them in a manifest"""
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_filename = os.path.join(directory, MANIFEST_FILENAME)
+        self.previous_hashes = self._load_manifest()
+        self.hashes = {}
+        self.written_files = []
+        self.unchanged_files = []
+        self.kept_files = []
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_filename) as input_file:
+                return json.load(input_file)['files']
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    def write(self, filename, lines):
+        """Writes lines to filename (relative to the output directory) unless the file already has the same content"""
+        return self.write_descriptor(Descriptor(filename, lines))
+
+    def write_descriptor(self, descriptor):
+        """Streams the content of a descriptor into its file unless the file already has the same content"""
+        with FileSink(os.path.join(self.directory, descriptor.filename)) as sink:
+            descriptor.write_to(sink)
+
+        self.hashes[descriptor.filename] = sink.hexdigest()
+        if not sink.changed:
+            self.unchanged_files.append(descriptor.filename)
+            return False
+
+        self.written_files.append(descriptor.filename)
+        return True
+
+    def keep(self, filename):
+        """Keeps a file generated by a previous writer without regenerating it, returning False if it needs to be written"""
+        if filename not in self.previous_hashes or not os.path.isfile(os.path.join(self.directory, filename)):
+            return False
+
+        self.hashes[filename] = self.previous_hashes[filename]
+        self.unchanged_files.append(filename)
+        self.kept_files.append(filename)
+        return True
+
+    def stale_files(self):
+        """Gets files listed in the previous manifest that were not generated by this writer and still exist"""
+        return sorted(
+            filename for filename in self.previous_hashes
+            if filename not in self.hashes and os.path.isfile(os.path.join(self.directory, filename))
+        )
+
+    def finish(self, delete_stale=False):
+        """Writes the manifest of all generated files, optionally deletes stale files and returns the stale files"""
+        stale_files = self.stale_files()
+        manifest_hashes = dict(self.hashes)
+        if delete_stale:
+            for filename in stale_files:
+                os.remove(os.path.join(self.directory, filename))
+        else:
+            # stale files are kept in the manifest, so that they are still detected by later runs
+            for filename in stale_files:
+                manifest_hashes[filename] = self.previous_hashes[filename]
+
+        with FileSink(self.manifest_filename) as sink:
+            sink.write_lines(json.dumps({'files': manifest_hashes}, indent=4, sort_keys=True).split('\n'))
+
+        return stale_files
+
+    def statistics(self):
+        """Returns a description of the number of written and unchanged files"""
+        return 'output: {0} written, {1} unchanged'.format(len(self.written_files), len(self.unchanged_files))
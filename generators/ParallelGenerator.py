@@ -0,0 +1,57 @@
+# generator used by the current worker process, which is created once per process so that the schema is only sent once
+_WORKER_GENERATOR = None
+
+
+def _initialize_worker(generator_class, schema, options):
+    # pylint: disable=global-statement
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = generator_class(schema, options)
+
+
+def _generate_worker_unit(unit):
+    # streamed descriptors generate their content lazily in the calling process, so it is generated here before pickling
+    return [descriptor.materialize() for descriptor in _WORKER_GENERATOR.generate_unit(unit)]
+
+
+def generate_descriptors(generator_class, schema, options, jobs=None, cache=None):
+    """Yields all Descriptors of a generator in serial order, generating independent units in up to jobs processes"""
+    generator = generator_class(schema, options)
+    if not hasattr(generator, 'generation_units') or (not cache and (not jobs or jobs < 2)):
+        yield from generator
+        return
+
+    units = generator.generation_units()
+    keys = [cache.unit_key(generator, unit) for unit in units] if cache else [None] * len(units)
+    cached_descriptors = [cache.load(key) for key in keys] if cache else [None] * len(units)
+
+    missing_units = [unit for unit, descriptors in zip(units, cached_descriptors) if descriptors is None]
+    generated_descriptors = _generate_units(generator, schema, options, missing_units, jobs)
+    for key, descriptors in zip(keys, cached_descriptors):
+        if descriptors is None:
+            descriptors = next(generated_descriptors, None)
+            if cache:
+                # cached content is generated once and then reused for both the entry and the output
+                descriptors = [descriptor.materialize() for descriptor in descriptors]
+                cache.store(key, descriptors)
+
+        yield from descriptors
+
+
+def _generate_units(generator, schema, options, units, jobs):
+    if not jobs or jobs < 2 or len(units) < 2:
+        for unit in units:
+            yield generator.generate_unit(unit)
+
+        return
+
+    # process pools are expensive to import, so they are only imported when units are actually generated in parallel
+    from concurrent.futures import ProcessPoolExecutor  # pylint: disable=import-outside-toplevel
+
+    # profilers only measure the calling process, so they are not sent to workers
+    worker_options = {key: value for key, value in options.items() if 'profiler' != key}
+
+    # map returns results in unit order, so output ordering does not depend on scheduling
+    chunk_size = max(1, len(units) // (jobs * 4))
+    initargs = (type(generator), schema, worker_options)
+    with ProcessPoolExecutor(jobs, initializer=_initialize_worker, initargs=initargs) as executor:
+        yield from executor.map(_generate_worker_unit, units, chunksize=chunk_size)
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import os
+from catparser.MultiFileParser import MultiFileParser
+from catparser.ParseCache import ParseCache
+from catparser.StageProfiler import NULL_PROFILER
+from generators.All import AVAILABLE_GENERATORS
+from generators.GenerationCache import GenerationCache
+from generators.OutputSink import MemorySink
+from generators.ParallelGenerator import generate_descriptors
+
+
+def expand_schema_paths(schema_paths):
+    """Yields schema files, expanding directories to all schema files they (recursively) contain in sorted order"""
+    for schema_path in schema_paths:
+        if not os.path.isdir(schema_path):
+            yield schema_path
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(schema_path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith('.cats'):
+                    yield os.path.join(dirpath, filename)
+
+
+def _memory_sink_factory(_):
+    return MemorySink()
+
+
+class Session:
+    """Parses schema roots and runs generators without printing anything or exiting, so that it can be embedded in other processes"""
+    def __init__(self, include_path='./schemas', cache_directory=None, deferred_linking=False, profiler=None):
+        self.include_path = include_path
+        self.deferred_linking = deferred_linking
+        self.profiler = profiler or NULL_PROFILER
+        self.parse_cache = ParseCache(cache_directory) if cache_directory else None
+        self.generation_cache = GenerationCache(os.path.join(cache_directory, 'generation')) if cache_directory else None
+        self.file_parser = None
+
+    def parse(self, schema_paths, jobs=None):
+        """Parses schema files or directories into a new set of types and returns the exceptions of failed roots keyed by filename"""
+        # every parse starts from an empty set of types, so that types of earlier requests never leak into later ones
+        self.file_parser = MultiFileParser(self.parse_cache, self.deferred_linking, profiler=self.profiler)
+        self.file_parser.set_include_path(self.include_path)
+        return self.file_parser.parse_all(list(expand_schema_paths(schema_paths)), jobs)
+
+    def type_descriptors(self):
+        """Gets the descriptors of all types parsed by the last parse keyed by type name"""
+        if not self.file_parser:
+            raise RuntimeError('type descriptors are only available after parse')
+
+        return self.file_parser.cats_parser.type_descriptors()
+
+    def _generator_options(self, options):
+        generator_options = {'copyright': None}
+        generator_options.update(options or {})
+        if self.profiler is not NULL_PROFILER:
+            generator_options.setdefault('profiler', self.profiler)
+
+        return generator_options
+
+    def problems(self, generator_name, options=None):
+        """Returns descriptions of problems a generator finds in the parsed types, which do not prevent generation"""
+        generator_class = AVAILABLE_GENERATORS[generator_name]
+        generator = generator_class(self.type_descriptors(), self._generator_options(options))
+        return generator.validate() if hasattr(generator, 'validate') else []
+
+    def descriptors(self, generator_name, options=None, jobs=None):
+        """Yields the Descriptors of all files a generator produces for the parsed types, generating in up to jobs processes"""
+        generator_class = AVAILABLE_GENERATORS[generator_name]
+        options = self._generator_options(options)
+        return generate_descriptors(generator_class, self.type_descriptors(), options, jobs, self.generation_cache)
+
+    def generate(self, generator_name, options=None, jobs=None, sink_factory=None):
+        """Writes the files of a generator into sinks from sink_factory(filename), in memory by default, and returns them by filename"""
+        sink_factory = sink_factory or _memory_sink_factory
+        sinks = OrderedDict()
+        for descriptor in self.descriptors(generator_name, options, jobs):
+            sink = sink_factory(descriptor.filename)
+            try:
+                descriptor.write_to(sink)
+            except BaseException:
+                sink.abort()
+                raise
+
+            sink.close()
+            sinks[descriptor.filename] = sink
+
+        return sinks
+
+    def statistics(self):
+        """Returns human readable summaries of the usage of all caches"""
+        return [cache.statistics() for cache in (self.parse_cache, self.generation_cache) if cache]
@@ -0,0 +1,45 @@
+# pylint: disable=too-few-public-methods
+import functools
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r'\{([A-Z][A-Z0-9_]*)\}')
+
+
+class Template:
+    """Multi-line text with {NAME} placeholders; any other braces are literal"""
+    def __init__(self, text):
+        # literal braces are escaped once, so that rendering is a single format_map pass over the whole text
+        parts = PLACEHOLDER_PATTERN.split(text)
+        self.names = frozenset(parts[1::2])
+        self.format_string = ''.join(
+            '{' + part + '}' if index % 2 else part.replace('{', '{{').replace('}', '}}') for index, part in enumerate(parts)
+        )
+
+        # templates without placeholders render to the same lines every time
+        self.literal_lines = None if self.names else text.split('\n')
+        self.indented_literal_lines = {}
+
+    def render(self, replacements, indent=0):
+        """Returns the lines of the template with all placeholders replaced and all non-empty lines indented by indent tabs"""
+        if self.literal_lines is not None:
+            if indent not in self.indented_literal_lines:
+                self.indented_literal_lines[indent] = _indent_lines(self.literal_lines, indent)
+
+            return self.indented_literal_lines[indent]
+
+        # lines are split after substitution, so that multi-line replacement values are indented like the template
+        return _indent_lines(self.format_string.format_map(replacements).split('\n'), indent)
+
+
+def _indent_lines(lines, indent):
+    if not indent:
+        return lines
+
+    prefix = '\t' * indent
+    return [prefix + line if line else line for line in lines]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_template(text):
+    """Gets the template for text, which is only parsed once per process"""
+    return Template(text)
@@ -0,0 +1,199 @@
+from collections import OrderedDict, namedtuple
+import os
+import time
+from generators.All import AVAILABLE_GENERATORS
+from generators.Daemon import WarmSession
+from generators.GenerationCache import generator_version, unit_inputs_digest
+from generators.OutputWriter import OutputWriter
+
+# configuration of a watcher
+#  - generator_names: names of the generators whose outputs are kept up to date
+#  - output_directory: directory containing a subdirectory with the outputs of each generator
+#  - generator_options: options passed to every generator
+#  - delete_stale: True if previously generated files that are no longer generated are deleted
+#  - deferred_linking: True if type references are resolved after parsing, allowing forward references
+WatcherOptions = namedtuple(
+    'WatcherOptions',
+    ['generator_names', 'output_directory', 'generator_options', 'delete_stale', 'deferred_linking'])
+
+CycleReport = namedtuple('CycleReport', ['changed_files', 'errors', 'parse_seconds', 'generator_reports', 'total_seconds'])
+GeneratorReport = namedtuple(
+    'GeneratorReport',
+    ['generator_name', 'regenerated_files', 'written_files', 'total_files', 'seconds', 'stale_files'])
+
+
+def snapshot_files(paths):
+    """Returns the modification times and sizes of files and of all (non-hidden) files in directories keyed by filename"""
+    snapshot = {}
+
+    def add(filename):
+        try:
+            stat = os.stat(filename)
+            snapshot[filename] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+
+    for path in paths:
+        if not os.path.isdir(path):
+            add(path)
+            continue
+
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = [dirname for dirname in dirnames if not dirname.startswith('.')]
+            for filename in filenames:
+                if not filename.startswith('.'):
+                    add(os.path.join(dirpath, filename))
+
+    return snapshot
+
+
+def changed_files(previous_snapshot, snapshot):
+    """Returns the sorted names of files that were added, removed or modified between two snapshots"""
+    return sorted(
+        filename for filename in set(previous_snapshot) | set(snapshot) if previous_snapshot.get(filename) != snapshot.get(filename)
+    )
+
+
+class Watcher:
+    """Polls schema and generator input files and regenerates the outputs whose inputs changed"""
+    def __init__(self, schema_paths, include_path, options):
+        self.session = WarmSession(schema_paths, include_path, None, options.deferred_linking)
+        self.options = options
+
+        watched_paths = list(schema_paths) + [include_path]
+        for generator_name in options.generator_names:
+            generator_class = AVAILABLE_GENERATORS[generator_name]
+            if hasattr(generator_class, 'watched_paths'):
+                watched_paths += generator_class.watched_paths(options.generator_options)
+
+        self.watched_paths = list(OrderedDict.fromkeys(watched_paths))
+
+        # digests of the inputs of every generation unit and the files it produced in the last cycle, keyed by generator name
+        self.unit_digests = {generator_name: {} for generator_name in options.generator_names}
+        self.unit_filenames = {generator_name: {} for generator_name in options.generator_names}
+        self.versions = {}
+        self.snapshot = None
+
+    def run_cycle(self, changed=None):
+        """Brings all outputs up to date with their inputs and returns a CycleReport"""
+        cycle_start = time.perf_counter()
+        errors = self.session.revalidate()
+        parse_seconds = time.perf_counter() - cycle_start
+
+        generator_reports = []
+        for generator_name in self.options.generator_names:
+            generator_start = time.perf_counter()
+            writer, stale_files = self._generate(generator_name, not errors)
+            generator_reports.append(GeneratorReport(
+                generator_name,
+                len(writer.hashes) - len(writer.kept_files),
+                len(writer.written_files),
+                len(writer.hashes),
+                time.perf_counter() - generator_start,
+                stale_files))
+
+        return CycleReport(changed or [], errors, parse_seconds, generator_reports, time.perf_counter() - cycle_start)
+
+    def _generate(self, generator_name, is_complete):
+        generator_class = AVAILABLE_GENERATORS[generator_name]
+        generator = generator_class(self.session.type_descriptors(), dict(self.options.generator_options))
+        output_path = os.path.join(self.options.output_directory, generator_name)
+        os.makedirs(output_path, exist_ok=True)
+        writer = OutputWriter(output_path)
+
+        if hasattr(generator, 'unit_cache_inputs'):
+            self._generate_units(generator_name, generator, writer)
+        else:
+            for descriptor in generator:
+                writer.write_descriptor(descriptor)
+
+        # outputs of roots that failed to parse are not stale, so nothing is deleted when there are errors
+        stale_files = writer.finish(self.options.delete_stale and is_complete)
+        return writer, stale_files
+
+    def _generate_units(self, generator_name, generator, writer):
+        generator_class = type(generator)
+        if generator_class not in self.versions:
+            self.versions[generator_class] = generator_version(generator_class)
+
+        previous_digests = self.unit_digests[generator_name]
+        unit_filenames = self.unit_filenames[generator_name]
+        unit_digests = {}
+        for unit in generator.generation_units():
+            unit_digests[unit] = unit_inputs_digest(self.versions[generator_class], generator, unit)
+
+            # files of units whose inputs did not change are kept as long as they still exist
+            filenames = unit_filenames.get(unit)
+            if previous_digests.get(unit) == unit_digests[unit] and filenames and all(writer.keep(name) for name in filenames):
+                continue
+
+            unit_filenames[unit] = []
+            for descriptor in generator.generate_unit(unit):
+                writer.write_descriptor(descriptor)
+                unit_filenames[unit].append(descriptor.filename)
+
+        # files of removed units are no longer tracked, so that they are reported as stale
+        self.unit_digests[generator_name] = unit_digests
+        self.unit_filenames[generator_name] = {unit: unit_filenames[unit] for unit in unit_digests if unit in unit_filenames}
+
+    def poll(self, interval=0.5, debounce=0.3):
+        """Waits until watched files changed and then stopped changing for debounce seconds, and returns the changed files"""
+        if self.snapshot is None:
+            self.snapshot = snapshot_files(self.watched_paths)
+
+        while True:
+            time.sleep(interval)
+            snapshot = snapshot_files(self.watched_paths)
+            if snapshot != self.snapshot:
+                break
+
+        # bursts of saves (e.g. of several files or by editors writing temporary files) are handled in a single cycle
+        while True:
+            time.sleep(debounce)
+            settled_snapshot = snapshot_files(self.watched_paths)
+            if settled_snapshot == snapshot:
+                break
+
+            snapshot = settled_snapshot
+
+        changed = changed_files(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        return changed
+
+    def run(self, report, report_error, interval=0.5, debounce=0.3, max_cycles=None):
+        """Runs an initial cycle and then a cycle after every change, passing each CycleReport or failure to the callbacks"""
+        self.snapshot = snapshot_files(self.watched_paths)
+        changed = None
+        num_cycles = 0
+        while True:
+            try:
+                report(self.run_cycle(changed))
+            except Exception as ex:  # pylint: disable=broad-except
+                # a broken hint or generator must not stop watching, because the next change can fix it
+                report_error(ex)
+
+            num_cycles += 1
+            if max_cycles is not None and num_cycles >= max_cycles:
+                return
+
+            changed = self.poll(interval, debounce)
+
+
+def format_cycle_report(cycle_report):
+    """Returns human readable lines describing the errors, regenerated outputs and timings of a cycle"""
+    lines = ['{0}: {1}'.format(filename, ex) for filename, ex in cycle_report.errors.items()]
+    lines.append('cycle: {0} changed file(s), {1} failed root(s), parse {2:.1f} ms'.format(
+        len(cycle_report.changed_files),
+        len(cycle_report.errors),
+        cycle_report.parse_seconds * 1000))
+    for generator_report in cycle_report.generator_reports:
+        lines.append('  {0}: {1} of {2} file(s) regenerated, {3} written in {4:.1f} ms'.format(
+            generator_report.generator_name,
+            generator_report.regenerated_files,
+            generator_report.total_files,
+            generator_report.written_files,
+            generator_report.seconds * 1000))
+        lines += ['  stale file: {0}'.format(stale_file) for stale_file in generator_report.stale_files]
+
+    lines.append('  total {0:.1f} ms'.format(cycle_report.total_seconds * 1000))
+    return lines
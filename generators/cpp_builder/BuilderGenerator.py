@@ -1,6 +1,10 @@
 # pylint: disable=too-few-public-methods
+from catparser.StageProfiler import NULL_PROFILER
+from catparser.TransactionCatalog import TransactionCatalog
 from generators.Descriptor import Descriptor
+from .CppGenerator import embedded_transaction_name, load_copyright
 from .HeaderGenerator import HeaderGenerator
+from .HintsRegistry import HINTS_DIRECTORY, shared_hints_registry
 from .ImplementationGenerator import ImplementationGenerator
 
 
@@ -12,32 +16,90 @@ class BuilderGenerator:
         self.current = None
         self.generated_header = False
         self.current_name = None
+        self.catalog = None
 
     def __iter__(self):
         """Creates an iterator around this generator"""
-        self.current = iter(self.schema)
+        self.current = iter(self.generation_units())
         self.generated_header = False
         return self
 
-    def _iterate_until_next_transaction(self):
-        if self.generated_header:
-            return None
+    @staticmethod
+    def watched_paths(options):
+        """Returns the files and directories besides schemas that generated code depends on"""
+        return [HINTS_DIRECTORY] + ([options['copyright']] if options.get('copyright') else [])
 
-        name = next(self.current)
-        while name == 'Transaction' or name.startswith('Embedded') or not name.endswith('Transaction'):
-            name = next(self.current)
-        return name
+    @staticmethod
+    def source_modules():
+        """Returns the modules outside of this package whose sources generated code depends on"""
+        return ['catparser.TransactionCatalog']
+
+    def transaction_catalog(self):
+        """Gets the catalog of all transactions of the schema, which is only built once"""
+        if self.catalog is None:
+            self.catalog = TransactionCatalog(self.schema, shared_hints_registry().plugins())
+
+        return self.catalog
+
+    def generation_units(self):
+        """Returns the names of all transactions that builders are generated for, which can be generated independently"""
+        return list(self.transaction_catalog())
+
+    def validate(self):
+        """Returns descriptions of hints that do not match the schema, of shared entity types and of missing embedded transactions"""
+        catalog = self.transaction_catalog()
+        problems = shared_hints_registry().validate(self.schema, list(catalog), catalog) + catalog.validate()
+        for transaction in catalog.values():
+            if not transaction.embedded:
+                problems.append('transaction "{0}" has no embedded transaction, its builder assumes "{1}"'.format(
+                    transaction.name,
+                    embedded_transaction_name(transaction)))
+
+        return problems
+
+    def generate_unit(self, name):
+        """Returns Descriptors of the header and implementation files of a single transaction builder"""
+        return [self._generate_file(HeaderGenerator, '{}.h', name), self._generate_file(ImplementationGenerator, '{}.cpp', name)]
+
+    def unit_cache_inputs(self, name):
+        """Returns everything the builder of a transaction depends on: its catalog entry, reachable types, hints and the copyright"""
+        transaction = self.transaction_catalog()[name]
+        return {
+            'transaction': dict(transaction._asdict()),
+            'types': self._reachable_types([transaction.body, name]),
+            'hints': shared_hints_registry().view(name),
+            'copyright': load_copyright(self.options.get('copyright'))
+        }
+
+    def _reachable_types(self, type_names):
+        reachable_types = {}
+        pending_type_names = list(type_names)
+        while pending_type_names:
+            type_name = pending_type_names.pop()
+            if type_name in reachable_types or type_name not in self.schema:
+                continue
+
+            reachable_types[type_name] = self.schema[type_name]
+            pending_type_names.extend(field['type'] for field in self.schema[type_name].get('layout', []) if 'type' in field)
+
+        return reachable_types
+
+    def _generate_file(self, generator_class, filename_format, name):
+        generator = generator_class(self.schema, self.options, name, self.transaction_catalog())
+
+        # code is only generated when the descriptor is written, directly into the output sink
+        def write(sink):
+            with self.options.get('profiler', NULL_PROFILER).stage('generate', generator=generator_class.__name__, transaction=name):
+                generator.generate(sink)
+
+        return Descriptor.streamed(filename_format.format(generator.builder_name()), write)
 
     def __next__(self):
         """Returns Descriptor with desired filename and generated file content"""
         if not self.generated_header:
-            self.current_name = self._iterate_until_next_transaction()
-            generator = HeaderGenerator(self.schema, self.options, self.current_name)
-            code = generator.generate()
+            self.current_name = next(self.current)
             self.generated_header = True
-            return Descriptor('{}.h'.format(generator.builder_name()), code)
+            return self._generate_file(HeaderGenerator, '{}.h', self.current_name)
 
-        generator = ImplementationGenerator(self.schema, self.options, self.current_name)
-        code = generator.generate()
         self.generated_header = False
-        return Descriptor('{}.cpp'.format(generator.builder_name()), code)
+        return self._generate_file(ImplementationGenerator, '{}.cpp', self.current_name)
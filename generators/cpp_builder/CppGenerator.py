@@ -1,13 +1,34 @@
 # pylint: disable=too-few-public-methods
 from abc import ABC, abstractmethod
 from enum import Enum
+import functools
 import os
 import re
-import yaml
+from catparser.StageProfiler import NULL_PROFILER
+from catparser.TransactionCatalog import TransactionCatalog
+from generators.OutputSink import MemorySink
+from generators.Template import compile_template
+from .HintsRegistry import shared_hints_registry
 
 SUFFIX = 'Transaction'
 
 
+def load_copyright(copyright_file):
+    if not copyright_file or not os.path.isfile(copyright_file):
+        return None
+
+    # the modification time is part of the key, so that long-running processes pick up changed headers
+    stat = os.stat(copyright_file)
+    return _load_copyright(copyright_file, stat.st_mtime_ns, stat.st_size)
+
+
+# the copyright header is shared by all generated files, so it is only read once per process (and version)
+@functools.lru_cache(maxsize=16)
+def _load_copyright(copyright_file, _mtime_ns, _size):
+    with open(copyright_file) as header:
+        return tuple(line.strip() for line in header)
+
+
 class FieldKind(Enum):
     SIMPLE = 1
     BUFFER = 2
@@ -71,13 +92,18 @@ class GeneratorInterface(ABC):
         raise NotImplementedError('need to override method')
 
 
+def embedded_transaction_name(transaction):
+    """Gets the name of the embedded transaction of a catalog entry, assuming the conventional name when the schema has none"""
+    return transaction.embedded or 'Embedded{0}'.format(transaction.name)
+
+
 # FP from pylint, this is semi-abstract class
 # pylint: disable=abstract-method
 class CppGenerator(GeneratorInterface):
-    def __init__(self, schema, options, name):
+    def __init__(self, schema, options, name, catalog=None):
         super(CppGenerator, self).__init__()
         self.schema = schema
-        self.code = []
+        self.sink = None
         self.transaction_name = name
         self.replacements = {
             'TRANSACTION_NAME': self.transaction_name,
@@ -87,38 +113,39 @@ class CppGenerator(GeneratorInterface):
         }
 
         self.indent = 0
-        self.hints = CppGenerator._load_hints(['includes', 'namespaces', 'plugin', 'rewrites', 'setters'])[self.transaction_name]
-        self.prepend_copyright(options['copyright'])
+        with options.get('profiler', NULL_PROFILER).stage('load_hints', transaction=self.transaction_name):
+            self.hints = shared_hints_registry().view(self.transaction_name)
 
-    @staticmethod
-    def _load_hints(filenames):
-        all_hints = {}
-        for filename in filenames:
-            with open('generators/cpp_builder/hints/{0}.yaml'.format(filename)) as input_file:
-                hints = yaml.load(input_file)
-                for hint_key in hints:
-                    if hint_key not in all_hints:
-                        all_hints[hint_key] = {}
-
-                    all_hints[hint_key][filename] = hints.get(hint_key)
-
-        return all_hints
+        # generators of all transactions of a schema share a catalog, which is only built for generators created on their own
+        self.transaction = (catalog or TransactionCatalog(schema, shared_hints_registry().plugins()))[self.transaction_name]
+        self.copyright_lines = load_copyright(options.get('copyright')) or ()
 
     def transaction_body_name(self):
-        return '{}Body'.format(self.transaction_name)
+        return self.transaction.body
+
+    def embedded_name(self):
+        return embedded_transaction_name(self.transaction)
 
     def builder_name(self):
-        return '{}Builder'.format(self.transaction_name[:-len(SUFFIX)])
+        return '{}Builder'.format(self._short_name())
 
     def written_name(self):
-        return join_lower(tokenize(self.transaction_name[:-len(SUFFIX)]))
+        return join_lower(tokenize(self._short_name()))
 
-    def prepend_copyright(self, copyright_file):
-        if os.path.isfile(copyright_file):
-            with open(copyright_file) as header:
-                self.code = [line.strip() for line in header]
+    def _short_name(self):
+        name = self.transaction_name
+        return name[:-len(SUFFIX)] if name.endswith(SUFFIX) else name
 
-    def generate(self):
+    def generate(self, sink=None):
+        """Writes the generated file into sink or, when no sink is given, returns its lines"""
+        if sink is None:
+            sink = MemorySink()
+            self.generate(sink)
+            return sink.lines
+
+        self.sink = sink
+        self.indent = 0
+        self.sink.write_lines(self.copyright_lines)
         self._add_includes()
         self._namespace_start()
         self.indent = 1
@@ -129,8 +156,8 @@ class CppGenerator(GeneratorInterface):
         self._class_footer()
         self.indent = 0
         self._namespace_end()
-
-        return self.code
+        self.sink = None
+        return None
 
     # region helpers
 
@@ -141,14 +168,10 @@ class CppGenerator(GeneratorInterface):
 
         return namespace
 
-    def append(self, multiline_string, additional_replacements=None):
-        for line in re.split(r'\n', multiline_string):
-            # indent non-empty lines
-            if line:
-                replacements = {**self.replacements, **additional_replacements} if additional_replacements else self.replacements
-                self.code.append('\t' * self.indent + line.format(**replacements))
-            else:
-                self.code.append('')
+    def append(self, template_text, additional_replacements=None):
+        # templates are parsed once per process and only {NAME} placeholders are replaced, so braces never need escaping
+        replacements = {**self.replacements, **additional_replacements} if additional_replacements else self.replacements
+        self.sink.write_lines(compile_template(template_text).render(replacements, self.indent))
 
     def qualified_type(self, typename):
         namespace = self._get_namespace(typename)
@@ -198,7 +221,7 @@ class CppGenerator(GeneratorInterface):
     # region generate sub-methods
 
     def _namespace_start(self):
-        self.append('namespace catapult {{ namespace builders {{')
+        self.append('namespace catapult { namespace builders {')
         self.append('')
 
     def _setters(self):
@@ -208,7 +231,7 @@ class CppGenerator(GeneratorInterface):
         self._foreach_builder_field(self._generate_field_proxy)
 
     def _namespace_end(self):
-        self.append('}}}}')
+        self.append('}}')
 
     # endregion
 
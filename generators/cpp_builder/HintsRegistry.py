@@ -0,0 +1,109 @@
+import functools
+import os
+from types import MappingProxyType
+from catparser.TransactionCatalog import TransactionCatalog
+
+HINT_NAMES = ['includes', 'namespaces', 'plugin', 'rewrites', 'setters']
+HINTS_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hints')
+
+EMPTY_VIEW = MappingProxyType({})
+
+
+def _load_yaml(input_file, use_c_loader):
+    # yaml is only imported when hints are actually loaded, so that it does not slow down runs that do not generate code
+    import yaml  # pylint: disable=import-outside-toplevel
+
+    # the C loader is only available when PyYAML is built against libyaml
+    loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader) if use_c_loader else yaml.SafeLoader
+    return yaml.load(input_file, Loader=loader)
+
+
+def _capitalize(string):
+    return string[0].upper() + string[1:] if string else string
+
+
+class HintsRegistry:
+    """Hints of all hint files keyed by transaction name"""
+    def __init__(self, directory=HINTS_DIRECTORY, use_c_loader=True):
+        all_hints = {}
+        for hint_name in HINT_NAMES:
+            with open(os.path.join(directory, '{0}.yaml'.format(hint_name))) as input_file:
+                hints = _load_yaml(input_file, use_c_loader) or {}
+                for transaction_name, hint in hints.items():
+                    all_hints.setdefault(transaction_name, {})[hint_name] = hint
+
+        self.views = {transaction_name: MappingProxyType(hints) for transaction_name, hints in all_hints.items()}
+
+    def transaction_names(self):
+        """Gets the names of all transactions with hints"""
+        return list(self.views)
+
+    def plugins(self):
+        """Gets the plugin hints of all transactions keyed by transaction name"""
+        return {transaction_name: hints['plugin'] for transaction_name, hints in self.views.items() if 'plugin' in hints}
+
+    def view(self, transaction_name):
+        """Gets the read-only hints of a transaction keyed by hint name"""
+        return self.views.get(transaction_name, EMPTY_VIEW)
+
+    def validate(self, schema, transaction_names=None, catalog=None):
+        """Returns descriptions of hints that do not match the schema, checking all transactions with hints by default"""
+        catalog = catalog or TransactionCatalog(schema, self.plugins())
+        problems = []
+        for transaction_name in self.transaction_names() if transaction_names is None else transaction_names:
+            if transaction_name not in schema:
+                problems.append('hints for unknown transaction "{0}"'.format(transaction_name))
+                continue
+
+            hints = self.view(transaction_name)
+            if not isinstance(hints.get('plugin'), str):
+                problems.append('missing plugin hint for transaction "{0}"'.format(transaction_name))
+
+            body_name = catalog[transaction_name].body if transaction_name in catalog else None
+            problems += self._validate_transaction(schema, transaction_name, body_name, hints)
+
+        return problems
+
+    @staticmethod
+    def _validate_transaction(schema, transaction_name, body_name, hints):
+        body_descriptor = schema.get(body_name, {})
+        field_names = [field['name'] for field in body_descriptor.get('layout', []) if 'name' in field]
+
+        problems = []
+
+        def require_known(hint_name, keys, known_keys, description):
+            for key in keys:
+                if key not in known_keys:
+                    problems.append('{0} hint for unknown {1} "{2}" of transaction "{3}"'.format(
+                        hint_name,
+                        description,
+                        key,
+                        transaction_name))
+
+        require_known('setters', hints.get('setters', {}), field_names, 'field')
+        require_known('rewrites', hints.get('rewrites', {}), [_capitalize(field_name) for field_name in field_names], 'field')
+        require_known('namespaces', hints.get('namespaces', {}), schema, 'type')
+        return problems
+
+
+def hint_file_stats(directory=HINTS_DIRECTORY):
+    """Returns the modification times and sizes of all hint files of a hints directory"""
+    stats = []
+    for hint_name in HINT_NAMES:
+        try:
+            stat = os.stat(os.path.join(directory, '{0}.yaml'.format(hint_name)))
+            stats.append((stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            stats.append(None)
+
+    return tuple(stats)
+
+
+def shared_hints_registry(directory=HINTS_DIRECTORY):
+    """Gets the hints registry of a hints directory, which is only loaded once per process until a hint file changes"""
+    return _load_shared_hints_registry(directory, hint_file_stats(directory))
+
+
+@functools.lru_cache(maxsize=16)
+def _load_shared_hints_registry(directory, _stats):
+    return HintsRegistry(directory)
@@ -1,75 +1,213 @@
 # pylint: disable=too-few-public-methods
 import argparse
+import json
 import os
 import pprint
-from catparser.CatsParser import CatsParser
+import signal
+import sys
+import traceback
+from catparser.SchemaExport import export_schema
+from catparser.StageProfiler import StageProfiler
 from generators.All import AVAILABLE_GENERATORS
+from generators.OutputWriter import OutputWriter
+from generators.Session import Session
 
 
-class MultiFileParser:
-    """CATS parser that resolves imports in global namespace"""
-    def __init__(self):
-        self.cats_parser = CatsParser(self._process_import_file)
-        self.dirname = None
+def _print_problems(problems):
+    for problem in problems:
+        print('warning: {0}'.format(problem), file=sys.stderr)
 
-    def set_include_path(self, include_path):
-        self.dirname = include_path
 
-    def parse(self, schema_filename):
-        self._process_file(schema_filename)
+def _generate_output(session, generator_name, args, delete_stale=False):
+    output_path = os.path.join(args.output, generator_name)
+    os.makedirs(output_path, exist_ok=True)
 
-    def _process_import_file(self, filename):
-        filename = os.path.join(self.dirname, filename)
-        self._process_file(filename)
+    options = {'copyright': args.copyright}
+    _print_problems(session.problems(generator_name, options))
+
+    # unchanged files are not rewritten, so that their mtimes do not trigger downstream rebuilds
+    writer = OutputWriter(output_path)
+    for generated_descriptor in session.descriptors(generator_name, options, args.jobs):
+        with session.profiler.stage('write', file=os.path.join(output_path, generated_descriptor.filename)):
+            writer.write_descriptor(generated_descriptor)
+
+    stale_files = writer.finish(delete_stale)
+    print(writer.statistics())
+    for stale_file in stale_files:
+        print('{0} stale file: {1}'.format('deleted' if delete_stale else 'found', os.path.join(output_path, stale_file)))
+
+
+def _serve(socket_path, cache_directory):
+    # pylint: disable=import-outside-toplevel
+    from generators.Daemon import DaemonServer, GenerationDaemon
+
+    # terminating the daemon closes the server, which removes its socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with DaemonServer(socket_path, GenerationDaemon(cache_directory)) as server:
+        print('serving generation requests on {0}'.format(socket_path))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def _generate_with_daemon(socket_path, args):
+    # pylint: disable=import-outside-toplevel
+    from generators.Daemon import send_request
+
+    # the daemon can run in any directory, so all paths are sent as absolute paths
+    response = send_request(socket_path, {
+        'schemas': [os.path.abspath(schema_path) for schema_path in args.schema],
+        'include': os.path.abspath(args.include),
+        'deferred_linking': args.deferred_linking,
+        'generators': args.generator or [],
+        'options': {'copyright': os.path.abspath(args.copyright)}
+    })
+    if 'error' in response:
+        print('daemon error: {0}'.format(response['error']), file=sys.stderr)
+        return False
+
+    for filename, message in response['errors'].items():
+        print('{0}: {1}'.format(filename, message), file=sys.stderr)
+
+    delete_stale = args.delete_stale and not response['errors']
+    for generator_name, outputs in response['outputs'].items():
+        _print_problems(response['problems'][generator_name])
+        output_path = os.path.join(args.output, generator_name)
+        os.makedirs(output_path, exist_ok=True)
+        writer = OutputWriter(output_path)
+        for filename, lines in outputs.items():
+            writer.write(filename, lines)
+
+        writer.finish(delete_stale)
+        print(writer.statistics())
+
+    return not response['errors']
+
+
+def _watch(args):
+    # pylint: disable=import-outside-toplevel
+    from generators.Watcher import Watcher, WatcherOptions, format_cycle_report
+
+    def report(cycle_report):
+        print('\n'.join(format_cycle_report(cycle_report)), flush=True)
+
+    def report_error(ex):
+        traceback.print_exception(type(ex), ex, ex.__traceback__)
+
+    options = WatcherOptions(args.generator or [], args.output, {'copyright': args.copyright}, args.delete_stale, args.deferred_linking)
+    watcher = Watcher(args.schema, args.include, options)
+    print('watching {0}'.format(', '.join(watcher.watched_paths)), flush=True)
+    try:
+        watcher.run(report, report_error)
+    except KeyboardInterrupt:
+        pass
+
+
+def _parse_args():
+    parser = argparse.ArgumentParser(description='CATS code generator')
+    parser.add_argument('-s', '--schema', help='input CATS file or directory (repeatable)', action='append')
+    parser.add_argument('-o', '--output', help='output directory', default='_generated')
+    parser.add_argument('-i', '--include', help='schema root directory', default='./schemas')
 
-    def _process_file(self, filename):
-        self.cats_parser.push_scope(filename)
+    # the metavar keeps argparse from listing (and thereby discovering) all installed generators on every run
+    parser.add_argument(
+        '-g',
+        '--generator',
+        help='generator to use to produce output files: {0} or an installed generator (repeatable)'.format(
+            ', '.join(AVAILABLE_GENERATORS.builtin_names())),
+        choices=AVAILABLE_GENERATORS,
+        metavar='GENERATOR',
+        action='append')
+    parser.add_argument('-c', '--copyright', help='file containing copyright data to use with output files', default='../HEADER.inc')
+    parser.add_argument('--cache', help='directory used to cache parse and generation results between runs')
+    parser.add_argument('--parse-jobs', help='number of processes used to parse independent schema files', type=int)
+    parser.add_argument(
+        '--deferred-linking',
+        help='resolve type references after parsing, allowing forward references',
+        action='store_true')
+    parser.add_argument('--delete-stale', help='delete previously generated files that are no longer generated', action='store_true')
+    parser.add_argument('-j', '--jobs', help='number of processes used to generate independent outputs', type=int)
+    parser.add_argument('--profile', help='file timings and allocations of each stage are written to as JSON')
+    parser.add_argument('--cprofile', help='file cProfile statistics are written to (requires --profile)')
+    parser.add_argument('--serve', help='UNIX socket to serve generation requests on, keeping parsed schemas warm between requests')
+    parser.add_argument('--daemon', help='UNIX socket of a daemon started with --serve that generates the outputs (skips the type dump)')
+    parser.add_argument(
+        '--watch',
+        help='poll schema, hint and copyright files and regenerate affected outputs on every change (skips the type dump)',
+        action='store_true')
+    parser.add_argument('--export', help='file the parsed types are exported to for other tools (replaces the type dump)')
+    parser.add_argument('--export-format', help='format of the exported types', choices=['json', 'binary'], default='json')
+    args = parser.parse_args()
 
-        with open(filename) as input_file:
-            lines = input_file.readlines()
-            for line in lines:
-                self.cats_parser.process_line(line)
+    if not args.serve and not args.schema:
+        parser.error('the following arguments are required: -s/--schema')
 
-        self.cats_parser.pop_scope()
+    return args
 
 
-def _generate_output(generator_name, directory, schema, options):
-    generator_class = AVAILABLE_GENERATORS[generator_name]
-    output_path = os.path.join(directory, generator_name)
-    os.makedirs(output_path, exist_ok=True)
-    generator = generator_class(schema, options)
-    for generated_descriptor in generator:
-        output_filename = os.path.join(output_path, generated_descriptor.filename)
-        with open(output_filename, 'w', newline='\n') as output_file:
-            for line in generated_descriptor.code:
-                output_file.write('%s\n' % line)
+def _output_types(session, args):
+    # export or console output the parsed schema
+    type_descriptors = session.type_descriptors()
+    if args.export:
+        with session.profiler.stage('export'):
+            export_schema(type_descriptors, args.export, args.export_format)
+    else:
+        with session.profiler.stage('dump'):
+            printer = pprint.PrettyPrinter(width=140)
+            printer.pprint('*** *** ***')
+            for key in type_descriptors:
+                printer.pprint((key, type_descriptors[key]))
 
 
-def generate():
-    parser = argparse.ArgumentParser(description='CATS code generator')
-    parser.add_argument('-s', '--schema', help='input CATS file', required=True)
-    parser.add_argument('-o', '--output', help='output directory', default='_generated')
-    parser.add_argument('-i', '--include', help='schema root directory', default='./schemas')
+def _generate_locally(args):
+    profiler = StageProfiler(use_cprofile=bool(args.cprofile)) if args.profile else None
+    if profiler:
+        profiler.start()
 
-    generators_list = list(AVAILABLE_GENERATORS.keys())
-    parser.add_argument('-g', '--generator', help='generator to use to produce output files', choices=generators_list)
-    parser.add_argument('-c', '--copyright', help='file containing copyright data to use with output files', default='../HEADER.inc')
-    args = parser.parse_args()
+    session = Session(args.include, args.cache, args.deferred_linking, profiler)
+
+    # all roots are parsed into a single set of types, so that shared imports are only parsed once
+    errors = session.parse(args.schema, args.parse_jobs)
+    for ex in errors.values():
+        traceback.print_exception(type(ex), ex, ex.__traceback__)
+
+    if session.parse_cache:
+        print(session.parse_cache.statistics())
 
-    file_parser = MultiFileParser()
-    file_parser.set_include_path(args.include)
-    file_parser.parse(args.schema)
+    _output_types(session, args)
 
-    # console output the parsed schema
-    printer = pprint.PrettyPrinter(width=140)
-    printer.pprint('*** *** ***')
-    type_descriptors = file_parser.cats_parser.type_descriptors()
-    for key in type_descriptors:
-        printer.pprint((key, type_descriptors[key]))
+    # generate and output code; outputs of roots that failed to parse are not stale, so nothing is deleted when there are errors
+    delete_stale = args.delete_stale and not errors
+    for generator_name in args.generator or []:
+        _generate_output(session, generator_name, args, delete_stale)
 
-    # generate and output code
-    if args.generator:
-        _generate_output(args.generator, args.output, type_descriptors, {'copyright': args.copyright})
+    if session.generation_cache and args.generator:
+        print(session.generation_cache.statistics())
 
+    if profiler:
+        profiler.stop()
+        with open(args.profile, 'w') as output_file:
+            json.dump(profiler.results(), output_file, indent=4)
 
-generate()
+        if args.cprofile:
+            profiler.dump_cprofile(args.cprofile)
+
+    return not errors
+
+
+def generate():
+    args = _parse_args()
+    if args.serve:
+        _serve(args.serve, args.cache)
+    elif args.daemon:
+        if not _generate_with_daemon(args.daemon, args):
+            sys.exit(1)
+    elif args.watch:
+        _watch(args)
+    elif not _generate_locally(args):
+        sys.exit(1)
+
+
+if '__main__' == __name__:
+    generate()
@@ -29,16 +29,20 @@ function generate_all {
 		"transfer/transfer"
 	)
 
+	# all inputs are generated by a single process, which parses shared imports only once and reports errors per input
+	local schema_args=()
 	for input in ${inputs[*]}
 	do
 		echo "generating ${input}"
-		python3 main.py --schema ./schemas/${input}.cats --output _generated --generator ${builder} --copyright $1
-		if [ $? -ne 0 ]; then
-			echo "${start_error_color}ERROR: failed generating ${input}${end_color}"
-			exit 1
-		fi
+		schema_args+=(--schema ./schemas/${input}.cats)
 	done
 
+	python3 main.py ${schema_args[*]} --output _generated --generator ${builder} --copyright $1 --delete-stale
+	if [ $? -ne 0 ]; then
+		echo "${start_error_color}ERROR: failed generating inputs${end_color}"
+		exit 1
+	fi
+
 	echo "${start_success_color}SUCCESS: generation complete with no errors${end_color}"
 }
 
@@ -46,7 +50,8 @@ if [ "$#" -lt 2 ]; then
 	generate_all "../HEADER.inc"
 else
 	nis2_root="$2"
-	rm -rf _generated/${builder}
 	generate_all "${nis2_root}/HEADER.inc"
-	cp ./_generated/${builder}/* ${nis2_root}/sdk/src/builders/
+
+	# unchanged outputs keep their mtimes, which are preserved by the copy so that only changed builders are recompiled
+	cp -p ./_generated/${builder}/* ${nis2_root}/sdk/src/builders/
 fi
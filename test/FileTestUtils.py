@@ -0,0 +1,27 @@
+import os
+import tempfile
+import unittest
+
+
+class TempDirectoryTestCase(unittest.TestCase):
+    """Test case writing its files into a temporary directory, which is removed after each test"""
+    def setUp(self):
+        self.temp_directory = tempfile.TemporaryDirectory()
+        self.directory = self.temp_directory.name
+
+    def tearDown(self):
+        self.temp_directory.cleanup()
+
+    def _path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def _write(self, filename, lines, mtime=None):
+        full_path = self._path(filename)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w') as output_file:
+            output_file.write(''.join('{0}\n'.format(line) for line in lines))
+
+        if mtime:
+            os.utime(full_path, (mtime, mtime))
+
+        return full_path
@@ -0,0 +1,19 @@
+# pylint: disable=too-few-public-methods
+from generators.All import AVAILABLE_GENERATORS
+from generators.Descriptor import Descriptor
+
+
+class NamesGenerator:
+    """Generator producing one file listing the names of all types, each preceded by the optional prefix option"""
+    def __init__(self, schema, options):
+        self.schema = schema
+        self.options = options
+
+    def __iter__(self):
+        return iter([Descriptor('names.txt', ['{0}{1}'.format(self.options.get('prefix', ''), name) for name in self.schema])])
+
+
+def register_test_generator(test_case, name, generator_class):
+    """Makes a generator available by name until the end of a test"""
+    AVAILABLE_GENERATORS.register(name, lambda: generator_class)
+    test_case.addCleanup(AVAILABLE_GENERATORS.unregister, name)
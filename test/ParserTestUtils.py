@@ -1,4 +1,37 @@
 from catparser.CatsParseException import CatsParseException
+from catparser.CatsParser import CatsParser
+
+# schema using all kinds of types, shared by tests of descriptor models and exports
+SCHEMA_LINES = [
+    '# unique account identifier',
+    'using Address = binary_fixed(25)',
+    'using Amount = uint64',
+    '# shape of enclosure',
+    'enum Shape : uint8',
+    '\t# circle shape',
+    '\tcircle = 4',
+    '\trectangle = 9',
+    'struct Item',
+    '\tweight = uint16',
+    '# binary layout for an enclosure',
+    'struct Enclosing',
+    '\tconst uint8 version = 3',
+    '\t# owner of enclosure',
+    '\towner = Address',
+    '\tenclosingType = Shape',
+    '\tcircumference = uint64 if enclosingType equals circle',
+    '\titemsCount = uint8',
+    '\titems = array(Item, itemsCount, sort_key=weight)',
+    '\tinline Item'
+]
+
+
+def parse_all(lines):
+    parser = CatsParser(None)
+    for line in lines:
+        parser.process_line(line)
+
+    return parser.type_descriptors()
 
 
 class SingleLineParserTestUtils:
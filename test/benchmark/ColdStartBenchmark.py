@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+import time
+
+MAIN_FILENAME = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'main.py')
+
+
+def _run(arguments, python_options=()):
+    command = [sys.executable] + list(python_options) + [MAIN_FILENAME] + list(arguments)
+    return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=False)
+
+
+def parse_import_times(importtime_output):
+    """Returns the cumulative import time in seconds of every module reported by python -X importtime"""
+    import_times = {}
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+
+        _, cumulative_microseconds, module_name = line[len('import time:'):].split('|')
+        import_times[module_name.strip()] = int(cumulative_microseconds) / 1000000
+
+    return import_times
+
+
+def benchmark_cold_start(arguments, repeat=3, num_imports=10):
+    """Measures running the CLI with arguments in a new interpreter, including the modules that are slowest to import"""
+    wall_seconds = []
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        _run(arguments)
+        wall_seconds.append(time.perf_counter() - wall_start)
+
+    # import times are measured in a separate run because reporting them slows down the interpreter
+    import_times = parse_import_times(_run(arguments, ['-X', 'importtime']).stderr.decode('utf-8'))
+    slowest_imports = sorted(import_times.items(), key=lambda item: item[1], reverse=True)[:num_imports]
+    return {
+        'wall_seconds': min(wall_seconds),
+        'imported_modules': len(import_times),
+        'slowest_imports': dict(slowest_imports)
+    }
@@ -0,0 +1,104 @@
+import time
+import tracemalloc
+from catparser.CatsEvents import CatsEventHandler, stream_events
+from catparser.MultiFileParser import MultiFileParser
+from generators.All import AVAILABLE_GENERATORS
+from generators.OutputSink import HashingSink
+
+
+def measure(function, repeat=3):
+    """Runs function repeat times and returns its best wall and cpu times plus its peak traced allocation size"""
+    wall_seconds = []
+    cpu_seconds = []
+    for _ in range(repeat):
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        function()
+        cpu_seconds.append(time.process_time() - cpu_start)
+        wall_seconds.append(time.perf_counter() - wall_start)
+
+    # allocations are traced in a separate run because tracing slows down the measured function
+    tracemalloc.start()
+    try:
+        function()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {'wall_seconds': min(wall_seconds), 'cpu_seconds': min(cpu_seconds), 'peak_bytes': peak_bytes}
+
+
+def _count_lines(filenames):
+    num_lines = 0
+    for filename in filenames:
+        with open(filename) as input_file:
+            num_lines += sum(1 for _ in input_file)
+
+    return num_lines
+
+
+def _add_throughput(result, num_lines):
+    result['lines'] = num_lines
+    result['lines_per_second'] = num_lines / result['wall_seconds'] if result['wall_seconds'] else None
+    return result
+
+
+def _parse(schema_filename, include_path, **kwargs):
+    file_parser = MultiFileParser(**kwargs)
+    file_parser.set_include_path(include_path)
+    file_parser.parse(schema_filename)
+    file_parser.cats_parser.type_descriptors()
+    return file_parser
+
+
+def benchmark_parse(schema_filename, include_path, repeat=3, deferred_linking=False):
+    """Measures a MultiFileParser parse of a schema file and all of its imports"""
+    num_lines = _count_lines(_parse(schema_filename, include_path).import_graph)
+    result = measure(lambda: _parse(schema_filename, include_path, deferred_linking=deferred_linking), repeat)
+    return _add_throughput(result, num_lines)
+
+
+def benchmark_stream(schema_filename, include_path, repeat=3):
+    """Measures streaming parser events for a schema file and all of its imports without retaining any types"""
+    filenames = list(_parse(schema_filename, include_path).import_graph)
+
+    def stream_all():
+        for filename in filenames:
+            with open(filename, 'rb') as input_file:
+                stream_events(input_file, CatsEventHandler(), filename)
+
+    return _add_throughput(measure(stream_all, repeat), _count_lines(filenames))
+
+
+def benchmark_generate(schema_filenames, include_path, generator_name, options, repeat=3):
+    """Measures parsing schema files and generating code from them end to end (without writing any files)"""
+    generator_class = AVAILABLE_GENERATORS[generator_name]
+
+    def generate_all():
+        for schema_filename in schema_filenames:
+            type_descriptors = _parse(schema_filename, include_path).cats_parser.type_descriptors()
+            for generated_descriptor in generator_class(type_descriptors, options):
+                sink = HashingSink()
+                generated_descriptor.write_to(sink)
+                sink.close()
+
+    num_lines = _count_lines({
+        filename for schema_filename in schema_filenames for filename in _parse(schema_filename, include_path).import_graph
+    })
+    return _add_throughput(measure(generate_all, repeat), num_lines)
+
+
+def compare_results(baseline, current):
+    """Returns the ratio of current to baseline wall time and peak allocation size (if measured) for every case found in both results"""
+    ratios = {}
+    for case_name, case_result in current['cases'].items():
+        baseline_result = baseline['cases'].get(case_name)
+        if not baseline_result or 'error' in baseline_result or 'error' in case_result:
+            continue
+
+        ratios[case_name] = {
+            key: case_result[key] / baseline_result[key] if baseline_result[key] else None
+            for key in ('wall_seconds', 'peak_bytes') if key in case_result and key in baseline_result
+        }
+
+    return ratios
@@ -0,0 +1,118 @@
+# pylint: disable=too-few-public-methods
+import os
+import random
+
+ROOT_FILENAME = 'root.cats'
+
+
+class SyntheticSchemaOptions:
+    """Shape of a synthetic CATS tree"""
+    # pylint: disable=too-many-arguments
+    def __init__(
+            self,
+            num_files=10,
+            import_depth=3,
+            structs_per_file=5,
+            fields_per_struct=8,
+            enum_width=16,
+            conditional_share=0.1,
+            array_share=0.1,
+            seed=0):
+        self.num_files = num_files
+        self.import_depth = max(1, min(import_depth, num_files))
+        self.structs_per_file = structs_per_file
+        self.fields_per_struct = fields_per_struct
+        self.enum_width = enum_width
+        self.conditional_share = conditional_share
+        self.array_share = array_share
+        self.seed = seed
+
+    def to_dict(self):
+        """Returns the options as a dict, e.g. for inclusion in benchmark results"""
+        return dict(vars(self))
+
+
+def _file_level(options, file_index):
+    return file_index * options.import_depth // options.num_files
+
+
+def _file_imports(options, file_index):
+    # each file imports (up to) two files of the preceding level, so that deeper levels share imports
+    level = _file_level(options, file_index)
+    if 0 == level:
+        return []
+
+    previous_level_indexes = [index for index in range(options.num_files) if level - 1 == _file_level(options, index)]
+    offset = file_index % len(previous_level_indexes)
+    return sorted({previous_level_indexes[offset], previous_level_indexes[(offset + 1) % len(previous_level_indexes)]})
+
+
+def _enum_base_type(enum_width):
+    return 'uint8' if enum_width <= 0xFF else 'uint32'
+
+
+def _schema_lines(options, file_index, imported_type_names, rng):
+    lines = ['import "file{0}.cats"'.format(import_index) for import_index in _file_imports(options, file_index)]
+    if lines:
+        lines.append('')
+
+    enum_name = 'Kind{0}'.format(file_index)
+    lines += ['# kinds of file {0} structs'.format(file_index), 'enum {0} : {1}'.format(enum_name, _enum_base_type(options.enum_width))]
+    for value_index in range(options.enum_width):
+        lines += ['\t# kind {0}'.format(value_index), '\tkind{0} = 0x{0:X}'.format(value_index), '']
+
+    type_names = []
+    for struct_index in range(options.structs_per_file):
+        struct_name = 'Struct{0}x{1}'.format(file_index, struct_index)
+        lines += ['# struct {0} of file {1}'.format(struct_index, file_index), 'struct {0}'.format(struct_name)]
+        lines += ['\t# struct kind', '\tkind = {0}'.format(enum_name), '', '\t# number of array elements', '\tcount = uint16', '']
+
+        referenced_type_names = imported_type_names + type_names
+        for field_index in range(options.fields_per_struct):
+            field_type = rng.choice(referenced_type_names) if referenced_type_names and rng.random() < 0.5 else 'uint32'
+            field_share = rng.random()
+            if field_share < options.conditional_share:
+                field_value = '{0} if kind equals kind{1}'.format(field_type, rng.randrange(options.enum_width))
+            elif field_share < options.conditional_share + options.array_share:
+                # arrays of builtins are byte arrays
+                field_value = 'array({0}, count)'.format('byte' if 'uint32' == field_type else field_type)
+            else:
+                field_value = field_type
+
+            lines += ['\t# field {0}'.format(field_index), '\tfield{0} = {1}'.format(field_index, field_value), '']
+
+        type_names.append(struct_name)
+
+    return lines, type_names
+
+
+def write_synthetic_schemas(directory, options):
+    """Writes a synthetic CATS tree to directory and returns the path of its root file, which imports all other files"""
+    # conditions compare against a kind value, so they require an enum with values
+    if options.conditional_share and not options.enum_width:
+        raise ValueError('conditional fields require a non-zero enum width')
+
+    rng = random.Random(options.seed)
+    file_type_names = []
+    imported_file_indexes = set()
+    for file_index in range(options.num_files):
+        imported_type_names = []
+        for import_index in _file_imports(options, file_index):
+            imported_type_names += file_type_names[import_index]
+            imported_file_indexes.add(import_index)
+
+        lines, type_names = _schema_lines(options, file_index, imported_type_names, rng)
+        _write_lines(os.path.join(directory, 'file{0}.cats'.format(file_index)), lines)
+        file_type_names.append(type_names)
+
+    root_filename = os.path.join(directory, ROOT_FILENAME)
+    _write_lines(root_filename, [
+        'import "file{0}.cats"'.format(file_index) for file_index in range(options.num_files) if file_index not in imported_file_indexes
+    ])
+    return root_filename
+
+
+def _write_lines(filename, lines):
+    with open(filename, 'w', newline='\n') as output_file:
+        for line in lines:
+            output_file.write('{0}\n'.format(line))
@@ -0,0 +1,98 @@
+# pylint: disable=invalid-name
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+from .ColdStartBenchmark import benchmark_cold_start
+from .ParserBenchmark import benchmark_generate, benchmark_parse, benchmark_stream, compare_results
+from .SyntheticSchema import SyntheticSchemaOptions, write_synthetic_schemas
+
+
+def _revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode('ascii').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _run_case(cases, case_name, function):
+    print('running {0}'.format(case_name), file=sys.stderr)
+    try:
+        cases[case_name] = function()
+    except Exception as ex:  # pylint: disable=broad-except
+        # a failing case (e.g. a generator that cannot run in this environment) must not hide the results of other cases
+        cases[case_name] = {'error': str(ex)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CATS parser benchmark')
+    parser.add_argument('--files', help='number of synthetic schema files', type=int, default=50)
+    parser.add_argument('--import-depth', help='depth of the synthetic import graph', type=int, default=5)
+    parser.add_argument('--structs', help='structs per synthetic schema file', type=int, default=10)
+    parser.add_argument('--fields', help='fields per synthetic struct', type=int, default=10)
+    parser.add_argument('--enum-width', help='values per synthetic enum', type=int, default=16)
+    parser.add_argument('--conditional-share', help='share of conditional synthetic fields', type=float, default=0.1)
+    parser.add_argument('--array-share', help='share of array synthetic fields', type=float, default=0.1)
+    parser.add_argument('--seed', help='seed used to generate synthetic schemas', type=int, default=0)
+    parser.add_argument('--repeat', help='number of timed runs per case (the best one is reported)', type=int, default=3)
+    parser.add_argument('--schema', help='real schema file used for end to end generation (repeatable)', action='append')
+    parser.add_argument('-i', '--include', help='schema root directory of real schema files', default='./schemas')
+    parser.add_argument('-g', '--generator', help='generator used for end to end generation', default='cpp_builder')
+    parser.add_argument('-c', '--copyright', help='file containing copyright data to use with output files', default='../HEADER.inc')
+    parser.add_argument('-o', '--output', help='file results are written to as JSON (default: stdout)')
+    parser.add_argument('--compare', help='results file of another revision to compare against')
+    args = parser.parse_args()
+
+    options = SyntheticSchemaOptions(
+        args.files,
+        args.import_depth,
+        args.structs,
+        args.fields,
+        args.enum_width,
+        args.conditional_share,
+        args.array_share,
+        args.seed)
+    results = {
+        'revision': _revision(),
+        'python': platform.python_version(),
+        'synthetic_schema': options.to_dict(),
+        'repeat': args.repeat,
+        'cases': {}
+    }
+
+    cases = results['cases']
+    with tempfile.TemporaryDirectory() as directory:
+        root_filename = write_synthetic_schemas(directory, options)
+        _run_case(cases, 'parse', lambda: benchmark_parse(root_filename, directory, args.repeat))
+        _run_case(cases, 'parse_deferred_linking', lambda: benchmark_parse(root_filename, directory, args.repeat, True))
+        _run_case(cases, 'stream_events', lambda: benchmark_stream(root_filename, directory, args.repeat))
+
+    schema_filenames = args.schema or ['schemas/transfer/transfer.cats']
+    _run_case(cases, 'generate_{0}'.format(args.generator), lambda: benchmark_generate(
+        schema_filenames,
+        args.include,
+        args.generator,
+        {'copyright': args.copyright},
+        args.repeat))
+
+    # cold starts run the CLI like pre-commit hooks and CI do, so they include interpreter startup and all imports
+    parse_arguments = [argument for schema_filename in schema_filenames for argument in ['-s', schema_filename]] + ['-i', args.include]
+    _run_case(cases, 'cold_start_parse', lambda: benchmark_cold_start(parse_arguments, args.repeat))
+    with tempfile.TemporaryDirectory() as directory:
+        generate_arguments = parse_arguments + ['-g', args.generator, '-o', directory, '-c', args.copyright]
+        _run_case(cases, 'cold_start_generate_{0}'.format(args.generator), lambda: benchmark_cold_start(generate_arguments, args.repeat))
+
+    if args.compare:
+        with open(args.compare) as input_file:
+            results['comparison'] = compare_results(json.load(input_file), results)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=4, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=4, sort_keys=True))
+
+
+main()
@@ -0,0 +1,69 @@
+# pylint: disable=invalid-name
+import unittest
+from catparser.TransactionCatalog import TransactionCatalog
+from generators.cpp_builder.BuilderGenerator import BuilderGenerator
+from generators.cpp_builder.HeaderGenerator import HeaderGenerator
+
+OPTIONS = {'copyright': 'missing_copyright_file'}
+
+
+def _builder_schema(embedded_name=None):
+    schema = {
+        'Amount': {'type': 'byte', 'size': 8, 'signedness': 'unsigned'},
+        'Transaction': {'type': 'struct', 'layout': [{'name': 'size', 'type': 'byte', 'size': 4}]},
+        'EmbeddedTransaction': {'type': 'struct', 'layout': [{'name': 'size', 'type': 'byte', 'size': 4}]},
+        'FooTransactionBody': {'type': 'struct', 'layout': [{'name': 'amount', 'type': 'Amount', 'comments': 'amount'}]},
+        'FooTransaction': {'type': 'struct', 'layout': [
+            {'type': 'Transaction', 'disposition': 'inline'},
+            {'type': 'FooTransactionBody', 'disposition': 'inline'}
+        ]}
+    }
+
+    if embedded_name:
+        schema[embedded_name] = {'type': 'struct', 'layout': [
+            {'type': 'EmbeddedTransaction', 'disposition': 'inline'},
+            {'type': 'FooTransactionBody', 'disposition': 'inline'}
+        ]}
+
+    return schema
+
+
+def _embedded_alias(schema):
+    lines = HeaderGenerator(schema, OPTIONS, 'FooTransaction').generate()
+    return next(line.strip() for line in lines if 'using EmbeddedTransaction' in line)
+
+
+class BuilderGeneratorTest(unittest.TestCase):
+    def test_header_names_embedded_transaction_of_catalog(self):
+        # Act:
+        alias = _embedded_alias(_builder_schema('EmbeddedFooTransactionV2'))
+
+        # Assert:
+        self.assertEqual('using EmbeddedTransaction = model::EmbeddedFooTransactionV2;', alias)
+
+    def test_header_assumes_conventional_name_of_missing_embedded_transaction(self):
+        # Act:
+        alias = _embedded_alias(_builder_schema())
+
+        # Assert:
+        self.assertEqual('using EmbeddedTransaction = model::EmbeddedFooTransaction;', alias)
+
+    def test_validate_reports_missing_embedded_transaction(self):
+        # Act:
+        problems = BuilderGenerator(_builder_schema(), OPTIONS).validate()
+
+        # Assert:
+        self.assertIn('transaction "FooTransaction" has no embedded transaction, its builder assumes "EmbeddedFooTransaction"', problems)
+
+    def test_validate_accepts_embedded_transaction_of_any_name(self):
+        # Arrange:
+        schema = _builder_schema('EmbeddedFooTransactionV2')
+
+        # Sanity:
+        self.assertEqual('EmbeddedFooTransactionV2', TransactionCatalog(schema)['FooTransaction'].embedded)
+
+        # Act:
+        problems = BuilderGenerator(schema, OPTIONS).validate()
+
+        # Assert:
+        self.assertEqual([], [problem for problem in problems if 'embedded' in problem])
@@ -0,0 +1,144 @@
+# pylint: disable=invalid-name
+import mmap
+import os
+import tempfile
+import unittest
+from catparser.CatsEvents import CatsEventHandler, stream_events
+from catparser.CatsParseException import CatsParseException
+from catparser.CatsParser import CatsParser
+from catparser.ScopeManager import Location
+
+
+class RecordingEventHandler(CatsEventHandler):
+    def __init__(self):
+        self.events = []
+
+    def start_type(self, location, type_name, type_descriptor):
+        self.events.append(('start_type', location, type_name, type_descriptor['type']))
+
+    def field(self, location, type_name, field_descriptor):
+        self.events.append(('field', location, type_name, field_descriptor['name']))
+
+    def enum_value(self, location, type_name, value_descriptor):
+        self.events.append(('enum_value', location, type_name, value_descriptor['name']))
+
+    def end_type(self, location, type_name, type_descriptor):
+        self.events.append(('end_type', location, type_name, type_descriptor['type']))
+
+    def import_file(self, location, filename):
+        self.events.append(('import_file', location, filename))
+
+
+SCHEMA_LINES = [
+    'import "other.cats"',
+    'using Amount = uint64',
+    '',
+    'enum Color : uint8',
+    '\tred = 1',
+    '\tblue = 2',
+    '',
+    '# a painted amount',
+    'struct Paint',
+    '\tamount = Amount',
+    '\tcolor = Color',
+    ''
+]
+
+
+class CatsEventsTest(unittest.TestCase):
+    def _assert_schema_events(self, events, filename):
+        def location(line_number):
+            return Location(filename, line_number)
+
+        self.assertEqual([
+            ('import_file', location(1), 'other.cats'),
+            ('start_type', location(2), 'Amount', 'byte'),
+            ('end_type', location(2), 'Amount', 'byte'),
+            ('start_type', location(4), 'Color', 'enum'),
+            ('enum_value', location(5), 'Color', 'red'),
+            ('enum_value', location(6), 'Color', 'blue'),
+            ('end_type', location(9), 'Color', 'enum'),
+            ('start_type', location(9), 'Paint', 'struct'),
+            ('field', location(10), 'Paint', 'amount'),
+            ('field', location(11), 'Paint', 'color'),
+            ('end_type', location(12), 'Paint', 'struct')
+        ], events)
+
+    def test_events_are_emitted_as_lines_are_consumed(self):
+        # Arrange:
+        handler = RecordingEventHandler()
+        imports = []
+
+        # Act:
+        stream_events(SCHEMA_LINES, handler, 'foo.cats', imports.append)
+
+        # Assert:
+        self._assert_schema_events(handler.events, 'foo.cats')
+        self.assertEqual(['other.cats'], imports)
+
+    def test_events_can_be_emitted_from_bytes_lines(self):
+        # Arrange:
+        handler = RecordingEventHandler()
+
+        # Act:
+        stream_events([(line + '\n').encode('utf-8') for line in SCHEMA_LINES], handler, 'foo.cats')
+
+        # Assert:
+        self._assert_schema_events(handler.events, 'foo.cats')
+
+    def test_events_can_be_emitted_from_mmap(self):
+        # Arrange:
+        handler = RecordingEventHandler()
+        with tempfile.TemporaryDirectory() as temp_directory:
+            filename = os.path.join(temp_directory, 'foo.cats')
+            with open(filename, 'wb') as output_file:
+                output_file.write(''.join(line + '\n' for line in SCHEMA_LINES).encode('utf-8'))
+
+            # Act:
+            with open(filename, 'rb') as input_file:
+                with mmap.mmap(input_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+                    stream_events(iter(mapped_file.readline, b''), handler, filename)
+
+        # Assert:
+        self._assert_schema_events(handler.events, filename)
+
+    def test_streamed_types_are_not_retained(self):
+        # Arrange:
+        parser = CatsParser(None, event_handler=RecordingEventHandler(), retain_types=False)
+
+        # Act:
+        parser.parse_lines(SCHEMA_LINES[1:])
+
+        # Assert:
+        self.assertEqual(0, len(parser.type_descriptors()))
+        self.assertEqual({'Amount', 'Color', 'Paint'}, parser.type_names)
+
+    def test_streamed_types_are_not_linked(self):
+        # Arrange:
+        handler = RecordingEventHandler()
+
+        # Act:
+        stream_events(['struct Foo', '\tbar = Bar'], handler)
+
+        # Assert:
+        self.assertEqual(['start_type', 'field', 'end_type'], [event[0] for event in handler.events])
+
+    def test_streamed_types_are_checked_for_duplicate_names(self):
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            stream_events(['using Foo = uint8', 'using Foo = uint16'], CatsEventHandler())
+
+    def test_events_are_emitted_alongside_retained_types(self):
+        # Arrange:
+        handler = RecordingEventHandler()
+        parser = CatsParser(lambda _: None, event_handler=handler)
+        parser.push_scope('foo.cats')
+
+        # Act:
+        parser.parse_lines(SCHEMA_LINES)
+        parser.close_type()
+        type_descriptors = parser.type_descriptors()
+
+        # Assert:
+        self._assert_schema_events(handler.events, 'foo.cats')
+        self.assertEqual(['Amount', 'Color', 'Paint'], list(type_descriptors.keys()))
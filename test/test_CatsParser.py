@@ -198,6 +198,27 @@ class CatsParserTests(unittest.TestCase):
             {'name': 'perimiter', 'type': 'Perm', 'condition': 'enclosingType', 'condition_value': 'rectangle', 'comments': 'union part 2'}
         ]})
 
+    def test_can_parse_struct_conditional_types_after_inline_member(self):
+        # Act:
+        type_descriptors = parse_all([
+            'enum Shape : uint8',
+            '\tcircle = 4',
+            'using Circ = uint16',
+            'struct Placeholder',
+            'struct Enclosing',
+            '\tinline Placeholder',
+            '\tenclosingType = Shape',
+            '\tcircumference = Circ if enclosingType equals circle'
+        ])
+
+        # Assert:
+        self.assertEqual(4, len(type_descriptors))
+        self.assertEqual(type_descriptors['Enclosing'], {'type': 'struct', 'comments': '', 'layout': [
+            {'type': 'Placeholder', 'disposition': 'inline', 'comments': ''},
+            {'name': 'enclosingType', 'type': 'Shape', 'comments': ''},
+            {'name': 'circumference', 'type': 'Circ', 'condition': 'enclosingType', 'condition_value': 'circle', 'comments': ''}
+        ]})
+
     def test_can_parse_struct_array_types(self):
         # Act:
         type_descriptors = parse_all([
@@ -233,6 +254,33 @@ class CatsParserTests(unittest.TestCase):
             {'name': 'faces', 'type': 'Face', 'size': 10, 'sort_key': 'eyeColor', 'comments': ''},
         ]})
 
+    def test_can_parse_struct_sorted_array_types_with_inline_member(self):
+        # Act:
+        type_descriptors = parse_all([
+            'struct Placeholder',
+            'struct Face',
+            '\tinline Placeholder',
+            '\teyeColor = uint8',
+            'struct Tracking',
+            '\tfaces = array(Face, 10, sort_key=eyeColor)'
+        ])
+
+        # Assert:
+        self.assertEqual(3, len(type_descriptors))
+        self.assertEqual(type_descriptors['Tracking'], {'type': 'struct', 'comments': '', 'layout': [
+            {'name': 'faces', 'type': 'Face', 'size': 10, 'sort_key': 'eyeColor', 'comments': ''},
+        ]})
+
+    def test_cannot_parse_struct_with_unknown_condition_field(self):
+        # Act:
+        self._assert_parse_delayed_exception([
+            'enum Shape : uint8',
+            '\tcircle = 1',
+            'using Circ = uint16',
+            'struct Enclosing',
+            '\tcircumference = Circ if enclosingType equals circle'
+        ])
+
     def test_can_parse_struct_closed_by_other_type(self):
         # Act:
         type_descriptors = parse_all([
@@ -505,3 +553,83 @@ class CatsParserTests(unittest.TestCase):
         self.assertEqual(list(type_descriptors.keys()), ['Truck', 'Fleet', 'Bar', 'Car'])
 
     # endregion
+
+    # region deferred linking
+
+    @staticmethod
+    def _create_deferred_parser(lines):
+        parser = CatsParser(None, deferred_linking=True)
+        for line in lines:
+            parser.process_line(line)
+
+        return parser
+
+    def test_deferred_linking_allows_forward_references(self):
+        # Act:
+        type_descriptors = self._create_deferred_parser([
+            'struct Enclosing',
+            '\tenclosingType = Shape',
+            '\tcircumference = Circ if enclosingType equals circle',
+            '\tfaces = array(Face, 10, sort_key=eyeColor)',
+            'struct Face',
+            '\teyeColor = uint8',
+            'using Circ = uint16',
+            'enum Shape : uint8',
+            '\tcircle = 4'
+        ]).type_descriptors()
+
+        # Assert:
+        self.assertEqual(['Enclosing', 'Face', 'Circ', 'Shape'], list(type_descriptors.keys()))
+        self.assertEqual(type_descriptors['Enclosing'], {'type': 'struct', 'comments': '', 'layout': [
+            {'name': 'enclosingType', 'type': 'Shape', 'comments': ''},
+            {'name': 'circumference', 'type': 'Circ', 'condition': 'enclosingType', 'condition_value': 'circle', 'comments': ''},
+            {'name': 'faces', 'type': 'Face', 'size': 10, 'sort_key': 'eyeColor', 'comments': ''}
+        ]})
+
+    def test_deferred_linking_reports_all_unresolved_links(self):
+        # Arrange:
+        parser = self._create_deferred_parser([
+            'enum Shape : uint8',
+            '\tcircle = 4',
+            'struct Enclosing',
+            '\tenclosingType = Shape',
+            '\tcircumference = Circ if enclosingType equals square',
+            '\tfaces = array(Face, 10, sort_key=eyeColor)'
+        ])
+
+        # Act:
+        with self.assertRaises(CatsParseException) as context:
+            parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual('\n'.join([
+            '<unknown>:5: no definition for linked type "Circ"',
+            '<unknown>:5: linked enum type "Shape" does not contain value "square"',
+            '<unknown>:6: no definition for linked type "Face"'
+        ]), str(context.exception))
+
+    def test_deferred_linking_keeps_only_unresolved_links(self):
+        # Arrange:
+        parser = self._create_deferred_parser([
+            'struct Pair',
+            '\tfirst = Amount',
+            '\tsecond = Fee'
+        ])
+
+        # Act:
+        unresolved_link_counts = []
+        for line in ['using Fee = uint8', 'using Amount = uint8']:
+            with self.assertRaises(CatsParseException):
+                parser.link()
+
+            unresolved_link_counts.append(len(parser.linker.unresolved_links))
+            parser.process_line(line)
+
+        type_descriptors = parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual([2, 1], unresolved_link_counts)
+        self.assertEqual([], parser.linker.unresolved_links)
+        self.assertEqual(['Pair', 'Fee', 'Amount'], list(type_descriptors.keys()))
+
+    # endregion
@@ -0,0 +1,82 @@
+# pylint: disable=invalid-name
+import unittest
+from test.ParserTestUtils import SCHEMA_LINES, parse_all
+from catparser.CompactDescriptors import \
+    FieldDescriptor, builtin_descriptor, compact_type_descriptors, expand_type_descriptors
+
+
+class CompactDescriptorsTest(unittest.TestCase):
+    def test_compact_descriptors_are_equal_to_parsed_descriptors(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+
+        # Act:
+        compact_descriptors = compact_type_descriptors(type_descriptors)
+
+        # Assert:
+        self.assertEqual(list(type_descriptors.keys()), list(compact_descriptors.keys()))
+        for type_name, type_descriptor in type_descriptors.items():
+            self.assertEqual(type_descriptor, compact_descriptors[type_name])
+
+    def test_compact_descriptors_support_dictionary_access(self):
+        # Act:
+        compact_descriptors = compact_type_descriptors(parse_all(SCHEMA_LINES))
+        layout = compact_descriptors['Enclosing']['layout']
+
+        # Assert:
+        self.assertEqual('struct', compact_descriptors['Enclosing']['type'])
+        self.assertEqual(('enum', 1), (compact_descriptors['Shape']['type'], compact_descriptors['Shape']['size']))
+        self.assertEqual('owner of enclosure', layout[1]['comments'])
+        self.assertEqual(('byte', 8), (layout[3]['type'], layout[3].get('size', 0)))
+        self.assertTrue('condition' in layout[3])
+        self.assertFalse('condition' in layout[1])
+        self.assertEqual(0, layout[1].get('size', 0))
+        with self.assertRaises(KeyError):
+            _ = layout[1]['size']
+
+    def test_expanded_descriptors_are_plain_dictionaries(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+
+        # Act:
+        expanded_descriptors = expand_type_descriptors(compact_type_descriptors(type_descriptors))
+
+        # Assert:
+        self.assertEqual(type_descriptors, expanded_descriptors)
+        self.assertIsInstance(expanded_descriptors['Enclosing'], dict)
+        self.assertIsInstance(expanded_descriptors['Enclosing']['layout'], list)
+        self.assertIsInstance(expanded_descriptors['Enclosing']['layout'][0], dict)
+
+    def test_builtin_descriptors_are_shared(self):
+        # Act:
+        compact_descriptors = compact_type_descriptors(parse_all(SCHEMA_LINES))
+        layout = compact_descriptors['Enclosing']['layout']
+
+        # Assert:
+        self.assertIs(builtin_descriptor(8, 'unsigned'), compact_descriptors['Amount'].builtin)
+        self.assertIs(builtin_descriptor(8, 'unsigned'), layout[3].builtin)
+        self.assertIs(builtin_descriptor(1, 'unsigned'), compact_descriptors['Shape'].builtin)
+        self.assertIs(builtin_descriptor(1, 'unsigned'), layout[4].builtin)
+
+    def test_compact_descriptors_do_not_have_instance_dictionaries(self):
+        # Act:
+        compact_descriptors = compact_type_descriptors(parse_all(SCHEMA_LINES))
+
+        # Assert:
+        for type_descriptor in compact_descriptors.values():
+            self.assertFalse(hasattr(type_descriptor, '__dict__'))
+
+        self.assertFalse(hasattr(FieldDescriptor(None, name='foo'), '__dict__'))
+
+    def test_comments_can_be_dropped(self):
+        # Act:
+        compact_descriptors = compact_type_descriptors(parse_all(SCHEMA_LINES), keep_comments=False)
+
+        # Assert:
+        self.assertEqual({'type': 'byte', 'size': 25, 'signedness': 'unsigned'}, compact_descriptors['Address'])
+        self.assertEqual({'type': 'enum', 'size': 1, 'signedness': 'unsigned', 'values': [
+            {'name': 'circle', 'value': 4},
+            {'name': 'rectangle', 'value': 9}
+        ]}, compact_descriptors['Shape'])
+        self.assertEqual({'type': 'struct', 'layout': [{'name': 'weight', 'type': 'byte', 'size': 2, 'signedness': 'unsigned'}]},
+                         compact_descriptors['Item'])
@@ -0,0 +1,229 @@
+# pylint: disable=invalid-name
+from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from test.FileTestUtils import TempDirectoryTestCase
+from test.GeneratorTestUtils import NamesGenerator, register_test_generator
+from generators.Daemon import DaemonServer, GenerationDaemon, WarmSession, send_request
+
+TEST_GENERATOR_NAME = 'test_daemon_names'
+
+
+class DaemonTestBase(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write('base.cats', ['using Amount = uint64'])
+        self._write('foo.cats', ['import "base.cats"', 'using Foo = uint8'])
+        self._write('bar.cats', ['using Bar = uint16'])
+        register_test_generator(self, TEST_GENERATOR_NAME, NamesGenerator)
+
+
+class WarmSessionTest(DaemonTestBase):
+    def _create_session(self, filenames):
+        return WarmSession([self._path(filename) for filename in filenames], self.directory)
+
+    def test_first_revalidate_parses_all_roots(self):
+        # Arrange:
+        session = self._create_session(['foo.cats', 'bar.cats'])
+
+        # Act:
+        errors = session.revalidate()
+
+        # Assert:
+        self.assertEqual({}, errors)
+        self.assertEqual(['Amount', 'Foo', 'Bar'], list(session.type_descriptors()))
+
+    def test_unchanged_files_are_not_parsed_again(self):
+        # Arrange:
+        session = self._create_session(['foo.cats', 'bar.cats'])
+        session.revalidate()
+        file_parser = session.file_parser
+        type_descriptors = session.type_descriptors()
+
+        # Act:
+        session.revalidate()
+
+        # Assert:
+        self.assertIs(file_parser, session.file_parser)
+        self.assertEqual(type_descriptors, session.type_descriptors())
+        self.assertEqual(set(), session.changed_files())
+
+    def test_touched_files_are_not_parsed_again(self):
+        # Arrange:
+        session = self._create_session(['foo.cats'])
+        session.revalidate()
+
+        # Act:
+        self._write('base.cats', ['using Amount = uint64'], 1)
+        changed_files = session.changed_files()
+
+        # Assert:
+        self.assertEqual(set(), changed_files)
+
+    def test_changed_files_are_parsed_again(self):
+        # Arrange:
+        session = self._create_session(['foo.cats', 'bar.cats'])
+        session.revalidate()
+        file_parser = session.file_parser
+
+        # Act:
+        self._write('base.cats', ['using Amount = uint32'], 1)
+        errors = session.revalidate()
+
+        # Assert:
+        self.assertEqual({}, errors)
+        self.assertIs(file_parser, session.file_parser)
+        self.assertEqual(4, session.type_descriptors()['Amount']['size'])
+        self.assertEqual({'Amount', 'Foo', 'Bar'}, set(session.type_descriptors()))
+
+    def test_failed_roots_are_reported_until_fixed(self):
+        # Arrange:
+        self._write('bar.cats', ['import "missing.cats"'])
+        session = self._create_session(['bar.cats', 'foo.cats'])
+        first_errors = session.revalidate()
+        second_errors = session.revalidate()
+
+        # Act:
+        self._write('bar.cats', ['using Bar = uint16'], 1)
+        third_errors = session.revalidate()
+
+        # Assert:
+        self.assertEqual([self._path('bar.cats')], list(first_errors))
+        self.assertEqual([self._path('bar.cats')], list(second_errors))
+        self.assertEqual({}, third_errors)
+
+        # - fixed roots are parsed in their original order
+        self.assertEqual(['Bar', 'Amount', 'Foo'], list(session.type_descriptors()))
+
+    def test_roots_that_start_failing_are_reported(self):
+        # Arrange:
+        session = self._create_session(['foo.cats', 'bar.cats'])
+        session.revalidate()
+
+        # Act:
+        self._write('base.cats', ['using Amount = unknown'], 1)
+        errors = session.revalidate()
+
+        # Assert:
+        self.assertEqual([self._path('foo.cats')], list(errors))
+        self.assertEqual(['Bar'], list(session.type_descriptors()))
+
+
+class GenerationDaemonTest(DaemonTestBase):
+    def _request(self, filenames, generators=None):
+        return {
+            'schemas': [self._path(filename) for filename in filenames],
+            'include': self.directory,
+            'generators': generators or [TEST_GENERATOR_NAME]
+        }
+
+    def test_request_returns_outputs_of_all_generators(self):
+        # Arrange:
+        daemon = GenerationDaemon()
+
+        # Act:
+        response = daemon.handle(self._request(['foo.cats', 'bar.cats']))
+
+        # Assert:
+        self.assertEqual({
+            'errors': {},
+            'problems': {TEST_GENERATOR_NAME: []},
+            'outputs': {TEST_GENERATOR_NAME: {'names.txt': ['Amount', 'Foo', 'Bar']}}
+        }, response)
+
+    def test_request_returns_errors_of_failed_roots(self):
+        # Arrange:
+        daemon = GenerationDaemon()
+        self._write('bar.cats', ['import "missing.cats"'])
+
+        # Act:
+        response = daemon.handle(self._request(['foo.cats', 'bar.cats']))
+
+        # Assert:
+        self.assertEqual([self._path('bar.cats')], list(response['errors']))
+        self.assertEqual({TEST_GENERATOR_NAME: {'names.txt': ['Amount', 'Foo']}}, response['outputs'])
+
+    def test_requests_for_same_roots_share_session(self):
+        # Arrange:
+        daemon = GenerationDaemon()
+        daemon.handle(self._request(['foo.cats']))
+        session = daemon.sessions[((self._path('foo.cats'),), self.directory, False)]
+
+        # Act:
+        daemon.handle(self._request(['foo.cats']))
+
+        # Assert:
+        self.assertEqual([session], list(daemon.sessions.values()))
+
+    def test_least_recently_used_sessions_are_evicted(self):
+        # Arrange:
+        daemon = GenerationDaemon(max_sessions=2)
+
+        # Act:
+        for filenames in [['foo.cats'], ['bar.cats'], ['foo.cats'], ['base.cats']]:
+            daemon.handle(self._request(filenames))
+
+        # Assert:
+        self.assertEqual([(self._path('foo.cats'),), (self._path('base.cats'),)], [key[0] for key in daemon.sessions])
+
+    def test_request_with_unknown_generator_is_rejected(self):
+        # Arrange:
+        daemon = GenerationDaemon()
+
+        # Act + Assert:
+        with self.assertRaises(ValueError):
+            daemon.handle(self._request(['foo.cats'], ['test_daemon_unknown']))
+
+
+class DaemonServerTest(DaemonTestBase):
+    def setUp(self):
+        super().setUp()
+        self.socket_path = self._path('daemon.sock')
+        self.server = DaemonServer(self.socket_path, GenerationDaemon())
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.server_thread.join()
+        super().tearDown()
+
+    def _request(self, filenames):
+        return {'schemas': [self._path(filename) for filename in filenames], 'include': self.directory, 'generators': [TEST_GENERATOR_NAME]}
+
+    def test_requests_are_answered_over_socket(self):
+        # Act:
+        response = send_request(self.socket_path, self._request(['foo.cats']))
+
+        # Assert:
+        self.assertEqual({
+            'errors': {},
+            'problems': {TEST_GENERATOR_NAME: []},
+            'outputs': {TEST_GENERATOR_NAME: {'names.txt': ['Amount', 'Foo']}}
+        }, response)
+        self.assertEqual(0, os.stat(self.socket_path).st_mode & 0o077)
+
+    def test_invalid_requests_are_answered_with_error(self):
+        # Act:
+        response = send_request(self.socket_path, {'schemas': []})
+
+        # Assert:
+        self.assertEqual(['error'], list(response))
+
+    def test_concurrent_requests_are_answered_consistently(self):
+        # Arrange:
+        requests = [self._request(['foo.cats']), self._request(['bar.cats'])] * 8
+
+        # Act:
+        with ThreadPoolExecutor(8) as executor:
+            responses = list(executor.map(lambda request: send_request(self.socket_path, request), requests))
+
+        # Assert:
+        for index, response in enumerate(responses):
+            expected_names = ['Amount', 'Foo'] if 0 == index % 2 else ['Bar']
+            self.assertEqual({
+                'errors': {},
+                'problems': {TEST_GENERATOR_NAME: []},
+                'outputs': {TEST_GENERATOR_NAME: {'names.txt': expected_names}}
+            }, response)
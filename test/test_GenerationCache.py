@@ -0,0 +1,180 @@
+# pylint: disable=invalid-name
+import os
+import sys
+import unittest
+from test.FileTestUtils import TempDirectoryTestCase
+from generators.cpp_builder.BuilderGenerator import BuilderGenerator
+from generators.Descriptor import Descriptor
+from generators.GenerationCache import GenerationCache, generator_version, unit_inputs_digest
+from generators.ParallelGenerator import generate_descriptors
+
+
+class CountingGenerator:
+    """Generator producing one file per schema entry and counting generated units"""
+    generated_units = []
+
+    def __init__(self, schema, options):
+        self.schema = schema
+        self.options = options
+
+    def __iter__(self):
+        return iter([descriptor for unit in self.generation_units() for descriptor in self.generate_unit(unit)])
+
+    def generation_units(self):
+        return list(self.schema)
+
+    def generate_unit(self, name):
+        CountingGenerator.generated_units.append(name)
+        return [Descriptor('{0}.h'.format(name), ['{0} = {1}'.format(name, self.schema[name])])]
+
+    def unit_cache_inputs(self, name):
+        return {'value': self.schema[name]}
+
+
+class DependentGenerator(CountingGenerator):
+    """Generator depending on a module outside of its package"""
+    @staticmethod
+    def source_modules():
+        return ['generation_cache_test_dependency']
+
+
+class GenerationCacheTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_directory = self._path('generation')
+        CountingGenerator.generated_units = []
+
+    def _generate(self, schema, cache, jobs=None):
+        descriptors = generate_descriptors(CountingGenerator, schema, {}, jobs, cache)
+        return [(descriptor.filename, list(descriptor.code)) for descriptor in descriptors]
+
+    def test_cold_run_generates_and_stores_all_units(self):
+        # Arrange:
+        cache = GenerationCache(self.cache_directory)
+
+        # Act:
+        descriptors = self._generate({'Foo': 1, 'Bar': 2}, cache)
+
+        # Assert:
+        self.assertEqual([('Foo.h', ['Foo = 1']), ('Bar.h', ['Bar = 2'])], descriptors)
+        self.assertEqual(['Foo', 'Bar'], CountingGenerator.generated_units)
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+        self.assertEqual(2, len(os.listdir(self.cache_directory)))
+
+    def test_warm_run_replays_unchanged_units(self):
+        # Arrange:
+        self._generate({'Foo': 1, 'Bar': 2, 'Baz': 3}, GenerationCache(self.cache_directory))
+        CountingGenerator.generated_units = []
+        cache = GenerationCache(self.cache_directory)
+
+        # Act:
+        descriptors = self._generate({'Foo': 1, 'Bar': 7, 'Baz': 3}, cache)
+
+        # Assert: only the changed unit is generated, but outputs are in unit order
+        self.assertEqual([('Foo.h', ['Foo = 1']), ('Bar.h', ['Bar = 7']), ('Baz.h', ['Baz = 3'])], descriptors)
+        self.assertEqual(['Bar'], CountingGenerator.generated_units)
+        self.assertEqual((2, 1), (cache.hits, cache.misses))
+        self.assertEqual('generation cache: 2 hit(s), 1 miss(es)', cache.statistics())
+
+    def test_parallel_run_uses_cache(self):
+        # Arrange:
+        schema = {'Type{0}'.format(index): index for index in range(6)}
+        self._generate({name: value for name, value in schema.items() if value % 2}, GenerationCache(self.cache_directory))
+        cache = GenerationCache(self.cache_directory)
+
+        # Act:
+        descriptors = self._generate(schema, cache, 2)
+
+        # Assert:
+        self.assertEqual([('Type{0}.h'.format(index), ['Type{0} = {0}'.format(index)]) for index in range(6)], descriptors)
+        self.assertEqual((3, 3), (cache.hits, cache.misses))
+
+    def test_corrupt_entry_is_miss(self):
+        # Arrange:
+        cache = GenerationCache(self.cache_directory)
+        self._generate({'Foo': 1}, cache)
+        for filename in os.listdir(self.cache_directory):
+            with open(os.path.join(self.cache_directory, filename), 'wb') as output_file:
+                output_file.write(b'corrupt')
+
+        # Act:
+        descriptors = self._generate({'Foo': 1}, cache)
+
+        # Assert:
+        self.assertEqual([('Foo.h', ['Foo = 1'])], descriptors)
+        self.assertEqual((0, 2), (cache.hits, cache.misses))
+
+    def test_key_depends_on_unit_inputs(self):
+        # Arrange:
+        cache = GenerationCache(self.cache_directory)
+
+        # Act:
+        key1 = cache.unit_key(CountingGenerator({'Foo': 1}, {}), 'Foo')
+        key2 = cache.unit_key(CountingGenerator({'Foo': 1, 'Bar': 2}, {}), 'Foo')
+        key3 = cache.unit_key(CountingGenerator({'Foo': 2}, {}), 'Foo')
+
+        # Assert:
+        self.assertEqual(key1, key2)
+        self.assertNotEqual(key1, key3)
+
+    def test_version_depends_on_declared_source_modules(self):
+        # Arrange:
+        self._write('generation_cache_test_dependency.py', ['VALUE = 1'])
+        sys.path.insert(0, self.directory)
+        try:
+            # Act:
+            version1 = generator_version(DependentGenerator)
+            self._write('generation_cache_test_dependency.py', ['VALUE = 2'])
+            version2 = generator_version(DependentGenerator)
+        finally:
+            sys.path.remove(self.directory)
+            sys.modules.pop('generation_cache_test_dependency', None)
+
+        # Assert:
+        self.assertNotEqual(version1, version2)
+
+
+def _builder_schema(embedded_name='EmbeddedFooTransaction'):
+    return {
+        'Amount': {'type': 'byte', 'size': 8, 'signedness': 'unsigned'},
+        'Unrelated': {'type': 'byte', 'size': 4, 'signedness': 'unsigned'},
+        'Transaction': {'type': 'struct', 'layout': [{'name': 'size', 'type': 'byte', 'size': 4}]},
+        'EmbeddedTransaction': {'type': 'struct', 'layout': [{'name': 'size', 'type': 'byte', 'size': 4}]},
+        'FooTransactionBody': {'type': 'struct', 'layout': [{'name': 'amount', 'type': 'Amount'}]},
+        'FooTransaction': {'type': 'struct', 'layout': [
+            {'type': 'Transaction', 'disposition': 'inline'},
+            {'type': 'FooTransactionBody', 'disposition': 'inline'}
+        ]},
+        embedded_name: {'type': 'struct', 'layout': [
+            {'type': 'EmbeddedTransaction', 'disposition': 'inline'},
+            {'type': 'FooTransactionBody', 'disposition': 'inline'}
+        ]}
+    }
+
+
+class BuilderGeneratorCacheInputsTest(unittest.TestCase):
+    def test_cache_inputs_contain_reachable_types(self):
+        # Arrange:
+        generator = BuilderGenerator(_builder_schema(), {'copyright': 'missing_copyright_file'})
+
+        # Act:
+        inputs = generator.unit_cache_inputs('FooTransaction')
+
+        # Assert:
+        self.assertEqual({'Amount', 'Transaction', 'FooTransactionBody', 'FooTransaction'}, set(inputs['types'].keys()))
+        self.assertEqual('EmbeddedFooTransaction', inputs['transaction']['embedded'])
+        self.assertEqual({}, dict(inputs['hints']))
+        self.assertIsNone(inputs['copyright'])
+
+    def test_key_depends_on_embedded_transaction_name(self):
+        # Arrange: the header names the embedded transaction, which is not reachable from the transaction
+        options = {'copyright': 'missing_copyright_file'}
+        generator1 = BuilderGenerator(_builder_schema(), options)
+        generator2 = BuilderGenerator(_builder_schema('EmbeddedFooTransactionV2'), options)
+
+        # Act:
+        digest1 = unit_inputs_digest('version', generator1, 'FooTransaction')
+        digest2 = unit_inputs_digest('version', generator2, 'FooTransaction')
+
+        # Assert:
+        self.assertNotEqual(digest1, digest2)
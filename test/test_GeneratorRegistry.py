@@ -0,0 +1,95 @@
+# pylint: disable=invalid-name
+# pylint: disable=too-few-public-methods
+import unittest
+from generators.GeneratorRegistry import GeneratorRegistry, installed_entry_points
+
+MISSING_GROUP = 'catbuffer.test.missing_generators'
+
+
+class FooGenerator:
+    pass
+
+
+class BarGenerator:
+    pass
+
+
+class GeneratorRegistryTest(unittest.TestCase):
+    def test_builtin_generator_is_resolved_by_name(self):
+        # Arrange:
+        registry = GeneratorRegistry({'foo': 'test.test_GeneratorRegistry:FooGenerator'}, MISSING_GROUP)
+
+        # Act:
+        generator_class = registry['foo']
+
+        # Assert:
+        self.assertIs(FooGenerator, generator_class)
+        self.assertEqual(['foo'], registry.builtin_names())
+
+    def test_generator_is_only_loaded_when_looked_up(self):
+        # Arrange:
+        loaded_names = []
+        registry = GeneratorRegistry({}, MISSING_GROUP)
+        registry.register('foo', lambda: loaded_names.append('foo') or FooGenerator)
+        registry.register('bar', lambda: loaded_names.append('bar') or BarGenerator)
+
+        # Act:
+        is_foo_known = 'foo' in registry
+        generator_class1 = registry['bar']
+        generator_class2 = registry['bar']
+
+        # Assert:
+        self.assertTrue(is_foo_known)
+        self.assertIs(BarGenerator, generator_class1)
+        self.assertIs(BarGenerator, generator_class2)
+        self.assertEqual(['bar'], loaded_names)
+
+    def test_registered_generator_replaces_generator_with_same_name(self):
+        # Arrange:
+        registry = GeneratorRegistry({'foo': 'test.test_GeneratorRegistry:FooGenerator'}, MISSING_GROUP)
+        registry['foo']  # pylint: disable=pointless-statement
+
+        # Act:
+        registry.register('foo', lambda: BarGenerator)
+
+        # Assert:
+        self.assertIs(BarGenerator, registry['foo'])
+
+    def test_unregistered_generator_is_not_found(self):
+        # Arrange:
+        registry = GeneratorRegistry({'foo': 'test.test_GeneratorRegistry:FooGenerator'}, MISSING_GROUP)
+        registry.register('bar', lambda: BarGenerator)
+        registry['bar']  # pylint: disable=pointless-statement
+
+        # Act:
+        registry.unregister('bar')
+
+        # Assert:
+        self.assertFalse('bar' in registry)
+        self.assertEqual(['foo'], list(registry))
+
+    def test_unknown_generator_is_not_found(self):
+        # Arrange:
+        registry = GeneratorRegistry({'foo': 'test.test_GeneratorRegistry:FooGenerator'}, MISSING_GROUP)
+
+        # Act + Assert:
+        self.assertFalse('bar' in registry)
+        with self.assertRaises(KeyError):
+            registry['bar']  # pylint: disable=pointless-statement
+
+    def test_registry_is_mapping_of_all_generators(self):
+        # Arrange:
+        registry = GeneratorRegistry({'foo': 'test.test_GeneratorRegistry:FooGenerator'}, MISSING_GROUP)
+        registry.register('bar', lambda: BarGenerator)
+
+        # Act + Assert:
+        self.assertEqual(['foo', 'bar'], list(registry))
+        self.assertEqual(2, len(registry))
+        self.assertEqual({'foo': FooGenerator, 'bar': BarGenerator}, dict(registry))
+
+    def test_no_entry_points_are_installed_for_unknown_group(self):
+        # Act:
+        entry_points = installed_entry_points(MISSING_GROUP)
+
+        # Assert:
+        self.assertEqual({}, entry_points)
@@ -0,0 +1,139 @@
+# pylint: disable=invalid-name
+from test.FileTestUtils import TempDirectoryTestCase
+from generators.cpp_builder.HintsRegistry import HINT_NAMES, HintsRegistry, shared_hints_registry
+
+HINT_FILES = {
+    'includes': ['FooTransaction:', '  - foo/Generator.h'],
+    'namespaces': ['FooTransaction:', '  Amount: model', '  Unknown: model'],
+    'plugin': ['FooTransaction: foo', 'BarTransaction: bar'],
+    'rewrites': ['FooTransaction:', '  Amount: Header.Amount', '  Missing: Header.Missing'],
+    'setters': ['FooTransaction:', '  amount: m_amount', '  missing: m_missing']
+}
+
+SCHEMA = {
+    'Amount': {'type': 'byte', 'size': 8, 'signedness': 'unsigned'},
+    'Transaction': {'type': 'struct', 'layout': []},
+    'FooTransactionBody': {'type': 'struct', 'layout': [{'name': 'amount', 'type': 'Amount'}]},
+    'FooTransaction': {'type': 'struct', 'layout': [
+        {'type': 'Transaction', 'disposition': 'inline'},
+        {'type': 'FooTransactionBody', 'disposition': 'inline'}
+    ]},
+    'BazTransaction': {'type': 'struct', 'layout': []}
+}
+
+
+class HintsRegistryTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        for hint_name in HINT_NAMES:
+            self._write('{0}.yaml'.format(hint_name), HINT_FILES[hint_name])
+
+    def test_hints_are_grouped_by_transaction(self):
+        # Act:
+        registry = HintsRegistry(self.directory)
+
+        # Assert:
+        self.assertEqual(['FooTransaction', 'BarTransaction'], registry.transaction_names())
+        self.assertEqual({
+            'includes': ['foo/Generator.h'],
+            'namespaces': {'Amount': 'model', 'Unknown': 'model'},
+            'plugin': 'foo',
+            'rewrites': {'Amount': 'Header.Amount', 'Missing': 'Header.Missing'},
+            'setters': {'amount': 'm_amount', 'missing': 'm_missing'}
+        }, dict(registry.view('FooTransaction')))
+        self.assertEqual({'plugin': 'bar'}, dict(registry.view('BarTransaction')))
+
+    def test_view_of_transaction_without_hints_is_empty(self):
+        # Act:
+        view = HintsRegistry(self.directory).view('BazTransaction')
+
+        # Assert:
+        self.assertEqual({}, dict(view))
+
+    def test_plugins_contain_plugin_hints_of_all_transactions(self):
+        # Act:
+        plugins = HintsRegistry(self.directory).plugins()
+
+        # Assert:
+        self.assertEqual({'FooTransaction': 'foo', 'BarTransaction': 'bar'}, plugins)
+
+    def test_view_is_read_only(self):
+        # Arrange:
+        view = HintsRegistry(self.directory).view('FooTransaction')
+
+        # Act + Assert:
+        with self.assertRaises(TypeError):
+            view['plugin'] = 'bar'
+
+    def test_hints_can_be_loaded_with_pure_python_loader(self):
+        # Act:
+        registry = HintsRegistry(self.directory, use_c_loader=False)
+
+        # Assert:
+        self.assertEqual(dict(HintsRegistry(self.directory).view('FooTransaction')), dict(registry.view('FooTransaction')))
+
+    def test_validate_flags_hints_that_do_not_match_schema(self):
+        # Arrange:
+        registry = HintsRegistry(self.directory)
+
+        # Act:
+        problems = registry.validate(SCHEMA)
+
+        # Assert:
+        self.assertEqual([
+            'setters hint for unknown field "missing" of transaction "FooTransaction"',
+            'rewrites hint for unknown field "Missing" of transaction "FooTransaction"',
+            'namespaces hint for unknown type "Unknown" of transaction "FooTransaction"',
+            'hints for unknown transaction "BarTransaction"'
+        ], problems)
+
+    def test_validate_can_check_specific_transactions(self):
+        # Arrange:
+        registry = HintsRegistry(self.directory)
+
+        # Act:
+        problems = registry.validate(SCHEMA, ['BazTransaction'])
+
+        # Assert:
+        self.assertEqual(['missing plugin hint for transaction "BazTransaction"'], problems)
+
+    def test_validate_checks_fields_of_body_inlined_by_transaction(self):
+        # Arrange: the body name does not follow the <transaction>Body convention
+        registry = HintsRegistry(self.directory)
+        schema = dict(SCHEMA)
+        schema['FooBody'] = schema.pop('FooTransactionBody')
+        schema['FooTransaction'] = {'type': 'struct', 'layout': [
+            {'type': 'Transaction', 'disposition': 'inline'},
+            {'type': 'FooBody', 'disposition': 'inline'}
+        ]}
+
+        # Act:
+        problems = registry.validate(schema, ['FooTransaction'])
+
+        # Assert:
+        self.assertEqual([
+            'setters hint for unknown field "missing" of transaction "FooTransaction"',
+            'rewrites hint for unknown field "Missing" of transaction "FooTransaction"',
+            'namespaces hint for unknown type "Unknown" of transaction "FooTransaction"'
+        ], problems)
+
+    def test_shared_registry_is_loaded_once(self):
+        # Act:
+        registry1 = shared_hints_registry(self.directory)
+        registry2 = shared_hints_registry(self.directory)
+
+        # Assert:
+        self.assertIs(registry1, registry2)
+        self.assertIsNot(registry1, shared_hints_registry())
+
+    def test_shared_registry_is_reloaded_when_hint_file_changes(self):
+        # Arrange:
+        registry1 = shared_hints_registry(self.directory)
+        self._write('plugin.yaml', ['FooTransaction: foo', 'BazTransaction: baz'])
+
+        # Act:
+        registry2 = shared_hints_registry(self.directory)
+
+        # Assert:
+        self.assertIsNot(registry1, registry2)
+        self.assertEqual({'plugin': 'baz'}, dict(registry2.view('BazTransaction')))
@@ -0,0 +1,146 @@
+# pylint: disable=invalid-name
+import unittest
+from test.ParserTestUtils import parse_all
+from catparser.CatsParseException import CatsParseException
+from catparser.LayoutResolver import LayoutResolver
+
+SCHEMA_LINES = [
+    'using Key = binary_fixed(32)',
+    'using Amount = uint64',
+    'enum EntityType : uint16',
+    '\treserved = 0',
+    'enum Shape : uint8',
+    '\tcircle = 4',
+    '\trectangle = 9',
+    'struct SizePrefixedEntity',
+    '\tsize = uint32',
+    'struct EntityBody',
+    '\tsigner = Key',
+    '\ttype = EntityType',
+    'struct Entity',
+    '\tinline SizePrefixedEntity',
+    '\tinline EntityBody',
+    'struct Mosaic',
+    '\tid = uint64',
+    '\tamount = Amount',
+    'struct Body',
+    '\tmosaic = Mosaic',
+    '\tmessageSize = uint16',
+    '\tmosaicsCount = uint8',
+    '\tmessage = array(byte, messageSize)',
+    '\tmosaics = array(Mosaic, mosaicsCount)',
+    'struct Transfer',
+    '\tconst uint8 version = 3',
+    '\tinline Entity',
+    '\tinline Body',
+    'struct Shaped',
+    '\tshape = Shape',
+    '\tradius = uint16 if shape equals circle',
+    '\twidth = uint32'
+]
+
+
+def field_offsets(struct_layout):
+    return [(field.name, field.offset, field.size) for field in struct_layout.fields]
+
+
+class LayoutResolverTest(unittest.TestCase):
+    def setUp(self):
+        self.resolver = LayoutResolver(parse_all(SCHEMA_LINES))
+
+    def test_can_resolve_sizes_of_aliases_enums_and_structs(self):
+        # Act + Assert:
+        self.assertEqual(32, self.resolver.type_size('Key'))
+        self.assertEqual(8, self.resolver.type_size('Amount'))
+        self.assertEqual(2, self.resolver.type_size('EntityType'))
+        self.assertEqual(16, self.resolver.type_size('Mosaic'))
+        self.assertEqual(None, self.resolver.type_size('Body'))
+
+    def test_inlined_structs_are_flattened_recursively(self):
+        # Act:
+        struct_layout = self.resolver.struct_layout('Entity')
+
+        # Assert:
+        self.assertEqual([('size', 0, 4), ('signer', 4, 32), ('type', 36, 2)], field_offsets(struct_layout))
+        self.assertEqual((38, 38), (struct_layout.fixed_size, struct_layout.size))
+
+    def test_struct_with_arrays_has_fixed_prefix_and_variable_tail(self):
+        # Act:
+        struct_layout = self.resolver.struct_layout('Transfer')
+
+        # Assert:
+        self.assertEqual([
+            ('size', 0, 4), ('signer', 4, 32), ('type', 36, 2), ('mosaic', 38, 16), ('messageSize', 54, 2), ('mosaicsCount', 56, 1),
+            ('message', None, None), ('mosaics', None, None)
+        ], field_offsets(struct_layout))
+        self.assertEqual((57, None), (struct_layout.fixed_size, struct_layout.size))
+        self.assertEqual(['message', 'mosaics'], [field.name for field in struct_layout.tail])
+        self.assertEqual(6, len(struct_layout.prefix))
+
+    def test_array_fields_have_element_size_and_count(self):
+        # Act:
+        struct_layout = self.resolver.struct_layout('Transfer')
+
+        # Assert:
+        self.assertEqual((1, 'messageSize'), (struct_layout.field('message').element_size, struct_layout.field('message').count))
+        self.assertEqual((16, 'mosaicsCount'), (struct_layout.field('mosaics').element_size, struct_layout.field('mosaics').count))
+        self.assertEqual((None, None), (struct_layout.field('mosaic').element_size, struct_layout.field('mosaic').count))
+
+    def test_constants_are_not_part_of_layout(self):
+        # Act:
+        struct_layout = self.resolver.struct_layout('Transfer')
+
+        # Assert:
+        self.assertEqual([('version', 3)], [(constant['name'], constant['value']) for constant in struct_layout.constants])
+        with self.assertRaises(KeyError):
+            struct_layout.field('version')
+
+    def test_conditional_fields_start_tail(self):
+        # Act:
+        struct_layout = self.resolver.struct_layout('Shaped')
+
+        # Assert:
+        self.assertEqual([('shape', 0, 1), ('radius', None, 2), ('width', None, 4)], field_offsets(struct_layout))
+        self.assertEqual(('shape', 'circle'), struct_layout.field('radius').condition)
+        self.assertEqual((1, None), (struct_layout.fixed_size, struct_layout.size))
+
+    def test_layouts_are_memoized(self):
+        # Arrange:
+        entity_layout = self.resolver.struct_layout('Entity')
+
+        # Act:
+        self.resolver.struct_layout('Transfer')
+
+        # Assert:
+        self.assertIs(entity_layout, self.resolver.struct_layout('Entity'))
+        self.assertEqual({'SizePrefixedEntity', 'EntityBody', 'Entity', 'Mosaic', 'Body', 'Transfer'}, set(self.resolver.layouts))
+
+    def test_can_resolve_layouts_of_all_structs(self):
+        # Act:
+        struct_names = [struct_layout.name for struct_layout in self.resolver.struct_layouts()]
+
+        # Assert:
+        self.assertEqual(['SizePrefixedEntity', 'EntityBody', 'Entity', 'Mosaic', 'Body', 'Transfer', 'Shaped'], struct_names)
+
+    def test_cannot_resolve_unknown_type(self):
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            self.resolver.type_size('Unknown')
+
+    def test_cannot_resolve_layout_of_non_struct(self):
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            self.resolver.struct_layout('Amount')
+
+    def test_cannot_resolve_struct_containing_itself(self):
+        # Arrange:
+        resolver = LayoutResolver({
+            'Foo': {'type': 'struct', 'layout': [{'disposition': 'inline', 'type': 'Bar'}]},
+            'Bar': {'type': 'struct', 'layout': [{'name': 'foo', 'type': 'Foo'}]}
+        })
+
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            resolver.struct_layout('Foo')
+
+        self.assertEqual(set(), resolver.pending_struct_names)
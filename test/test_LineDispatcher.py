@@ -0,0 +1,94 @@
+# pylint: disable=invalid-name
+import unittest
+from catparser.AliasParser import AliasParserFactory
+from catparser.CatsParseException import CatsParseException
+from catparser.EnumParser import EnumValueParserFactory
+from catparser.LineDispatcher import LineDispatcher, lex_keyword
+from catparser.StructParser import \
+    StructParserFactory, StructConstParserFactory, StructInlineParserFactory, StructArrayMemberParserFactory, \
+    StructScalarMemberParserFactory
+
+
+class LexKeywordTest(unittest.TestCase):
+    def test_leading_word_is_keyword(self):
+        for line, keyword in [
+                ('struct Foo', 'struct'),
+                ('enum Foo : uint8', 'enum'),
+                ('using Foo = uint8', 'using'),
+                ('import "foo bar.cats"', 'import'),
+                ('const uint8 foo = 12', 'const'),
+                ('inline Foo', 'inline'),
+                ('struct', 'struct')
+        ]:
+            # Act + Assert:
+            self.assertEqual(keyword, lex_keyword(line))
+
+    def test_assignment_is_keyword(self):
+        for line in ['foo = bar', 'foo = bar if baz equals qux', 'struct = uint8', 'inline = Foo', 'foo = arrays']:
+            # Act + Assert:
+            self.assertEqual('=', lex_keyword(line))
+
+    def test_array_assignment_is_keyword(self):
+        for line in ['foo = array(Bar, 10)', 'foo = array(Bar, barCount, sort_key=baz)', 'const = array(Bar, 10)']:
+            # Act + Assert:
+            self.assertEqual('array', lex_keyword(line))
+
+
+class LineDispatcherTest(unittest.TestCase):
+    @staticmethod
+    def _create_struct_member_dispatcher():
+        return LineDispatcher([
+            StructConstParserFactory(),
+            StructInlineParserFactory(),
+            StructArrayMemberParserFactory(),
+            StructScalarMemberParserFactory()
+        ])
+
+    def _assert_dispatch(self, dispatcher, line, expected_factory_type, expected_groups):
+        # Act:
+        factory, match = dispatcher.dispatch(line)
+
+        # Assert:
+        self.assertIsInstance(factory, expected_factory_type)
+        self.assertEqual(expected_groups, match.groups())
+
+    def test_can_dispatch_struct_members(self):
+        # Arrange:
+        dispatcher = self._create_struct_member_dispatcher()
+
+        # Act + Assert:
+        self._assert_dispatch(dispatcher, 'const uint8 foo = 12', StructConstParserFactory, ('uint8', 'foo', '12'))
+        self._assert_dispatch(dispatcher, 'inline Foo', StructInlineParserFactory, ('Foo',))
+        self._assert_dispatch(dispatcher, 'foo = array(Bar, 10)', StructArrayMemberParserFactory, ('foo', 'Bar', '10', None, None))
+        self._assert_dispatch(dispatcher, 'foo = Bar', StructScalarMemberParserFactory, ('foo', 'Bar', None, None, None))
+
+    def test_can_dispatch_keyword_named_struct_members(self):
+        # Arrange:
+        dispatcher = self._create_struct_member_dispatcher()
+
+        # Act + Assert:
+        self._assert_dispatch(dispatcher, 'const = Bar', StructScalarMemberParserFactory, ('const', 'Bar', None, None, None))
+        self._assert_dispatch(dispatcher, 'inline = array(Bar, 10)', StructArrayMemberParserFactory, ('inline', 'Bar', '10', None, None))
+
+    def test_cannot_dispatch_line_without_registered_keyword(self):
+        # Arrange:
+        dispatcher = LineDispatcher([AliasParserFactory(), StructParserFactory()])
+
+        # Act + Assert:
+        for line in ['enum Foo : uint8', 'foo = bar', 'alias Foo = uint8']:
+            with self.assertRaises(CatsParseException):
+                dispatcher.dispatch(line)
+
+    def test_cannot_dispatch_line_not_matching_keyword_factory(self):
+        # Arrange:
+        dispatcher = LineDispatcher([AliasParserFactory(), EnumValueParserFactory()])
+
+        # Act + Assert:
+        for line in ['using Foo = uint8 uint8', 'using Foo', 'foo = bar if baz equals qux']:
+            with self.assertRaises(CatsParseException):
+                dispatcher.dispatch(line)
+
+    def test_cannot_register_multiple_factories_for_same_keyword(self):
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            LineDispatcher([StructScalarMemberParserFactory(), EnumValueParserFactory()])
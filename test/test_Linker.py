@@ -0,0 +1,80 @@
+# pylint: disable=invalid-name
+import unittest
+from catparser.CatsParseException import CatsParseException
+from catparser.Linker import Linker, ScopedLink
+
+TYPE_DESCRIPTORS = {
+    'Amount': {'type': 'byte', 'size': 8, 'signedness': 'unsigned'},
+    'Shape': {'type': 'enum', 'size': 1, 'signedness': 'unsigned', 'values': [{'name': 'circle', 'value': 1}]},
+    'Face': {'type': 'struct', 'layout': [{'type': 'Placeholder', 'disposition': 'inline'}, {'name': 'eyeColor', 'type': 'Shape'}]}
+}
+
+
+class LinkerTest(unittest.TestCase):
+    def test_can_resolve_valid_links(self):
+        # Arrange:
+        linker = Linker(TYPE_DESCRIPTORS)
+
+        # Act + Assert: no exception
+        for link in [
+                ('type', 'Amount'), ('type', 'byte'), ('type', 'Face'),
+                ('field', 'Face', 'eyeColor'),
+                ('enum_value', 'Shape', 'circle')
+        ]:
+            linker.resolve(link)
+
+    def test_cannot_resolve_invalid_links(self):
+        # Arrange:
+        linker = Linker(TYPE_DESCRIPTORS)
+
+        # Act + Assert:
+        for link in [
+                ('type', 'Fee'),
+                ('field', 'Fee', 'eyeColor'), ('field', 'Face', 'noseColor'), ('field', 'Amount', 'eyeColor'), ('field', 'byte', 'x'),
+                ('enum_value', 'Fee', 'circle'), ('enum_value', 'Amount', 'circle'), ('enum_value', 'Shape', 'square'),
+                ('enum_value', 'byte', 'circle')
+        ]:
+            with self.assertRaises(CatsParseException):
+                linker.resolve(link)
+
+    def test_link_returns_all_failures(self):
+        # Arrange:
+        linker = Linker(TYPE_DESCRIPTORS)
+        scoped_links = [
+            ScopedLink('a.cats', 1, ('type', 'Fee')),
+            ScopedLink('a.cats', 2, ('type', 'Amount')),
+            ScopedLink('b.cats', 3, ('enum_value', 'Shape', 'square'))
+        ]
+
+        # Act:
+        failures = linker.link(scoped_links)
+
+        # Assert:
+        self.assertEqual([scoped_links[0], scoped_links[2]], [scoped_link for scoped_link, _ in failures])
+
+    def test_link_skips_field_links_whose_type_link_failed(self):
+        # Arrange:
+        linker = Linker(TYPE_DESCRIPTORS)
+        scoped_links = [
+            ScopedLink('a.cats', 1, ('type', 'Fee')),
+            ScopedLink('a.cats', 1, ('field', 'Fee', 'weight')),
+            ScopedLink('a.cats', 2, ('field', 'Fee', 'weight'))
+        ]
+
+        # Act:
+        failures = linker.link(scoped_links)
+
+        # Assert: all links stay unresolved, but the skipped field link has no error
+        self.assertEqual(scoped_links, [scoped_link for scoped_link, _ in failures])
+        self.assertEqual([True, False, True], [ex is not None for _, ex in failures])
+
+    def test_link_skips_links_from_trusted_files(self):
+        # Arrange:
+        linker = Linker(TYPE_DESCRIPTORS)
+        scoped_links = [ScopedLink('a.cats', 1, ('type', 'Fee')), ScopedLink('b.cats', 1, ('type', 'Fee'))]
+
+        # Act:
+        failures = linker.link(scoped_links, lambda filename: 'a.cats' == filename)
+
+        # Assert:
+        self.assertEqual([scoped_links[1]], [scoped_link for scoped_link, _ in failures])
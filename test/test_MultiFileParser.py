@@ -0,0 +1,376 @@
+# pylint: disable=invalid-name
+from test.FileTestUtils import TempDirectoryTestCase
+from catparser.CatsParseException import CatsParseException
+from catparser.MultiFileParser import MultiFileParser, canonicalize_path
+
+
+class MultiFileParserTestBase(TempDirectoryTestCase):
+    def _create_parser(self):
+        parser = MultiFileParser()
+        parser.set_include_path(self.directory)
+        return parser
+
+    def _write_diamond_schemas(self):
+        # Arrange: left and right both import shared
+        self._write('shared.cats', ['using Amount = uint64'])
+        self._write('left.cats', ['import "shared.cats"', 'struct Left', '\tamount = Amount'])
+        self._write('right.cats', ['import "shared.cats"', 'struct Right', '\tamount = Amount'])
+
+    def _canonical_paths(self, filenames):
+        return {canonicalize_path(self._path(filename)) for filename in filenames}
+
+
+class MultiFileParserTest(MultiFileParserTestBase):
+    def test_can_parse_file_with_imports(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        parser = self._create_parser()
+
+        # Act:
+        parser.parse(self._path('left.cats'))
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual(['Amount', 'Left'], list(type_descriptors.keys()))
+
+    def test_shared_import_is_parsed_once_across_roots(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        parser = self._create_parser()
+
+        # Act:
+        parser.parse(self._path('left.cats'))
+        parser.parse(self._path('right.cats'))
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual(['Amount', 'Left', 'Right'], list(type_descriptors.keys()))
+
+    def test_shared_import_is_parsed_once_within_root(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        root_path = self._write('root.cats', ['import "left.cats"', 'import "right.cats"'])
+        parser = self._create_parser()
+
+        # Act:
+        parser.parse(root_path)
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual(['Amount', 'Left', 'Right'], list(type_descriptors.keys()))
+
+    def test_import_paths_are_canonicalized(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        self._write('sub/other.cats', ['import "sub/../shared.cats"', 'import "./shared.cats"'])
+        parser = self._create_parser()
+
+        # Act:
+        parser.parse(self._path('left.cats'))
+        parser.parse(self._path('sub/other.cats'))
+
+        # Assert:
+        self.assertEqual(3, len(parser.import_graph))
+        self.assertEqual(['Amount', 'Left'], list(parser.cats_parser.type_descriptors().keys()))
+
+    def test_import_graph_is_recorded(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        root_path = self._write('root.cats', ['import "left.cats"', 'import "right.cats"'])
+        parser = self._create_parser()
+
+        # Act:
+        parser.parse(root_path)
+
+        # Assert:
+        def canonical_path(filename):
+            return canonicalize_path(self._path(filename))
+
+        self.assertEqual([
+            (canonical_path('root.cats'), [canonical_path('left.cats'), canonical_path('right.cats')]),
+            (canonical_path('left.cats'), [canonical_path('shared.cats')]),
+            (canonical_path('shared.cats'), []),
+            (canonical_path('right.cats'), [canonical_path('shared.cats')])
+        ], list(parser.import_graph.items()))
+        self.assertTrue(parser.is_parsed(root_path))
+        self.assertFalse(parser.is_parsed(self._path('other.cats')))
+
+    def test_cannot_parse_circular_imports(self):
+        # Arrange:
+        self._write('foo.cats', ['import "bar.cats"'])
+        self._write('bar.cats', ['import "foo.cats"'])
+        parser = self._create_parser()
+
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            parser.parse(self._path('foo.cats'))
+
+    def test_deferred_linking_allows_references_to_types_imported_later(self):
+        # Arrange:
+        self._write('shared.cats', ['using Amount = uint64'])
+        root_path = self._write('root.cats', ['struct Root', '\tamount = Amount', 'import "shared.cats"'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+
+        # Act:
+        parser.parse(root_path)
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual(['Root', 'Amount'], list(type_descriptors.keys()))
+
+    def test_deferred_linking_reports_unresolved_links_with_location(self):
+        # Arrange:
+        root_path = self._write('root.cats', ['struct Root', '\tamount = Amount'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+        parser.parse(root_path)
+
+        # Act + Assert:
+        with self.assertRaisesRegex(CatsParseException, 'root.cats:2: no definition for linked type "Amount"'):
+            parser.cats_parser.type_descriptors()
+
+    def test_links_of_trusted_files_are_not_resolved(self):
+        # Arrange: validate a schema once
+        root_path = self._write('root.cats', ['struct Root', '\tamount = Amount', 'using Amount = uint64'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+        parser.parse(root_path)
+        validated_digests = parser.validated_digests()
+
+        # - make the trusted file reference a type that does not exist
+        self._write('other.cats', ['import "root.cats"', 'struct Other', '\tfee = Fee'])
+        trusting_parser = MultiFileParser(deferred_linking=True, trusted_digests=validated_digests)
+        trusting_parser.set_include_path(self.directory)
+        trusting_parser.parse(self._path('other.cats'))
+
+        # Act + Assert: only the untrusted file is linked
+        with self.assertRaisesRegex(CatsParseException, '^[^\n]*other.cats:3: no definition for linked type "Fee"$'):
+            trusting_parser.cats_parser.link()
+
+        self.assertEqual(1, len(trusting_parser.cats_parser.linker.unresolved_links))
+
+    def test_links_of_trusted_files_are_resolved_when_imported_file_changes(self):
+        # Arrange: validate a schema once
+        self._write('types.cats', ['using A = uint8', 'using B = uint8'])
+        root_path = self._write('root.cats', ['import "types.cats"', 'struct Foo', '\tx = A'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+        parser.parse(root_path)
+        validated_digests = parser.validated_digests()
+
+        # - remove the linked type from the imported file only
+        self._write('types.cats', ['using B = uint8'])
+        trusting_parser = MultiFileParser(deferred_linking=True, trusted_digests=validated_digests)
+        trusting_parser.set_include_path(self.directory)
+        trusting_parser.parse(root_path)
+
+        # Act + Assert:
+        with self.assertRaisesRegex(CatsParseException, 'root.cats:3: no definition for linked type "A"'):
+            trusting_parser.cats_parser.link()
+
+    # region parse_all
+
+    def test_parse_all_parses_all_roots_into_single_type_set(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        parser = self._create_parser()
+
+        # Act:
+        errors = parser.parse_all([self._path(filename) for filename in ('left.cats', 'right.cats')])
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual({}, errors)
+        self.assertEqual(['Amount', 'Left', 'Right'], list(type_descriptors.keys()))
+
+    def test_parse_all_reports_errors_per_root_and_discards_failed_roots(self):
+        # Arrange: broken imports shared (which is parsed successfully) and an undefined type
+        self._write_diamond_schemas()
+        self._write('other.cats', ['using Fee = uint64'])
+        self._write('broken.cats', ['import "other.cats"', 'import "shared.cats"', 'struct Broken', '\tfee = Unknown'])
+        parser = self._create_parser()
+        filenames = [self._path(filename) for filename in ('left.cats', 'broken.cats', 'right.cats')]
+
+        # Act:
+        errors = parser.parse_all(filenames)
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert: error matches the one raised by parsing the root on its own
+        self.assertEqual([filenames[1]], list(errors.keys()))
+        with self.assertRaises(CatsParseException) as context:
+            self._create_parser().parse(filenames[1])
+
+        self.assertEqual(str(context.exception), str(errors[filenames[1]]))
+
+        # - types of files first parsed by the failed root are discarded
+        self.assertEqual(['Amount', 'Left', 'Right'], list(type_descriptors.keys()))
+        self.assertEqual(self._canonical_paths(['left.cats', 'shared.cats', 'right.cats']), set(parser.import_graph))
+
+    def test_parse_all_reports_missing_import_with_its_filename(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        self._write('broken.cats', ['import "missing.cats"'])
+        parser = self._create_parser()
+        filenames = [self._path(filename) for filename in ('broken.cats', 'left.cats')]
+
+        # Act:
+        errors = parser.parse_all(filenames)
+
+        # Assert: the missing file is the innermost scope of the error and no scope is left over for later roots
+        self.assertEqual([filenames[0]], list(errors.keys()))
+        self.assertEqual(
+            ['{0}:0'.format(self._path('missing.cats')), '{0}:1'.format(filenames[0]), '<unknown>:0'],
+            str(errors[filenames[0]].args[0]).split('\n'))
+        self.assertEqual(0, parser.cats_parser.scope_depth())
+        self.assertEqual(['Amount', 'Left'], list(parser.cats_parser.type_descriptors().keys()))
+
+    def test_parse_all_reports_deferred_link_errors_per_root(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        self._write('broken.cats', ['struct Broken', '\tfee = Unknown'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+        filenames = [self._path(filename) for filename in ('left.cats', 'broken.cats')]
+
+        # Act:
+        errors = parser.parse_all(filenames)
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual([filenames[1]], list(errors.keys()))
+        self.assertEqual(['Amount', 'Left'], list(type_descriptors.keys()))
+
+    def test_parse_all_in_parallel_reports_deferred_link_errors_per_root(self):
+        # Arrange:
+        self._write_diamond_schemas()
+        self._write('broken.cats', ['struct Broken', '\tfee = Unknown'])
+        parser = MultiFileParser(deferred_linking=True)
+        parser.set_include_path(self.directory)
+        filenames = [self._path(filename) for filename in ('left.cats', 'broken.cats')]
+
+        # Act:
+        errors = parser.parse_all(filenames, 2)
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual([filenames[1]], list(errors.keys()))
+        self.assertIn('broken.cats:2: no definition for linked type "Unknown"', str(errors[filenames[1]]))
+        self.assertEqual(['Amount', 'Left'], list(type_descriptors.keys()))
+
+    # endregion
+
+
+class MultiFileParserReparseTest(MultiFileParserTestBase):
+    def _parse_diamond_root(self):
+        self._write_diamond_schemas()
+        self._write('other.cats', ['using Fee = uint32'])
+        root_path = self._write('root.cats', ['import "left.cats"', 'import "right.cats"', 'import "other.cats"'])
+        parser = self._create_parser()
+        parser.parse(root_path)
+        return parser
+
+    def _fresh_type_names(self):
+        parser = self._create_parser()
+        parser.parse(self._path('root.cats'))
+        return list(parser.cats_parser.type_descriptors())
+
+    def test_reparse_without_changes_reparses_nothing(self):
+        # Arrange:
+        parser = self._parse_diamond_root()
+        type_descriptors = dict(parser.cats_parser.type_descriptors())
+
+        # Act:
+        affected_files = parser.reparse()
+
+        # Assert:
+        self.assertEqual(set(), affected_files)
+        self.assertEqual(type_descriptors, parser.cats_parser.type_descriptors())
+
+    def test_reparse_reparses_changed_file_and_importers(self):
+        # Arrange:
+        parser = self._parse_diamond_root()
+        fee_descriptor = parser.cats_parser.type_descriptors()['Fee']
+        self._write('left.cats', ['import "shared.cats"', 'struct Left', '\tamount = Amount', '\tfee = Amount'])
+
+        # Act:
+        affected_files = parser.reparse()
+        type_descriptors = parser.cats_parser.type_descriptors()
+
+        # Assert:
+        self.assertEqual(self._canonical_paths(['left.cats', 'root.cats']), affected_files)
+        self.assertEqual(['amount', 'fee'], [field['name'] for field in type_descriptors['Left']['layout']])
+        self.assertEqual(['Amount', 'Left', 'Right', 'Fee'], list(type_descriptors.keys()))
+        self.assertEqual(self._fresh_type_names(), list(type_descriptors.keys()))
+        self.assertIs(fee_descriptor, type_descriptors['Fee'])
+
+    def test_reparse_keeps_order_of_types_defined_between_imports(self):
+        # Arrange: right defines a type before and after its import
+        parser = self._parse_diamond_root()
+        self._write('right.cats', ['using Head = uint8', 'import "shared.cats"', 'struct Right', '\tamount = Amount'])
+
+        # Act:
+        parser.reparse()
+        type_names = list(parser.cats_parser.type_descriptors())
+
+        # Assert:
+        self.assertEqual(['Amount', 'Left', 'Head', 'Right', 'Fee'], type_names)
+        self.assertEqual(self._fresh_type_names(), type_names)
+
+    def test_reparse_reparses_files_referencing_types_of_changed_file(self):
+        # Arrange: right uses Fee from other.cats without importing it
+        self._write_diamond_schemas()
+        self._write('other.cats', ['using Fee = uint32'])
+        self._write('right.cats', ['struct Right', '\tfee = Fee'])
+        root_path = self._write('root.cats', ['import "other.cats"', 'import "right.cats"'])
+        parser = self._create_parser()
+        parser.parse(root_path)
+        self._write('other.cats', ['using Fee = uint16'])
+
+        # Act:
+        affected_files = parser.reparse()
+
+        # Assert:
+        self.assertEqual(self._canonical_paths(['other.cats', 'right.cats', 'root.cats']), affected_files)
+        self.assertEqual(2, parser.cats_parser.type_descriptors()['Fee']['size'])
+
+    def test_reparse_can_reparse_explicit_files(self):
+        # Arrange:
+        parser = self._parse_diamond_root()
+
+        # Act:
+        affected_files = parser.reparse([self._path('shared.cats')])
+
+        # Assert:
+        self.assertEqual(self._canonical_paths(['shared.cats', 'left.cats', 'right.cats', 'root.cats']), affected_files)
+        self.assertEqual(self._fresh_type_names(), list(parser.cats_parser.type_descriptors().keys()))
+
+    def test_reparse_drops_files_that_are_no_longer_imported(self):
+        # Arrange:
+        parser = self._parse_diamond_root()
+        self._write('root.cats', ['import "left.cats"'])
+
+        # Act:
+        parser.reparse()
+
+        # Assert:
+        self.assertEqual(self._canonical_paths(['root.cats', 'left.cats', 'shared.cats']), set(parser.import_graph.keys()))
+        self.assertEqual({'Amount', 'Left'}, set(parser.cats_parser.type_descriptors().keys()))
+
+    def test_reparse_recovers_from_failed_parse(self):
+        # Arrange:
+        parser = self._parse_diamond_root()
+        self._write('right.cats', ['import "shared.cats"', 'struct Right', '\tamount = Amont'])
+        with self.assertRaises(CatsParseException):
+            parser.reparse()
+
+        self._write('right.cats', ['import "shared.cats"', 'struct Right', '\tamount = Amount', '\tsize = uint8'])
+
+        # Act:
+        parser.reparse()
+
+        # Assert:
+        self.assertEqual([], parser.active_files)
+        self.assertEqual(0, parser.cats_parser.scope_depth())
+        self.assertEqual({'Amount', 'Left', 'Right', 'Fee'}, set(parser.cats_parser.type_descriptors().keys()))
+        self.assertEqual(2, len(parser.cats_parser.type_descriptors()['Right']['layout']))
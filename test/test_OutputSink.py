@@ -0,0 +1,221 @@
+# pylint: disable=invalid-name
+import hashlib
+import os
+import pickle
+import stat
+import unittest
+from test.FileTestUtils import TempDirectoryTestCase
+from generators.Descriptor import Descriptor
+from generators.OutputSink import NEW_FILE_MODE, FileSink, HashingSink, MemorySink, OutputSink
+
+
+class RecordingSink(OutputSink):
+    def __init__(self, buffer_size):
+        super().__init__(buffer_size)
+        self.chunks = []
+
+    def _write_chunk(self, chunk):
+        self.chunks.append(chunk)
+
+
+def _sha256(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+class OutputSinkTest(unittest.TestCase):
+    def test_small_output_is_passed_to_destination_in_single_chunk(self):
+        # Arrange:
+        sink = RecordingSink(1024)
+
+        # Act:
+        sink.write_lines(['foo', '', 'bar'])
+        chunks_before_close = list(sink.chunks)
+        sink.close()
+
+        # Assert:
+        self.assertEqual([], chunks_before_close)
+        self.assertEqual([b'foo\n\nbar\n'], sink.chunks)
+        self.assertEqual(3, sink.line_count)
+        self.assertEqual('bar', sink.last_line)
+
+    def test_large_output_is_passed_to_destination_in_bounded_chunks(self):
+        # Arrange:
+        sink = RecordingSink(8)
+
+        # Act:
+        sink.write_lines(['abc', 'def', 'ghi', 'jkl', 'm'])
+        sink.close()
+
+        # Assert:
+        self.assertEqual([b'abc\ndef\n', b'ghi\njkl\n', b'm\n'], sink.chunks)
+
+    def test_hashing_sink_computes_digest_of_content(self):
+        # Arrange:
+        sink = HashingSink()
+
+        # Act:
+        sink.write_lines(['foo', 'bär'])
+        sink.close()
+
+        # Assert:
+        self.assertEqual(_sha256('foo\nbär\n'.encode('utf-8')), sink.hexdigest())
+
+    def test_memory_sink_keeps_lines(self):
+        # Arrange:
+        sink = MemorySink()
+
+        # Act:
+        sink.write_lines(['foo', '', 'bar'])
+        sink.close()
+
+        # Assert:
+        self.assertEqual(['foo', '', 'bar'], sink.lines)
+        self.assertEqual(b'foo\n\nbar\n', sink.getvalue())
+        self.assertEqual(_sha256(b'foo\n\nbar\n'), sink.hexdigest())
+        self.assertEqual('bar', sink.last_line)
+
+
+class FileSinkTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.filename = self._path('Foo.h')
+
+    def _write_sink(self, lines, buffer_size=1024):
+        with FileSink(self.filename, buffer_size) as sink:
+            sink.write_lines(lines)
+
+        return sink
+
+    def _read(self):
+        with open(self.filename, 'rb') as input_file:
+            return input_file.read()
+
+    def test_new_file_is_written(self):
+        # Act:
+        sink = self._write_sink(['foo', 'bar'], 4)
+
+        # Assert:
+        self.assertTrue(sink.changed)
+        self.assertEqual(b'foo\nbar\n', self._read())
+        self.assertEqual(_sha256(b'foo\nbar\n'), sink.hexdigest())
+        self.assertEqual(['Foo.h'], os.listdir(self.directory))
+
+    def test_empty_file_is_written(self):
+        # Act:
+        sink = self._write_sink([])
+
+        # Assert:
+        self.assertTrue(sink.changed)
+        self.assertEqual(b'', self._read())
+
+    def test_unchanged_file_is_not_replaced(self):
+        # Arrange:
+        self._write_sink(['foo'])
+        os.utime(self.filename, (1, 1))
+
+        # Act:
+        sink = self._write_sink(['foo'])
+
+        # Assert:
+        self.assertFalse(sink.changed)
+        self.assertEqual(1, os.stat(self.filename).st_mtime)
+        self.assertEqual(['Foo.h'], os.listdir(self.directory))
+
+    def test_changed_file_is_replaced(self):
+        # Arrange:
+        self._write_sink(['foo'])
+
+        # Act:
+        sink = self._write_sink(['bar'])
+
+        # Assert:
+        self.assertTrue(sink.changed)
+        self.assertEqual(b'bar\n', self._read())
+
+    def test_new_file_has_mode_of_regular_new_file(self):
+        # Act:
+        self._write_sink(['foo'])
+
+        # Assert:
+        self.assertEqual(NEW_FILE_MODE, stat.S_IMODE(os.stat(self.filename).st_mode))
+
+    def test_replaced_file_keeps_its_mode(self):
+        # Arrange:
+        self._write_sink(['foo'])
+        os.chmod(self.filename, 0o640)
+
+        # Act:
+        self._write_sink(['bar'])
+
+        # Assert:
+        self.assertEqual(b'bar\n', self._read())
+        self.assertEqual(0o640, stat.S_IMODE(os.stat(self.filename).st_mode))
+
+    def test_failed_write_leaves_file_untouched(self):
+        # Arrange:
+        self._write_sink(['foo'])
+
+        # Act:
+        with self.assertRaises(RuntimeError):
+            with FileSink(self.filename, 2) as sink:
+                sink.write_lines(['bar', 'baz'])
+                raise RuntimeError('generator failed')
+
+        # Assert:
+        self.assertEqual(b'foo\n', self._read())
+        self.assertEqual(['Foo.h'], os.listdir(self.directory))
+
+
+class DescriptorTest(unittest.TestCase):
+    def test_descriptor_with_lines_writes_lines(self):
+        # Arrange:
+        descriptor = Descriptor('Foo.h', ['foo', 'bar'])
+        sink = MemorySink()
+
+        # Act:
+        descriptor.write_to(sink)
+
+        # Assert:
+        self.assertEqual(['foo', 'bar'], sink.lines)
+        self.assertEqual(['foo', 'bar'], descriptor.code)
+
+    def test_streamed_descriptor_generates_content_when_written(self):
+        # Arrange:
+        calls = []
+
+        def write(sink):
+            calls.append(sink)
+            sink.write_lines(['foo', 'bar'])
+
+        descriptor = Descriptor.streamed('Foo.h', write)
+        sink = MemorySink()
+
+        # Act:
+        descriptor.write_to(sink)
+
+        # Assert:
+        self.assertEqual([sink], calls)
+        self.assertEqual(['foo', 'bar'], sink.lines)
+
+    def test_streamed_descriptor_code_is_available_as_lines(self):
+        # Arrange:
+        descriptor = Descriptor.streamed('Foo.h', lambda sink: sink.write_lines(['foo', 'bar']))
+
+        # Act:
+        filename, code = descriptor
+
+        # Assert:
+        self.assertEqual('Foo.h', filename)
+        self.assertEqual(['foo', 'bar'], code)
+        self.assertEqual(Descriptor('Foo.h', ['foo', 'bar']), descriptor)
+
+    def test_materialized_descriptor_can_be_pickled(self):
+        # Arrange:
+        descriptor = Descriptor.streamed('Foo.h', lambda sink: sink.write_lines(['foo', 'bar']))
+
+        # Act:
+        materialized_descriptor = pickle.loads(pickle.dumps(descriptor.materialize()))
+
+        # Assert:
+        self.assertEqual('Foo.h', materialized_descriptor.filename)
+        self.assertEqual(['foo', 'bar'], materialized_descriptor.code)
@@ -0,0 +1,115 @@
+# pylint: disable=invalid-name
+import json
+import os
+from test.FileTestUtils import TempDirectoryTestCase
+from generators.Descriptor import Descriptor
+from generators.OutputWriter import MANIFEST_FILENAME, OutputWriter
+
+
+class OutputWriterTest(TempDirectoryTestCase):
+    def _read(self, filename):
+        with open(self._path(filename)) as input_file:
+            return input_file.read()
+
+    def _read_manifest(self):
+        return json.loads(self._read(MANIFEST_FILENAME))['files']
+
+    def _generate(self, files, delete_stale=False):
+        writer = OutputWriter(self.directory)
+        for filename, lines in files.items():
+            writer.write(filename, lines)
+
+        return writer, writer.finish(delete_stale)
+
+    def test_new_files_are_written(self):
+        # Act:
+        writer, stale_files = self._generate({'Foo.h': ['foo', '', 'bar'], 'Foo.cpp': ['baz']})
+
+        # Assert:
+        self.assertEqual(['Foo.h', 'Foo.cpp'], writer.written_files)
+        self.assertEqual([], stale_files)
+        self.assertEqual('foo\n\nbar\n', self._read('Foo.h'))
+        self.assertEqual('baz\n', self._read('Foo.cpp'))
+        self.assertEqual({'Foo.h', 'Foo.cpp'}, set(self._read_manifest().keys()))
+        self.assertEqual('output: 2 written, 0 unchanged', writer.statistics())
+
+    def test_unchanged_files_are_not_rewritten(self):
+        # Arrange:
+        self._generate({'Foo.h': ['foo'], 'Foo.cpp': ['bar']})
+        os.utime(self._path('Foo.h'), (1, 1))
+
+        # Act:
+        writer, _ = self._generate({'Foo.h': ['foo'], 'Foo.cpp': ['baz']})
+
+        # Assert:
+        self.assertEqual(['Foo.cpp'], writer.written_files)
+        self.assertEqual(['Foo.h'], writer.unchanged_files)
+        self.assertEqual(1, os.stat(self._path('Foo.h')).st_mtime)
+        self.assertEqual('baz\n', self._read('Foo.cpp'))
+
+    def test_streamed_descriptors_are_written(self):
+        # Arrange:
+        writer = OutputWriter(self.directory)
+
+        # Act:
+        is_written = writer.write_descriptor(Descriptor.streamed('Foo.h', lambda sink: sink.write_lines(['foo', 'bar'])))
+        writer.finish()
+
+        # Assert:
+        self.assertTrue(is_written)
+        self.assertEqual('foo\nbar\n', self._read('Foo.h'))
+        self.assertEqual({'Foo.h'}, set(self._read_manifest().keys()))
+
+    def test_manifest_contains_content_hashes(self):
+        # Act:
+        self._generate({'Foo.h': ['foo']})
+        first_hashes = self._read_manifest()
+        self._generate({'Foo.h': ['bar']})
+        second_hashes = self._read_manifest()
+
+        # Assert:
+        self.assertEqual(64, len(first_hashes['Foo.h']))
+        self.assertNotEqual(first_hashes['Foo.h'], second_hashes['Foo.h'])
+
+    def test_stale_files_are_detected_and_kept_by_default(self):
+        # Arrange:
+        self._generate({'Foo.h': ['foo'], 'Bar.h': ['bar']})
+
+        # Act:
+        _, stale_files = self._generate({'Foo.h': ['foo']})
+        _, stale_files_again = self._generate({'Foo.h': ['foo']})
+
+        # Assert:
+        self.assertEqual(['Bar.h'], stale_files)
+        self.assertEqual(['Bar.h'], stale_files_again)
+        self.assertTrue(os.path.isfile(self._path('Bar.h')))
+
+    def test_stale_files_can_be_deleted(self):
+        # Arrange:
+        self._generate({'Foo.h': ['foo'], 'Bar.h': ['bar']})
+
+        # Act:
+        _, stale_files = self._generate({'Foo.h': ['foo']}, True)
+
+        # Assert:
+        self.assertEqual(['Bar.h'], stale_files)
+        self.assertFalse(os.path.exists(self._path('Bar.h')))
+        self.assertEqual({'Foo.h'}, set(self._read_manifest().keys()))
+
+    def test_files_not_in_manifest_are_never_stale(self):
+        # Arrange:
+        self._write('Handwritten.h', ['// not generated'])
+
+        # Act:
+        _, stale_files = self._generate({'Foo.h': ['foo']}, True)
+
+        # Assert:
+        self.assertEqual([], stale_files)
+        self.assertTrue(os.path.isfile(self._path('Handwritten.h')))
+
+    def test_no_temporary_files_are_left(self):
+        # Act:
+        self._generate({'Foo.h': ['foo']})
+
+        # Assert:
+        self.assertEqual([MANIFEST_FILENAME, 'Foo.h'], sorted(os.listdir(self.directory)))
@@ -0,0 +1,83 @@
+# pylint: disable=invalid-name
+# pylint: disable=too-few-public-methods
+import os
+import unittest
+from generators.Descriptor import Descriptor
+from generators.ParallelGenerator import generate_descriptors
+
+
+class UnitGenerator:
+    """Generator producing two files per schema entry"""
+    def __init__(self, schema, options):
+        self.schema = schema
+        self.options = options
+
+    def __iter__(self):
+        return iter([descriptor for unit in self.generation_units() for descriptor in self.generate_unit(unit)])
+
+    def generation_units(self):
+        return list(self.schema)
+
+    def generate_unit(self, name):
+        code = ['{0} = {1} ({2})'.format(name, self.schema[name], os.getpid())]
+        return [Descriptor('{0}.h'.format(name), code), Descriptor('{0}.cpp'.format(name), code)]
+
+
+class SerialGenerator:
+    """Generator without generation units"""
+    def __init__(self, schema, _):
+        self.schema = schema
+
+    def __iter__(self):
+        return iter([Descriptor(name, ['({0})'.format(os.getpid())]) for name in self.schema])
+
+
+def _names_and_pids(descriptors):
+    return [descriptor.filename for descriptor in descriptors], {descriptor.code[0].split()[-1] for descriptor in descriptors}
+
+
+class ParallelGeneratorTest(unittest.TestCase):
+    def test_parallel_output_matches_serial_output_order(self):
+        # Arrange:
+        schema = {'Type{0}'.format(index): index for index in range(20)}
+
+        # Act:
+        serial_names, serial_pids = _names_and_pids(list(generate_descriptors(UnitGenerator, schema, {})))
+        parallel_names, parallel_pids = _names_and_pids(list(generate_descriptors(UnitGenerator, schema, {}, 3)))
+
+        # Assert:
+        self.assertEqual(serial_names, parallel_names)
+        self.assertEqual({'({0})'.format(os.getpid())}, serial_pids)
+        self.assertNotIn('({0})'.format(os.getpid()), parallel_pids)
+
+    def test_single_job_is_run_serially(self):
+        # Arrange:
+        schema = {'Foo': 1, 'Bar': 2}
+
+        # Act:
+        names, pids = _names_and_pids(list(generate_descriptors(UnitGenerator, schema, {}, 1)))
+
+        # Assert:
+        self.assertEqual(['Foo.h', 'Foo.cpp', 'Bar.h', 'Bar.cpp'], names)
+        self.assertEqual({'({0})'.format(os.getpid())}, pids)
+
+    def test_generators_without_units_are_run_serially(self):
+        # Arrange:
+        schema = {'Foo': 1, 'Bar': 2}
+
+        # Act:
+        names, pids = _names_and_pids(list(generate_descriptors(SerialGenerator, schema, {}, 4)))
+
+        # Assert:
+        self.assertEqual(['Foo', 'Bar'], names)
+        self.assertEqual({'({0})'.format(os.getpid())}, pids)
+
+    def test_profiler_is_not_sent_to_workers(self):
+        # Arrange: profiler cannot be pickled
+        schema = {'Foo': 1, 'Bar': 2}
+
+        # Act:
+        names, _ = _names_and_pids(list(generate_descriptors(UnitGenerator, schema, {'profiler': lambda: None}, 2)))
+
+        # Assert:
+        self.assertEqual(['Foo.h', 'Foo.cpp', 'Bar.h', 'Bar.cpp'], names)
@@ -0,0 +1,156 @@
+# pylint: disable=invalid-name
+from test.FileTestUtils import TempDirectoryTestCase
+from catparser.CatsParseException import CatsParseException
+from catparser.MultiFileParser import MultiFileParser
+from catparser.ParallelParser import scan_schema_files
+from catparser.parserutils import canonicalize_path
+
+
+class ParallelParserTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write('shared.cats', ['using Amount = uint64', 'enum Shape : uint8', '\tcircle = 1'])
+        self._write('left.cats', [
+            'struct Head', '\tsize = uint32', 'import "shared.cats"', 'struct Left', '\tamount = Amount'
+        ])
+        self._write('right.cats', [
+            'import "shared.cats"', 'struct Right', '\tshape = Shape', '\tradius = Amount if shape equals circle'
+        ])
+        self._write('root.cats', ['import "left.cats"', '# root comment', 'struct Root', '\tinline Head', 'import "right.cats"'])
+
+    def _create_parser(self, deferred_linking=False):
+        parser = MultiFileParser(deferred_linking=deferred_linking)
+        parser.set_include_path(self.directory)
+        return parser
+
+    def _assert_same_as_serial(self, filenames):
+        # Arrange:
+        serial_parser = self._create_parser()
+        for filename in filenames:
+            serial_parser.parse(self._path(filename))
+
+        # Act:
+        parallel_parser = self._create_parser()
+        parallel_parser.parse_parallel([self._path(filename) for filename in filenames], 2)
+
+        # Assert:
+        self.assertEqual(
+            list(serial_parser.cats_parser.type_descriptors().items()),
+            list(parallel_parser.cats_parser.type_descriptors().items()))
+        self.assertEqual(list(serial_parser.import_graph.items()), list(parallel_parser.import_graph.items()))
+        self.assertEqual(serial_parser.file_type_names, parallel_parser.file_type_names)
+        self.assertEqual(serial_parser.file_digests, parallel_parser.file_digests)
+
+    def _assert_same_error_as_serial(self, filenames):
+        # Arrange:
+        with self.assertRaises(CatsParseException) as serial_context:
+            serial_parser = self._create_parser()
+            for filename in filenames:
+                serial_parser.parse(self._path(filename))
+
+        # Act:
+        with self.assertRaises(CatsParseException) as parallel_context:
+            self._create_parser().parse_parallel([self._path(filename) for filename in filenames], 2)
+
+        # Assert:
+        self.assertEqual(str(serial_context.exception), str(parallel_context.exception))
+
+    def test_scan_extracts_imports_of_all_reachable_files(self):
+        # Act:
+        scanned_files = scan_schema_files([self._path('root.cats')], self.directory, set())
+
+        # Assert:
+        self.assertEqual(
+            [canonicalize_path(self._path(filename)) for filename in ['root.cats', 'left.cats', 'shared.cats', 'right.cats']],
+            list(scanned_files.keys()))
+        self.assertEqual(['left.cats', 'right.cats'], [import_tuple[0] for import_tuple in scanned_files[canonicalize_path(
+            self._path('root.cats'))].imports])
+
+    def test_scan_skips_parsed_files(self):
+        # Act:
+        scanned_files = scan_schema_files([self._path('right.cats')], self.directory, {canonicalize_path(self._path('shared.cats'))})
+
+        # Assert:
+        self.assertEqual([canonicalize_path(self._path('right.cats'))], list(scanned_files.keys()))
+
+    def test_parallel_parse_matches_serial_parse(self):
+        # Assert:
+        self._assert_same_as_serial(['root.cats'])
+
+    def test_parallel_parse_of_multiple_roots_matches_serial_parse(self):
+        # Assert:
+        self._assert_same_as_serial(['right.cats', 'left.cats', 'root.cats'])
+
+    def test_parallel_parse_can_continue_serial_session(self):
+        # Arrange:
+        serial_parser = self._create_parser()
+        serial_parser.parse(self._path('root.cats'))
+
+        parser = self._create_parser()
+        parser.parse(self._path('left.cats'))
+
+        # Act:
+        parser.parse_parallel([self._path('root.cats')], 2)
+
+        # Assert:
+        self.assertEqual(
+            list(serial_parser.cats_parser.type_descriptors().keys()),
+            list(parser.cats_parser.type_descriptors().keys()))
+
+    def test_parallel_parse_supports_types_leaked_from_previously_parsed_files(self):
+        # Arrange: other uses Amount without importing shared, which is only valid because left is parsed first
+        self._write('other.cats', ['struct Other', '\tamount = Amount'])
+        self._write('both.cats', ['import "left.cats"', 'import "other.cats"'])
+
+        # Assert:
+        self._assert_same_as_serial(['both.cats'])
+
+    def test_parallel_parse_reports_unknown_type_like_serial_parse(self):
+        # Arrange:
+        self._write('bad.cats', ['import "shared.cats"', 'struct Bad', '\tfee = Fee'])
+
+        # Assert:
+        self._assert_same_error_as_serial(['bad.cats'])
+
+    def test_parallel_parse_reports_duplicate_definition_like_serial_parse(self):
+        # Arrange:
+        self._write('duplicate.cats', ['using Amount = uint32'])
+        self._write('bad.cats', ['import "left.cats"', 'import "duplicate.cats"'])
+
+        # Assert:
+        self._assert_same_error_as_serial(['bad.cats'])
+
+    def test_parallel_parse_reports_missing_import_like_serial_parse(self):
+        # Arrange:
+        self._write('bad.cats', ['import "missing.cats"'])
+
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            self._create_parser().parse_parallel([self._path('bad.cats')], 2)
+
+    def test_parallel_parse_with_deferred_linking_matches_serial_parse(self):
+        # Arrange: forward reference to a type that is imported later
+        self._write('forward.cats', ['struct Forward', '\tamount = Amount', 'import "left.cats"', 'import "right.cats"'])
+        serial_parser = self._create_parser(True)
+        serial_parser.parse(self._path('forward.cats'))
+
+        # Act:
+        parallel_parser = self._create_parser(True)
+        parallel_parser.parse_parallel([self._path('forward.cats')], 2)
+
+        # Assert:
+        self.assertEqual(6, len(parallel_parser.cats_parser.linker.unresolved_links))
+        self.assertEqual(
+            list(serial_parser.cats_parser.type_descriptors().items()),
+            list(parallel_parser.cats_parser.type_descriptors().items()))
+        self.assertEqual(list(serial_parser.import_graph.items()), list(parallel_parser.import_graph.items()))
+
+    def test_parallel_parse_with_deferred_linking_reports_unresolved_links(self):
+        # Arrange:
+        self._write('bad.cats', ['struct Bad', '\tfee = Fee', 'import "left.cats"'])
+        parser = self._create_parser(True)
+        parser.parse_parallel([self._path('bad.cats')], 2)
+
+        # Act + Assert:
+        with self.assertRaisesRegex(CatsParseException, 'bad.cats:2: no definition for linked type "Fee"'):
+            parser.cats_parser.type_descriptors()
@@ -0,0 +1,163 @@
+# pylint: disable=invalid-name
+import os
+import pickle
+import unittest
+from test.FileTestUtils import TempDirectoryTestCase
+from catparser.CatsParseException import CatsParseException
+from catparser.MultiFileParser import MultiFileParser
+from catparser.ParseCache import ContentHasher, ParseCache, content_digest, write_pickle
+
+
+class ParseCacheTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self.include_path = self._path('schemas')
+        self.cache_path = self._path('cache')
+
+        self._write_schema('shared.cats', ['using Amount = uint64'])
+        self._write_schema('left.cats', ['struct Head', '\tsize = uint32', 'import "shared.cats"', 'struct Left', '\tamount = Amount'])
+        self._write_schema('right.cats', ['import "shared.cats"', 'struct Right', '\tamount = Amount'])
+
+    def _write_schema(self, filename, lines):
+        self._write(os.path.join('schemas', filename), lines)
+
+    def _parse(self, filenames, prohibit_parsing=False):
+        cache = ParseCache(self.cache_path)
+        parser = MultiFileParser(cache)
+        parser.set_include_path(self.include_path)
+        if prohibit_parsing:
+            parser.cats_parser.process_line = self.fail
+
+        for filename in filenames:
+            parser.parse(os.path.join(self.include_path, filename))
+
+        return cache, parser
+
+    @staticmethod
+    def _to_items(parser):
+        return list(parser.cats_parser.type_descriptors().items())
+
+    def test_cold_parse_is_miss(self):
+        # Act:
+        cache, parser = self._parse(['left.cats'])
+
+        # Assert:
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(['Head', 'Amount', 'Left'], list(parser.cats_parser.type_descriptors().keys()))
+
+    def test_warm_parse_is_hit_and_skips_parsing(self):
+        # Arrange:
+        _, cold_parser = self._parse(['left.cats'])
+
+        # Act:
+        cache, warm_parser = self._parse(['left.cats'], prohibit_parsing=True)
+
+        # Assert:
+        self.assertEqual((1, 0), (cache.hits, cache.misses))
+        self.assertEqual(self._to_items(cold_parser), self._to_items(warm_parser))
+        self.assertEqual(cold_parser.import_graph, warm_parser.import_graph)
+
+    def test_change_to_root_file_invalidates_entry(self):
+        # Arrange:
+        self._parse(['left.cats'])
+        self._write_schema('left.cats', ['import "shared.cats"', 'struct Left', '\tamount = Amount', '\tfee = Amount'])
+
+        # Act:
+        cache, parser = self._parse(['left.cats'])
+
+        # Assert:
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(2, len(parser.cats_parser.type_descriptors()['Left']['layout']))
+
+    def test_change_to_imported_file_invalidates_entry(self):
+        # Arrange:
+        self._parse(['left.cats'])
+        self._write_schema('shared.cats', ['using Amount = uint16'])
+
+        # Act:
+        cache, parser = self._parse(['left.cats'])
+
+        # Assert:
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(2, parser.cats_parser.type_descriptors()['Amount']['size'])
+
+    def test_change_of_include_path_invalidates_entry(self):
+        # Arrange: the same root imports a different file through another include path
+        self._write('other/shared.cats', ['using Amount = uint32'])
+        self._parse(['right.cats'])
+
+        # Act:
+        cache = ParseCache(self.cache_path)
+        parser = MultiFileParser(cache)
+        parser.set_include_path(self._path('other'))
+        parser.parse(os.path.join(self.include_path, 'right.cats'))
+
+        # Assert:
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(4, parser.cats_parser.type_descriptors()['Amount']['size'])
+
+    def test_cached_roots_sharing_imports_can_be_combined(self):
+        # Arrange: populate cache with standalone entries
+        self._parse(['left.cats'])
+        self._parse(['right.cats'])
+        _, cold_parser = self._parse(['left.cats', 'right.cats'])
+
+        # Act:
+        cache, warm_parser = self._parse(['left.cats', 'right.cats'], prohibit_parsing=True)
+
+        # Assert:
+        self.assertEqual((2, 0), (cache.hits, cache.misses))
+        self.assertEqual(['Head', 'Amount', 'Left', 'Right'], list(warm_parser.cats_parser.type_descriptors().keys()))
+        self.assertEqual(self._to_items(cold_parser), self._to_items(warm_parser))
+
+    def test_cached_types_are_checked_for_duplicates(self):
+        # Arrange:
+        self._write_schema('other.cats', ['struct Left', '\tsize = uint8'])
+        self._parse(['left.cats'])
+
+        # Act + Assert:
+        with self.assertRaises(CatsParseException):
+            self._parse(['other.cats', 'left.cats'])
+
+    def test_corrupt_entry_is_miss(self):
+        # Arrange:
+        self._parse(['left.cats'])
+        for filename in os.listdir(self.cache_path):
+            with open(os.path.join(self.cache_path, filename), 'wb') as output_file:
+                output_file.write(b'\x80')
+
+        # Act:
+        cache, parser = self._parse(['left.cats'])
+
+        # Assert:
+        self.assertEqual((0, 1), (cache.hits, cache.misses))
+        self.assertEqual(['Head', 'Amount', 'Left'], list(parser.cats_parser.type_descriptors().keys()))
+
+
+class WritePickleTest(TempDirectoryTestCase):
+    def test_value_is_written_into_new_directory_without_temporary_files(self):
+        # Arrange:
+        filename = self._path('entries/entry.pickle')
+
+        # Act:
+        write_pickle(filename, {'files': ['foo.cats']})
+
+        # Assert:
+        with open(filename, 'rb') as input_file:
+            self.assertEqual({'files': ['foo.cats']}, pickle.load(input_file))
+
+        self.assertEqual(['entry.pickle'], os.listdir(self._path('entries')))
+
+
+class ContentHasherTest(unittest.TestCase):
+    def test_digest_of_consumed_lines_matches_content_digest(self):
+        # Arrange:
+        lines = ['using Foo = uint8\n', 'struct Bar\n', '\tfoo = Foo\n']
+        hasher = ContentHasher()
+
+        # Act:
+        consumed_lines = list(hasher.iterate(lines))
+
+        # Assert:
+        self.assertEqual(lines, consumed_lines)
+        self.assertEqual(content_digest(''.join(lines)), hasher.hexdigest())
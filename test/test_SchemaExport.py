@@ -0,0 +1,120 @@
+# pylint: disable=invalid-name
+import json
+import os
+import tempfile
+import unittest
+from test.ParserTestUtils import SCHEMA_LINES, parse_all
+from catparser.CompactDescriptors import StructDescriptor
+from catparser.SchemaExport import BINARY_MAGIC, dumps_binary, dumps_json, export_schema, load_schema, loads_schema
+
+
+class SchemaExportTest(unittest.TestCase):
+    def test_json_export_round_trips_types_in_order(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+
+        # Act:
+        loaded_type_descriptors = loads_schema(dumps_json(type_descriptors))
+
+        # Assert:
+        self.assertEqual(['Address', 'Amount', 'Shape', 'Item', 'Enclosing'], list(loaded_type_descriptors))
+        self.assertEqual(dict(type_descriptors), dict(loaded_type_descriptors))
+
+    def test_binary_export_round_trips_types_in_order(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+
+        # Act:
+        loaded_type_descriptors = loads_schema(dumps_binary(type_descriptors))
+
+        # Assert:
+        self.assertEqual(['Address', 'Amount', 'Shape', 'Item', 'Enclosing'], list(loaded_type_descriptors))
+        self.assertEqual(dict(type_descriptors), dict(loaded_type_descriptors))
+
+    def test_exports_do_not_depend_on_key_order(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+        reordered_type_descriptors = {
+            name: dict(reversed(list(type_descriptor.items()))) for name, type_descriptor in type_descriptors.items()
+        }
+
+        # Act + Assert:
+        self.assertEqual(dumps_json(type_descriptors), dumps_json(reordered_type_descriptors))
+        self.assertEqual(dumps_binary(type_descriptors), dumps_binary(reordered_type_descriptors))
+
+    def test_compact_descriptors_can_be_exported_and_loaded(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+        binary = dumps_binary(type_descriptors)
+
+        # Act:
+        loaded_type_descriptors = loads_schema(binary, compact=True)
+
+        # Assert:
+        self.assertIsInstance(loaded_type_descriptors['Enclosing'], StructDescriptor)
+        self.assertEqual(binary, dumps_binary(loaded_type_descriptors))
+        self.assertEqual(dumps_json(type_descriptors), dumps_json(loaded_type_descriptors))
+
+    def test_binary_export_stores_strings_once(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+
+        # Act:
+        binary = dumps_binary(type_descriptors)
+
+        # Assert:
+        self.assertTrue(binary.startswith(BINARY_MAGIC))
+        self.assertEqual(1, binary.count(b'weight'))
+        self.assertEqual(1, binary.count(b'circumference'))
+        self.assertLess(len(binary), len(json.dumps(type_descriptors, separators=(',', ':'))))
+
+    def test_negative_and_large_integers_round_trip(self):
+        # Arrange:
+        type_descriptors = {'Foo': {'type': 'enum', 'values': [{'name': 'a', 'value': -129}, {'name': 'b', 'value': 2 ** 64 - 1}]}}
+
+        # Act:
+        loaded_type_descriptors = loads_schema(dumps_binary(type_descriptors))
+
+        # Assert:
+        self.assertEqual(type_descriptors, dict(loaded_type_descriptors))
+
+    def test_truncated_binary_export_is_rejected(self):
+        # Arrange:
+        binary = dumps_binary(parse_all(SCHEMA_LINES))
+
+        # Act + Assert:
+        for size in [len(BINARY_MAGIC) + 1, len(binary) // 2, len(binary) - 1]:
+            with self.assertRaises(ValueError):
+                loads_schema(binary[:size])
+
+    def test_binary_export_with_trailing_data_is_rejected(self):
+        # Arrange:
+        binary = dumps_binary(parse_all(SCHEMA_LINES))
+
+        # Act + Assert:
+        with self.assertRaises(ValueError):
+            loads_schema(binary + b'\0')
+
+    def test_json_without_export_format_is_rejected(self):
+        # Act + Assert:
+        with self.assertRaises(ValueError):
+            loads_schema('{"types": []}')
+
+    def test_can_export_and_load_files_in_both_formats(self):
+        # Arrange:
+        type_descriptors = parse_all(SCHEMA_LINES)
+        with tempfile.TemporaryDirectory() as directory:
+            for export_format in ['json', 'binary']:
+                filename = os.path.join(directory, 'schema.{0}'.format(export_format))
+
+                # Act:
+                export_schema(type_descriptors, filename, export_format)
+                loaded_type_descriptors = load_schema(filename)
+
+                # Assert:
+                self.assertEqual(dict(type_descriptors), dict(loaded_type_descriptors), export_format)
+
+    def test_cannot_export_unknown_format(self):
+        # Act + Assert:
+        with self.assertRaises(ValueError):
+            export_schema({}, 'schema.xml', 'xml')
@@ -1,6 +1,6 @@
 # pylint: disable=invalid-name
 import unittest
-from catparser.ScopeManager import ScopeManager
+from catparser.ScopeManager import Location, ScopeManager
 from catparser.CatsParseException import CatsParseException
 
 
@@ -86,3 +86,13 @@ class ScopeManagerTest(unittest.TestCase):
         # Act + Assert
         with self.assertRaises(CatsParseException):
             manager.pop_scope()
+
+    def test_location_is_innermost_scope(self):
+        # Arrange:
+        manager = self._initialize_manager_with_three_scopes()
+
+        # Act:
+        location = manager.location()
+
+        # Assert:
+        self.assertEqual(Location('gamma', 0), location)
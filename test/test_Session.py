@@ -0,0 +1,150 @@
+# pylint: disable=invalid-name
+import contextlib
+import importlib
+import io
+import os
+import warnings
+from test.FileTestUtils import TempDirectoryTestCase
+from test.GeneratorTestUtils import NamesGenerator, register_test_generator
+from generators.OutputSink import HashingSink, MemorySink
+from generators.Session import Session, expand_schema_paths
+
+TEST_GENERATOR_NAME = 'test_session_names'
+
+
+class SessionTest(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write('base.cats', ['using Amount = uint64'])
+        self._write('foo/foo.cats', ['import "base.cats"', 'using Foo = uint8'])
+        self._write('foo/bar.cats', ['import "base.cats"', 'using Bar = uint16'])
+        self._write('broken.cats', ['import "missing.cats"'])
+        register_test_generator(self, TEST_GENERATOR_NAME, NamesGenerator)
+
+    def _parse(self, schema_paths):
+        session = Session(self.directory)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            errors = session.parse([self._path(schema_path) for schema_path in schema_paths])
+
+        self.assertEqual('', output.getvalue())
+        return session, errors
+
+    def test_schema_directories_are_expanded_in_sorted_order(self):
+        # Act:
+        schema_filenames = list(expand_schema_paths([self._path('foo'), self._path('base.cats')]))
+
+        # Assert:
+        self.assertEqual([self._path('foo/bar.cats'), self._path('foo/foo.cats'), self._path('base.cats')], schema_filenames)
+
+    def test_can_parse_roots_without_printing(self):
+        # Act:
+        session, errors = self._parse(['foo'])
+
+        # Assert:
+        self.assertEqual({}, errors)
+        self.assertEqual(['Amount', 'Bar', 'Foo'], list(session.type_descriptors()))
+
+    def test_failed_roots_are_returned_as_errors(self):
+        # Act:
+        session, errors = self._parse(['broken.cats', 'foo/foo.cats'])
+
+        # Assert:
+        self.assertEqual([self._path('broken.cats')], list(errors))
+        self.assertEqual(['Amount', 'Foo'], list(session.type_descriptors()))
+
+    def test_parse_does_not_keep_types_of_previous_parse(self):
+        # Arrange:
+        session, _ = self._parse(['foo/foo.cats'])
+
+        # Act:
+        session.parse([self._path('foo/bar.cats')])
+
+        # Assert:
+        self.assertEqual(['Amount', 'Bar'], list(session.type_descriptors()))
+
+    def test_type_descriptors_are_only_available_after_parse(self):
+        # Arrange:
+        session = Session(self.directory)
+
+        # Act + Assert:
+        with self.assertRaises(RuntimeError):
+            session.type_descriptors()
+
+    def test_generate_returns_outputs_in_memory(self):
+        # Arrange:
+        session, _ = self._parse(['foo/foo.cats'])
+
+        # Act:
+        sinks = session.generate(TEST_GENERATOR_NAME, {'prefix': 'type: '})
+
+        # Assert:
+        self.assertEqual(['names.txt'], list(sinks))
+        self.assertIsInstance(sinks['names.txt'], MemorySink)
+        self.assertEqual(['type: Amount', 'type: Foo'], sinks['names.txt'].lines)
+        self.assertFalse(os.path.exists('names.txt'))
+
+    def test_generate_writes_outputs_into_supplied_sinks(self):
+        # Arrange:
+        session, _ = self._parse(['foo/foo.cats'])
+        filenames = []
+
+        def create_sink(filename):
+            filenames.append(filename)
+            return HashingSink()
+
+        # Act:
+        sinks = session.generate(TEST_GENERATOR_NAME, {'prefix': 'type: '}, sink_factory=create_sink)
+
+        # Assert:
+        self.assertEqual(['names.txt'], filenames)
+
+        expected_sink = MemorySink()
+        expected_sink.write_lines(['type: Amount', 'type: Foo'])
+        self.assertEqual(expected_sink.hexdigest(), sinks['names.txt'].hexdigest())
+
+    def test_problems_are_returned_without_printing_or_warning(self):
+        # Arrange: transaction without any hints
+        self._write('transaction.cats', [
+            'struct Transaction', '\tsize = uint32',
+            'struct FooTransactionBody', '\tamount = uint64',
+            'struct FooTransaction', '\tinline Transaction', '\tinline FooTransactionBody'
+        ])
+        session, _ = self._parse(['transaction.cats'])
+        output = io.StringIO()
+
+        # Act:
+        with warnings.catch_warnings(record=True) as raised_warnings:
+            warnings.simplefilter('always')
+            with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+                problems = session.problems('cpp_builder')
+
+        # Assert:
+        self.assertEqual([
+            'missing plugin hint for transaction "FooTransaction"',
+            'transaction "FooTransaction" has no embedded transaction, its builder assumes "EmbeddedFooTransaction"'
+        ], problems)
+        self.assertEqual([], raised_warnings)
+        self.assertEqual('', output.getvalue())
+
+    def test_generators_without_validation_have_no_problems(self):
+        # Arrange:
+        session, _ = self._parse(['foo/foo.cats'])
+
+        # Act:
+        problems = session.problems(TEST_GENERATOR_NAME, {'prefix': 'type: '})
+
+        # Assert:
+        self.assertEqual([], problems)
+
+    def test_main_can_be_imported_without_side_effects(self):
+        # Arrange:
+        output = io.StringIO()
+
+        # Act:
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            main_module = importlib.import_module('main')
+
+        # Assert:
+        self.assertTrue(callable(main_module.generate))
+        self.assertEqual('', output.getvalue())
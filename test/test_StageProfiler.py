@@ -0,0 +1,156 @@
+# pylint: disable=invalid-name
+import os
+import pstats
+import tempfile
+import unittest
+from catparser.MultiFileParser import MultiFileParser
+from catparser.StageProfiler import CAN_RESET_PEAK, NULL_PROFILER, StageProfiler
+
+
+class StageProfilerTest(unittest.TestCase):
+    def test_stage_is_recorded_with_details(self):
+        # Arrange:
+        profiler = StageProfiler()
+        profiler.start()
+
+        # Act:
+        with profiler.stage('parse', file='foo.cats'):
+            allocation = bytearray(1024 * 1024)
+
+        profiler.stop()
+
+        # Assert:
+        self.assertEqual(1024 * 1024, len(allocation))
+        self.assertEqual(1, len(profiler.stages))
+
+        record = profiler.stages[0]
+        self.assertEqual(
+            {'name', 'depth', 'file', 'wall_seconds', 'cpu_seconds', 'net_bytes'} | ({'peak_bytes'} if CAN_RESET_PEAK else set()),
+            set(record.keys()))
+        self.assertEqual(('parse', 0, 'foo.cats'), (record['name'], record['depth'], record['file']))
+        # - traced memory is a net amount, which other objects freed during the stage reduce slightly
+        self.assertLess(1000 * 1000, record['net_bytes'])
+
+    @unittest.skipUnless(CAN_RESET_PEAK, 'peak of traced memory cannot be reset')
+    def test_peak_includes_memory_freed_during_stage(self):
+        # Arrange:
+        profiler = StageProfiler()
+        profiler.start()
+
+        # Act:
+        with profiler.stage('outer'):
+            with profiler.stage('inner'):
+                allocation = bytearray(1024 * 1024)
+                del allocation
+
+            with profiler.stage('other'):
+                pass
+
+        profiler.stop()
+
+        # Assert: the freed allocation is in the peaks of the stage and of its enclosing stage, but not in their net amounts
+        self.assertEqual(['outer', 'inner', 'other'], [record['name'] for record in profiler.stages])
+        for record in profiler.stages[:2]:
+            self.assertLess(1000 * 1000, record['peak_bytes'])
+            self.assertGreater(1000 * 1000, record['net_bytes'])
+
+        self.assertGreater(1000 * 1000, profiler.stages[2]['peak_bytes'])
+        self.assertEqual([], profiler.observed_peaks)
+
+    def test_allocations_are_not_recorded_when_not_traced(self):
+        # Arrange:
+        profiler = StageProfiler(trace_allocations=False)
+        profiler.start()
+
+        # Act:
+        with profiler.stage('dump'):
+            pass
+
+        profiler.stop()
+
+        # Assert:
+        self.assertNotIn('net_bytes', profiler.stages[0])
+        self.assertNotIn('peak_bytes', profiler.stages[0])
+
+    def test_totals_do_not_count_nested_stages_with_same_name_twice(self):
+        # Arrange:
+        profiler = StageProfiler(trace_allocations=False)
+
+        # Act:
+        with profiler.stage('parse'):
+            with profiler.stage('parse'):
+                pass
+
+            with profiler.stage('write'):
+                pass
+
+        with profiler.stage('parse'):
+            pass
+
+        results = profiler.results()
+
+        # Assert:
+        self.assertEqual([0, 1, 1, 0], [record['depth'] for record in results['stages']])
+        self.assertEqual(3, results['totals']['parse']['count'])
+        expected_wall_seconds = profiler.stages[0]['wall_seconds'] + profiler.stages[3]['wall_seconds']
+        self.assertEqual(expected_wall_seconds, results['totals']['parse']['wall_seconds'])
+        self.assertEqual(1, results['totals']['write']['count'])
+
+    def test_stage_is_recorded_when_block_raises(self):
+        # Arrange:
+        profiler = StageProfiler(trace_allocations=False)
+
+        # Act:
+        with self.assertRaises(ValueError):
+            with profiler.stage('parse'):
+                raise ValueError('parse failed')
+
+        # Assert:
+        self.assertEqual(0, profiler.depth)
+        self.assertIn('wall_seconds', profiler.stages[0])
+
+    def test_cprofile_statistics_can_be_dumped(self):
+        # Arrange:
+        profiler = StageProfiler(trace_allocations=False, use_cprofile=True)
+        profiler.start()
+        sorted(range(1000), reverse=True)
+        profiler.stop()
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'profile.prof')
+
+            # Act:
+            profiler.dump_cprofile(filename)
+
+            # Assert:
+            self.assertLess(0, pstats.Stats(filename).total_calls)
+
+    def test_null_profiler_runs_block(self):
+        # Act:
+        with NULL_PROFILER.stage('parse', file='foo.cats') as record:
+            value = 7
+
+        # Assert:
+        self.assertEqual(7, value)
+        self.assertIsNone(record)
+
+    def test_file_parses_are_recorded_as_nested_stages(self):
+        # Arrange:
+        profiler = StageProfiler(trace_allocations=False)
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, 'other.cats'), 'w') as output_file:
+                output_file.write('using Amount = uint64\n')
+
+            with open(os.path.join(directory, 'root.cats'), 'w') as output_file:
+                output_file.write('import "other.cats"\n')
+
+            file_parser = MultiFileParser(profiler=profiler)
+            file_parser.set_include_path(directory)
+
+            # Act:
+            file_parser.parse(os.path.join(directory, 'root.cats'))
+
+        # Assert:
+        self.assertEqual(
+            [('parse', 0, 'root.cats'), ('parse', 1, 'other.cats')],
+            [(record['name'], record['depth'], os.path.basename(record['file'])) for record in profiler.stages])
@@ -0,0 +1,104 @@
+# pylint: disable=invalid-name
+import os
+import tempfile
+import unittest
+from test.benchmark.ParserBenchmark import benchmark_parse, benchmark_stream, compare_results
+from test.benchmark.SyntheticSchema import SyntheticSchemaOptions, write_synthetic_schemas
+from test.FileTestUtils import TempDirectoryTestCase
+from catparser.MultiFileParser import MultiFileParser
+
+
+class SyntheticSchemaTest(TempDirectoryTestCase):
+    def _parse(self, options):
+        root_filename = write_synthetic_schemas(self.directory, options)
+        file_parser = MultiFileParser()
+        file_parser.set_include_path(self.directory)
+        file_parser.parse(root_filename)
+        return file_parser
+
+    def test_generated_tree_can_be_parsed(self):
+        # Act:
+        file_parser = self._parse(SyntheticSchemaOptions(num_files=7, import_depth=3, structs_per_file=4, fields_per_struct=5))
+
+        # Assert: root file and all generated files are parsed, each file defines an enum and its structs
+        self.assertEqual(8, len(file_parser.import_graph))
+        self.assertEqual(7 * (1 + 4), len(file_parser.cats_parser.type_descriptors()))
+
+    def test_generated_tree_has_requested_import_depth(self):
+        # Act:
+        file_parser = self._parse(SyntheticSchemaOptions(num_files=8, import_depth=4))
+
+        # Assert: longest import chain from the root file
+        def depth(filename):
+            return 1 + max((depth(import_filename) for import_filename in file_parser.import_graph[filename]), default=0)
+
+        self.assertEqual(1 + 4, depth(next(iter(file_parser.import_graph))))
+
+    def test_generated_structs_have_requested_shape(self):
+        # Act:
+        file_parser = self._parse(SyntheticSchemaOptions(
+            num_files=2,
+            structs_per_file=20,
+            fields_per_struct=10,
+            enum_width=5,
+            conditional_share=0.3,
+            array_share=0.3))
+
+        # Assert: every struct has kind and count fields followed by the requested number of fields
+        type_descriptors = file_parser.cats_parser.type_descriptors()
+        layouts = [type_descriptor['layout'] for type_descriptor in type_descriptors.values() if 'struct' == type_descriptor['type']]
+        self.assertEqual([2 + 10] * 40, [len(layout) for layout in layouts])
+        enum_values = [type_descriptor['values'] for type_descriptor in type_descriptors.values() if 'enum' == type_descriptor['type']]
+        self.assertEqual([5, 5], [len(values) for values in enum_values])
+
+        fields = [field for layout in layouts for field in layout[2:]]
+        self.assertTrue(any('condition' in field for field in fields))
+        self.assertTrue(any('count' == field.get('size') for field in fields))
+
+    def test_generated_tree_is_deterministic(self):
+        # Arrange:
+        options = SyntheticSchemaOptions(num_files=3, seed=123)
+
+        # Act:
+        with tempfile.TemporaryDirectory() as other_directory:
+            write_synthetic_schemas(self.directory, options)
+            write_synthetic_schemas(other_directory, options)
+
+            # Assert:
+            for filename in sorted(os.listdir(self.directory)):
+                with open(os.path.join(self.directory, filename)) as lhs, open(os.path.join(other_directory, filename)) as rhs:
+                    self.assertEqual(lhs.read(), rhs.read())
+
+    def test_conditional_fields_require_enum_values(self):
+        # Act + Assert:
+        with self.assertRaises(ValueError):
+            write_synthetic_schemas(self.directory, SyntheticSchemaOptions(enum_width=0, conditional_share=0.1))
+
+
+class ParserBenchmarkTest(unittest.TestCase):
+    def test_benchmarks_report_throughput_and_memory(self):
+        # Arrange:
+        with tempfile.TemporaryDirectory() as directory:
+            root_filename = write_synthetic_schemas(directory, SyntheticSchemaOptions(num_files=3))
+
+            # Act:
+            results = [benchmark_parse(root_filename, directory, 1), benchmark_stream(root_filename, directory, 1)]
+
+        # Assert:
+        for result in results:
+            self.assertEqual(
+                {'wall_seconds', 'cpu_seconds', 'peak_bytes', 'lines', 'lines_per_second'},
+                set(result.keys()))
+            self.assertLess(0, result['lines'])
+            self.assertLess(0, result['peak_bytes'])
+
+    def test_results_can_be_compared(self):
+        # Arrange:
+        baseline = {'cases': {'parse': {'wall_seconds': 2, 'peak_bytes': 100}, 'stream': {'error': 'failed'}}}
+        current = {'cases': {'parse': {'wall_seconds': 1, 'peak_bytes': 150}, 'stream': {'wall_seconds': 1, 'peak_bytes': 1}}}
+
+        # Act:
+        ratios = compare_results(baseline, current)
+
+        # Assert:
+        self.assertEqual({'parse': {'wall_seconds': 0.5, 'peak_bytes': 1.5}}, ratios)
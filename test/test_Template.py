@@ -0,0 +1,97 @@
+# pylint: disable=invalid-name
+import unittest
+from generators.Template import Template, compile_template
+
+
+class TemplateTest(unittest.TestCase):
+    def test_can_render_template_without_placeholders(self):
+        # Arrange:
+        template = Template('class Foo {\n};')
+
+        # Act:
+        lines = template.render({'NAME': 'Bar'})
+
+        # Assert:
+        self.assertEqual(frozenset(), template.names)
+        self.assertEqual(['class Foo {', '};'], lines)
+
+    def test_can_render_template_with_placeholders(self):
+        # Arrange:
+        template = Template('m_{NAME} = {NAME};')
+
+        # Act:
+        lines = template.render({'NAME': 'amount'})
+
+        # Assert:
+        self.assertEqual(frozenset(['NAME']), template.names)
+        self.assertEqual(['m_amount = amount;'], lines)
+
+    def test_braces_around_non_placeholders_are_literal(self):
+        # Arrange:
+        template = Template('void {SETTER} {\n}\n{ lower } {} {{X}}')
+
+        # Act:
+        lines = template.render({'SETTER': 'setFoo()', 'X': 'y'})
+
+        # Assert:
+        self.assertEqual(['void setFoo() {', '}', '{ lower } {} {y}'], lines)
+
+    def test_replacement_values_are_not_rescanned(self):
+        # Arrange:
+        template = Template('{CALL}')
+
+        # Act:
+        lines = template.render({'CALL': '{ data, {NAME} }', 'NAME': 'name'})
+
+        # Assert:
+        self.assertEqual(['{ data, {NAME} }'], lines)
+
+    def test_render_indents_non_empty_lines(self):
+        # Arrange:
+        template = Template('if ({CONDITION})\n\n\tfoo();')
+
+        # Act:
+        lines = template.render({'CONDITION': 'x'}, 2)
+
+        # Assert:
+        self.assertEqual(['\t\tif (x)', '', '\t\t\tfoo();'], lines)
+
+    def test_render_indents_multi_line_replacement_values(self):
+        # Arrange:
+        template = Template('x = {VALUE};')
+
+        # Act:
+        lines = template.render({'VALUE': 'f(\n\ta)'}, 1)
+
+        # Assert:
+        self.assertEqual(['\tx = f(', '\t\ta);'], lines)
+
+    def test_render_of_literal_template_is_stable_across_indents(self):
+        # Arrange:
+        template = Template('{\n}')
+
+        # Act:
+        lines1 = template.render({}, 1)
+        lines0 = template.render({})
+        lines1_again = template.render({}, 1)
+
+        # Assert:
+        self.assertEqual(['\t{', '\t}'], lines1)
+        self.assertEqual(['{', '}'], lines0)
+        self.assertEqual(lines1, lines1_again)
+
+    def test_render_fails_for_missing_replacement(self):
+        # Arrange:
+        template = Template('{NAME}')
+
+        # Act + Assert:
+        with self.assertRaises(KeyError):
+            template.render({})
+
+    def test_compile_template_returns_same_template_for_same_text(self):
+        # Act:
+        template1 = compile_template('m_{NAME};')
+        template2 = compile_template('m_{NAME};')
+
+        # Assert:
+        self.assertIs(template1, template2)
@@ -0,0 +1,113 @@
+# pylint: disable=invalid-name
+import unittest
+from catparser.TransactionCatalog import TransactionCatalog, TransactionEntry
+
+
+def struct(*layout):
+    return {'type': 'struct', 'layout': list(layout)}
+
+
+def inline(type_name):
+    return {'type': type_name, 'disposition': 'inline'}
+
+
+def const(name, value):
+    return {'name': name, 'type': 'byte', 'size': 2, 'signedness': 'unsigned', 'disposition': 'const', 'value': value}
+
+
+def transaction(body_name, entity_type, version=1):
+    return struct(const('version', version), const('entityType', entity_type), inline('Transaction'), inline(body_name))
+
+
+def embedded_transaction(body_name):
+    return struct(inline('EmbeddedTransaction'), inline(body_name))
+
+
+SCHEMA = {
+    'Amount': {'type': 'byte', 'size': 8, 'signedness': 'unsigned'},
+    'Transaction': struct({'name': 'size', 'type': 'byte', 'size': 4}),
+    'EmbeddedTransaction': struct({'name': 'size', 'type': 'byte', 'size': 4}),
+    'FooTransactionBody': struct({'name': 'amount', 'type': 'Amount'}),
+    'FooTransaction': transaction('FooTransactionBody', 0x4154, 3),
+    'EmbeddedFooTransaction': embedded_transaction('FooTransactionBody'),
+    'BarBody': struct({'name': 'amount', 'type': 'Amount'}),
+    'EmbeddedBar': embedded_transaction('BarBody'),
+    'Bar': transaction('BarBody', 0x4155),
+    'NotTransaction': struct(inline('FooTransactionBody'))
+}
+
+
+class TransactionCatalogTest(unittest.TestCase):
+    def test_transactions_are_found_by_inlined_header_in_schema_order(self):
+        # Act:
+        catalog = TransactionCatalog(SCHEMA)
+
+        # Assert:
+        self.assertEqual(['FooTransaction', 'Bar'], list(catalog))
+        self.assertEqual(2, len(catalog))
+        self.assertNotIn('EmbeddedFooTransaction', catalog)
+
+    def test_entries_contain_body_embedded_transaction_constants_and_plugin(self):
+        # Act:
+        catalog = TransactionCatalog(SCHEMA, {'FooTransaction': 'foo'})
+
+        # Assert:
+        self.assertEqual(
+            TransactionEntry('FooTransaction', 'FooTransactionBody', 'EmbeddedFooTransaction', 0x4154, 3, 'foo'),
+            catalog['FooTransaction'])
+        self.assertEqual(TransactionEntry('Bar', 'BarBody', 'EmbeddedBar', 0x4155, 1, None), catalog['Bar'])
+
+    def test_transaction_without_body_or_constants_has_empty_entry(self):
+        # Act:
+        catalog = TransactionCatalog({'Transaction': struct(), 'FooTransaction': struct(inline('Transaction'))})
+
+        # Assert:
+        self.assertEqual(TransactionEntry('FooTransaction', None, None, None, None, None), catalog['FooTransaction'])
+
+    def test_can_find_transactions_by_entity_type_and_embedded_name(self):
+        # Arrange:
+        catalog = TransactionCatalog(SCHEMA)
+
+        # Act + Assert:
+        self.assertEqual('Bar', catalog.by_entity_type(0x4155).name)
+        self.assertEqual(None, catalog.by_entity_type(0x4156))
+        self.assertEqual('FooTransaction', catalog.by_embedded_name('EmbeddedFooTransaction').name)
+        self.assertEqual(None, catalog.by_embedded_name('FooTransaction'))
+
+    def test_can_use_custom_header_names(self):
+        # Arrange:
+        schema = {
+            'BlockHeader': struct(),
+            'EmbeddedBlockHeader': struct(),
+            'FooBody': struct(),
+            'Foo': struct(const('entityType', 1), inline('BlockHeader'), inline('FooBody')),
+            'EmbeddedFoo': struct(inline('EmbeddedBlockHeader'), inline('FooBody'))
+        }
+
+        # Act:
+        catalog = TransactionCatalog(schema, header_name='BlockHeader', embedded_header_name='EmbeddedBlockHeader')
+
+        # Assert:
+        self.assertEqual(TransactionEntry('Foo', 'FooBody', 'EmbeddedFoo', 1, None, None), catalog['Foo'])
+
+    def test_valid_catalog_has_no_problems(self):
+        # Act:
+        problems = TransactionCatalog(SCHEMA).validate()
+
+        # Assert:
+        self.assertEqual([], problems)
+
+    def test_validate_flags_entity_type_collisions(self):
+        # Arrange:
+        schema = dict(SCHEMA)
+        schema['BazTransaction'] = transaction('BarBody', 0x4154)
+        schema['QuxTransaction'] = transaction('BarBody', 0x4154)
+
+        # Act:
+        catalog = TransactionCatalog(schema)
+
+        # Assert:
+        self.assertEqual(
+            ['entity type 16724 (0x4154) is used by transactions "FooTransaction", "BazTransaction", "QuxTransaction"'],
+            catalog.validate())
+        self.assertEqual('FooTransaction', catalog.by_entity_type(0x4154).name)
@@ -0,0 +1,204 @@
+# pylint: disable=invalid-name
+import os
+import threading
+import time
+import unittest
+from test.FileTestUtils import TempDirectoryTestCase
+from test.GeneratorTestUtils import register_test_generator
+from generators.Descriptor import Descriptor
+from generators.Watcher import CycleReport, GeneratorReport, Watcher, WatcherOptions, changed_files, format_cycle_report, snapshot_files
+
+TEST_GENERATOR_NAME = 'test_watcher_units'
+
+
+class UnitGenerator:
+    """Generator producing one file per type, which depends only on that type"""
+    generated_units = []
+
+    def __init__(self, schema, options):
+        self.schema = schema
+        self.options = options
+
+    @staticmethod
+    def watched_paths(options):
+        return [options['extra']]
+
+    def generation_units(self):
+        return list(self.schema)
+
+    def unit_cache_inputs(self, name):
+        return {'type': self.schema[name]}
+
+    def generate_unit(self, name):
+        UnitGenerator.generated_units.append(name)
+        return [Descriptor('{0}.txt'.format(name), ['{0} {1}'.format(name, self.schema[name]['size'])])]
+
+
+class WatcherTestBase(TempDirectoryTestCase):
+    def setUp(self):
+        super().setUp()
+        self._write('schemas/base.cats', ['using Amount = uint64'])
+        self._write('schemas/foo.cats', ['import "base.cats"', 'using Foo = uint8'])
+        self._write('extra.txt', ['extra'])
+        UnitGenerator.generated_units = []
+        register_test_generator(self, TEST_GENERATOR_NAME, UnitGenerator)
+
+    def _read(self, filename):
+        with open(self._path(filename)) as input_file:
+            return input_file.read()
+
+
+class SnapshotTest(WatcherTestBase):
+    def test_snapshot_contains_files_and_non_hidden_files_of_directories(self):
+        # Arrange:
+        self._write('schemas/.hidden', [''])
+
+        # Act:
+        snapshot = snapshot_files([self._path('schemas'), self._path('extra.txt'), self._path('missing.txt')])
+
+        # Assert:
+        self.assertEqual({self._path('schemas/base.cats'), self._path('schemas/foo.cats'), self._path('extra.txt')}, set(snapshot))
+
+    def test_changed_files_contains_added_removed_and_modified_files(self):
+        # Arrange:
+        previous_snapshot = {'a': (1, 1), 'b': (1, 1), 'c': (1, 1)}
+        snapshot = {'a': (1, 1), 'b': (2, 1), 'd': (1, 1)}
+
+        # Act:
+        files = changed_files(previous_snapshot, snapshot)
+
+        # Assert:
+        self.assertEqual(['b', 'c', 'd'], files)
+
+
+class WatcherTest(WatcherTestBase):
+    def _create_watcher(self, delete_stale=False):
+        options = WatcherOptions([TEST_GENERATOR_NAME], self._path('output'), {'extra': self._path('extra.txt')}, delete_stale, False)
+        return Watcher([self._path('schemas/foo.cats')], self._path('schemas'), options)
+
+    def test_watched_paths_include_schemas_and_generator_inputs(self):
+        # Act:
+        watcher = self._create_watcher()
+
+        # Assert:
+        self.assertEqual([self._path('schemas/foo.cats'), self._path('schemas'), self._path('extra.txt')], watcher.watched_paths)
+
+    def test_first_cycle_generates_all_outputs(self):
+        # Arrange:
+        watcher = self._create_watcher()
+
+        # Act:
+        cycle_report = watcher.run_cycle()
+
+        # Assert:
+        self.assertEqual({}, cycle_report.errors)
+        self.assertEqual([TEST_GENERATOR_NAME], [report.generator_name for report in cycle_report.generator_reports])
+        self.assertEqual((2, 2, 2), cycle_report.generator_reports[0][1:4])
+        self.assertEqual(['Amount', 'Foo'], UnitGenerator.generated_units)
+        self.assertEqual('Foo 1\n', self._read('output/{0}/Foo.txt'.format(TEST_GENERATOR_NAME)))
+
+    def test_cycle_only_regenerates_units_whose_inputs_changed(self):
+        # Arrange:
+        watcher = self._create_watcher()
+        watcher.run_cycle()
+        UnitGenerator.generated_units = []
+
+        # Act:
+        self._write('schemas/foo.cats', ['import "base.cats"', 'using Foo = uint16'], 1)
+        cycle_report = watcher.run_cycle([self._path('schemas/foo.cats')])
+
+        # Assert:
+        self.assertEqual(['Foo'], UnitGenerator.generated_units)
+        self.assertEqual((1, 1, 2), cycle_report.generator_reports[0][1:4])
+        self.assertEqual('Foo 2\n', self._read('output/{0}/Foo.txt'.format(TEST_GENERATOR_NAME)))
+        self.assertEqual('Amount 8\n', self._read('output/{0}/Amount.txt'.format(TEST_GENERATOR_NAME)))
+
+    def test_cycle_regenerates_units_whose_outputs_were_removed(self):
+        # Arrange:
+        watcher = self._create_watcher()
+        watcher.run_cycle()
+        UnitGenerator.generated_units = []
+
+        # Act:
+        os.remove(self._path('output/{0}/Amount.txt'.format(TEST_GENERATOR_NAME)))
+        watcher.run_cycle()
+
+        # Assert:
+        self.assertEqual(['Amount'], UnitGenerator.generated_units)
+        self.assertEqual('Amount 8\n', self._read('output/{0}/Amount.txt'.format(TEST_GENERATOR_NAME)))
+
+    def test_outputs_of_removed_units_are_stale(self):
+        # Arrange:
+        watcher = self._create_watcher(True)
+        watcher.run_cycle()
+
+        # Act:
+        self._write('schemas/foo.cats', ['import "base.cats"'], 1)
+        cycle_report = watcher.run_cycle()
+
+        # Assert:
+        self.assertEqual(['Foo.txt'], cycle_report.generator_reports[0].stale_files)
+        self.assertFalse(os.path.exists(self._path('output/{0}/Foo.txt'.format(TEST_GENERATOR_NAME))))
+
+    def test_poll_returns_changed_files_after_burst_of_changes(self):
+        # Arrange:
+        watcher = self._create_watcher()
+        watcher.snapshot = snapshot_files(watcher.watched_paths)
+
+        def change_files():
+            for index in range(3):
+                self._write('schemas/foo.cats', ['using Foo = uint8'] * (index + 2))
+                time.sleep(0.01)
+
+            self._write('extra.txt', ['changed extra'])
+
+        thread = threading.Thread(target=change_files)
+
+        # Act:
+        thread.start()
+        files = watcher.poll(0.01, 0.1)
+        thread.join()
+
+        # Assert:
+        self.assertEqual([self._path('extra.txt'), self._path('schemas/foo.cats')], files)
+
+    def test_run_reports_failures_and_continues(self):
+        # Arrange:
+        watcher = self._create_watcher()
+        cycle_reports = []
+
+        def fail_revalidate():
+            raise RuntimeError('revalidation failed')
+
+        watcher.session.revalidate = fail_revalidate
+        failures = []
+
+        # Act:
+        watcher.run(cycle_reports.append, failures.append, max_cycles=1)
+
+        # Assert:
+        self.assertEqual([], cycle_reports)
+        self.assertEqual([RuntimeError], [type(failure) for failure in failures])
+
+
+class FormatCycleReportTest(unittest.TestCase):
+    def test_can_format_cycle_report(self):
+        # Arrange:
+        cycle_report = CycleReport(
+            ['foo.cats'],
+            {'bar.cats': ValueError('bad bar')},
+            0.0015,
+            [GeneratorReport('cpp_builder', 2, 1, 28, 0.004, ['Old.h'])],
+            0.006)
+
+        # Act:
+        lines = format_cycle_report(cycle_report)
+
+        # Assert:
+        self.assertEqual([
+            'bar.cats: bad bar',
+            'cycle: 1 changed file(s), 1 failed root(s), parse 1.5 ms',
+            '  cpp_builder: 2 of 28 file(s) regenerated, 1 written in 4.0 ms',
+            '  stale file: Old.h',
+            '  total 6.0 ms'
+        ], lines)
@@ -9,7 +9,7 @@ from catparser.parserutils import \
     require_user_type_name, require_property_name, \
     is_primitive, require_primitive, \
     is_dec_or_hex, parse_dec_or_hex, \
-    is_builtin, parse_builtin
+    is_builtin, parse_builtin, try_parse_builtin
 from catparser.CatsParseException import CatsParseException
 
 # region naming conventions
@@ -197,4 +197,33 @@ class ParseBuiltinTest(unittest.TestCase):
             with self.assertRaises(CatsParseException):
                 parse_builtin(type_name)
 
+
+class TryParseBuiltinTest(unittest.TestCase):
+    def test_can_parse_builtin(self):
+        for builtin_tuple in BUILTIN_TYPE_TUPLES:
+            # Act:
+            result = try_parse_builtin(builtin_tuple[0])
+
+            # Assert:
+            self.assertEqual({'type': 'byte', 'signedness': builtin_tuple[2], 'size': builtin_tuple[1]}, result)
+
+    def test_returns_none_for_invalid_builtin(self):
+        for type_name in INVALID_BUILTIN_TYPE_NAMES:
+            # Act:
+            result = try_parse_builtin(type_name)
+
+            # Assert:
+            self.assertIsNone(result)
+
+    def test_returns_independent_descriptors(self):
+        # Arrange:
+        descriptor1 = try_parse_builtin('uint16')
+
+        # Act:
+        descriptor1['name'] = 'foo'
+        descriptor2 = try_parse_builtin('uint16')
+
+        # Assert:
+        self.assertEqual({'type': 'byte', 'signedness': 'unsigned', 'size': 2}, descriptor2)
+
 # endregion